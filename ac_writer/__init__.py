@@ -4,15 +4,18 @@ AC Writer Agent
 This agent generates acceptance criteria from feature idea files.
 
 Usage:
-    from examples.ac_writer.agent import agent, generate_ac
+    from examples.ac_writer.agent import get_agent, generate_ac
     from langchain_core.messages import HumanMessage
 
     # Simple usage with convenience function
     result = generate_ac("02-feat-refresh-button.md", save_output=True)
     print(result["content"])
 
+    # Async usage (one event loop can drive many generations)
+    result = await agenerate_ac("02-feat-refresh-button.md", save_output=True)
+
     # Direct agent invocation
-    result = agent.invoke({
+    result = get_agent().invoke({
         "messages": [
             HumanMessage(content="Generate AC for 02-feat-refresh-button.md")
         ],
@@ -21,6 +24,21 @@ Usage:
     })
 """
 
-from .agent import agent, generate_ac
+import importlib
+
+__all__ = [
+    "get_agent",
+    "generate_ac",
+    "agenerate_ac",
+    "stream_ac",
+    "astream_ac",
+    "generate_ac_per_scenario",
+    "agenerate_ac_per_scenario",
+]
+
 
-__all__ = ["agent", "generate_ac"]
+def __getattr__(name: str):
+    # Import the agent module on first use so `python -m ... --help` stays fast
+    if name in __all__:
+        return getattr(importlib.import_module(".agent", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,52 +5,65 @@ Usage:
     python -m ac_writer 01           # Generate AC from stories for file 01
     python -m ac_writer 02           # Generate AC from stories for file 02
     python -m ac_writer 02 --idea    # Generate AC directly from idea (skip stories)
+    python -m ac_writer 02 --per-scenario   # One concurrent request per scenario
 """
 
 import argparse
 import sys
-from pathlib import Path
 
-from .agent import generate_ac
+from artifacts.index import get_index
 
 
 def find_file(prefix: str, source_type: str) -> str:
     """Find file matching the prefix in the appropriate directory"""
-    data_dir = Path(__file__).parent.parent / "data"
+    index = get_index()
+    kind = "stories" if source_type == "story" else "ideas"
 
-    if source_type == "story":
-        search_dir = data_dir / "stories"
-        pattern = f"{prefix}*.md"
-    else:
-        search_dir = data_dir / "ideas"
-        pattern = f"{prefix}*.md"
-
-    matches = list(search_dir.glob(pattern))
+    matches = index.find(kind, prefix)
 
     if not matches:
-        print(f"❌ No files found matching '{prefix}' in {search_dir}")
+        print(f"❌ No files found matching '{prefix}' in {index.data_dir / kind}")
         sys.exit(1)
 
     if len(matches) > 1:
         print(f"⚠️  Multiple files found matching '{prefix}':")
         for m in matches:
-            print(f"   - {m.name}")
-        print(f"Using: {matches[0].name}")
+            print(f"   - {m}")
+        print(f"Using: {matches[0]}")
 
-    return matches[0].name
+    return matches[0]
 
 
 def check_story_exists(prefix: str) -> bool:
     """Check if a story file exists for the given prefix"""
-    data_dir = Path(__file__).parent.parent / "data"
-    stories_dir = data_dir / "stories"
-    pattern = f"{prefix}*-stories.md"
+    return len(get_index().find("stories", prefix, suffix="-stories.md")) > 0
 
-    matches = list(stories_dir.glob(pattern))
-    return len(matches) > 0
 
+def print_token(token: str) -> None:
+    """Print a streamed token without buffering"""
+    print(token, end="", flush=True)
 
-if __name__ == "__main__":
+
+def print_summary(result: dict) -> None:
+    """Print where the output was saved and cache counters"""
+    print(f"\n✅ Generated AC")
+
+    if result.get("output_file"):
+        print(f"📁 Saved to: {result['output_file']}")
+
+    from runtime.cache import get_cache
+
+    cache_stats = get_cache().stats()
+    print(f"💾 Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
         description="Generate acceptance criteria from user stories (recommended) or feature ideas"
     )
@@ -66,8 +79,31 @@ if __name__ == "__main__":
     parser.add_argument(
         "--no-save", action="store_true", help="Don't save output to file"
     )
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="Inject file content into the prompt instead of fetching it with a tool",
+    )
+    parser.add_argument(
+        "--per-scenario",
+        action="store_true",
+        help="Generate AC for each story scenario concurrently (implies --no-stream)",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print the output only after generation finishes",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the LLM response cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LLM responses and store fresh ones",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Extract prefix from input
     if args.file_prefix.endswith((".md", ".feature")):
@@ -99,6 +135,13 @@ if __name__ == "__main__":
         source_type = "story"
         filename = find_file(prefix, "story")
 
+    # Deferred so `--help` and lookup errors never load LangChain or build models
+    from runtime.cache import configure_cache
+
+    from .agent import generate_ac, stream_ac
+
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh)
+
     print("=" * 70)
     print("Acceptance Criteria Writer Agent")
     print("=" * 70)
@@ -106,21 +149,48 @@ if __name__ == "__main__":
     print(f"Source: {source_type}")
     print("-" * 70)
 
-    # Generate AC
-    result = generate_ac(
-        filename, source_type=source_type, save_output=not args.no_save
-    )
+    if args.no_stream or args.per_scenario:
+        # Generate, then print the full output
+        result = generate_ac(
+            filename,
+            source_type=source_type,
+            save_output=not args.no_save,
+            direct_context=args.direct,
+            per_scenario=args.per_scenario,
+        )
+        print_summary(result)
+
+        print("\n" + "=" * 70)
+        print("Generated Acceptance Criteria:")
+        print("=" * 70)
+        print()
+        print(result["content"])
+    else:
+        # Stream tokens to the terminal (and to disk) as they arrive
+        print("\n" + "=" * 70)
+        print("Generated Acceptance Criteria:")
+        print("=" * 70)
+        print()
+        result = stream_ac(
+            filename,
+            source_type=source_type,
+            save_output=not args.no_save,
+            direct_context=args.direct,
+            on_token=print_token,
+        )
+        print()
+        print_summary(result)
 
-    print(f"\n✅ Generated AC")
+    print("\n" + "=" * 70)
+    print("\nComplete!")
 
-    if result.get("output_file"):
-        print(f"📁 Saved to: {result['output_file']}")
 
-    print("\n" + "=" * 70)
-    print("Generated Acceptance Criteria:")
-    print("=" * 70)
-    print()
-    print(result["content"])
+if __name__ == "__main__":
+    # Hand the invocation to a running daemon if there is one (see server/)
+    from server.client import run_remote
 
-    print("\n" + "=" * 70)
-    print("\nComplete!")
+    code = run_remote("ac_writer", sys.argv[1:])
+    if code is None:
+        main()
+    else:
+        sys.exit(code)
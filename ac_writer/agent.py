@@ -5,43 +5,75 @@ Generates acceptance criteria from feature idea files.
 Follows a simple agentic pattern for educational purposes.
 
 Usage:
-    from examples.ac_writer.agent import agent
+    from examples.ac_writer.agent import get_agent
     from langchain_core.messages import HumanMessage
 
-    result = agent.invoke({
+    result = get_agent().invoke({
         "messages": [HumanMessage(content="Generate AC for 02-feat-refresh-button.md")]
     })
 """
 
+import asyncio
+import contextvars
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Annotated, Literal
+from typing import Annotated, Callable, Literal
 
-from dotenv import load_dotenv
 from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage, ToolMessage
-from langchain_openai import ChatOpenAI
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import TypedDict
 
 from tools.file_retrieval import (
     get_idea_file,
+    get_idea_section,
     get_story_file,
+    get_story_section,
     list_idea_files,
     list_story_files,
+    read_data_file,
+    read_file_context,
+    with_file_context,
 )
-from nodes import should_continue_on_tool_calls, create_tool_executor
-from .prompts import SYSTEM_PROMPT
+from artifacts.index import DATA_DIR, get_index
+from artifacts.writer import StreamingFileWriter, write_atomic
+from evals.gherkin import combine
+from evals.repair import aapply_gates, apply_gates
+from nodes import (
+    should_continue_on_tool_calls,
+    create_tool_executor,
+    create_llm_node,
+    prefix_cache_key,
+)
+from runtime.clients import get_chat_model
+from runtime.singleflight import (
+    decode_response,
+    encode_response,
+    flight_key,
+    get_single_flight,
+)
+from runtime.streaming import astream_agent, stream_agent
+from .prompts import SCENARIO_PROMPT, SYSTEM_PROMPT
+from .scenarios import Scenario, split_scenarios
+
 
-load_dotenv()
+# Output directory for generated acceptance criteria
+AC_DIR = DATA_DIR / "ac"
 
 
-# Initialize the LLM
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+# LLM settings (the client comes from the shared registry, see get_model)
+MODEL_NAME = "gpt-4o-mini"
 
 # Define available tools
-tools = [get_idea_file, list_idea_files, get_story_file, list_story_files]
+tools = [
+    get_idea_file,
+    get_idea_section,
+    list_idea_files,
+    get_story_file,
+    get_story_section,
+    list_story_files,
+]
 tools_by_name = {tool.name: tool for tool in tools}
-model_with_tools = model.bind_tools(tools)
 
 
 # Define state
@@ -54,47 +86,134 @@ class ACWriterState(TypedDict):
     ac_generated: bool
 
 
-# Define model node
+# Use the generic routing function
+should_continue = should_continue_on_tool_calls
 
 
-def llm_call(state: ACWriterState):
-    """LLM decides whether to call a tool or generate AC"""
+# Build agent
 
-    messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
 
-    return {
-        "messages": [model_with_tools.invoke(messages)],
-    }
+def build_agent(chat_model):
+    """
+    Build and compile the agent graph around a chat model.
 
+    Args:
+        chat_model: Chat model supporting bind_tools (e.g., ChatOpenAI or a
+            fake model for offline benchmarks)
 
-# Define tool node
+    Returns:
+        Compiled agent graph
+    """
+    model_with_tools = chat_model.bind_tools(tools)
 
-# Create tool executor using the factory function
-tool_node = create_tool_executor(tools_by_name)
+    # LLM decides whether to call a tool or generate AC (responses are cached)
+    llm_call = create_llm_node(
+        model_with_tools,
+        SYSTEM_PROMPT,
+        prompt_cache_key=prefix_cache_key("ac_writer", SYSTEM_PROMPT),
+    )
 
+    # Create tool executor using the factory function
+    tool_node = create_tool_executor(tools_by_name)
 
-# Define routing logic
+    # Build workflow
+    agent_builder = StateGraph(ACWriterState)
 
-# Use the generic routing function
-should_continue = should_continue_on_tool_calls
+    # Add nodes
+    agent_builder.add_node("llm_call", llm_call)
+    agent_builder.add_node("tool_node", tool_node)
 
+    # Add edges to connect nodes
+    agent_builder.add_edge(START, "llm_call")
+    agent_builder.add_conditional_edges("llm_call", should_continue, ["tool_node", END])
+    agent_builder.add_edge("tool_node", "llm_call")
 
-# Build agent
+    return agent_builder.compile()
+
+
+def build_repairer(chat_model):
+    """
+    Build the LLM node that repairs AC blocks failing the eval gates.
+
+    It sends the same tools and system prompt as the agent, so repair calls
+    reuse the agent's cached request prefix.
+
+    Args:
+        chat_model: Chat model supporting bind_tools
+
+    Returns:
+        LLM node runnable (see create_llm_node)
+    """
+    return create_llm_node(
+        chat_model.bind_tools(tools),
+        SYSTEM_PROMPT,
+        prompt_cache_key=prefix_cache_key("ac_writer", SYSTEM_PROMPT),
+    )
+
+
+# Agent compiled on first use so that imports, `--help` and error paths stay fast
+_agent = None
+_repairer = None
+
+
+def get_model():
+    """
+    Return the chat model shared with every other agent in the process.
+
+    Returns:
+        ChatOpenAI instance for MODEL_NAME using the shared connection pool
+    """
+    # stream_usage keeps token usage available to metrics when streaming
+    return get_chat_model(MODEL_NAME, temperature=0, stream_usage=True)
+
+
+def get_agent():
+    """
+    Return the compiled agent, building it on first use.
+
+    Returns:
+        Compiled agent graph
+    """
+    global _agent
+    if _agent is None:
+        _agent = build_agent(get_model())
+
+    return _agent
 
-# Build workflow
-agent_builder = StateGraph(ACWriterState)
 
-# Add nodes
-agent_builder.add_node("llm_call", llm_call)
-agent_builder.add_node("tool_node", tool_node)
+def get_repairer():
+    """
+    Return the eval-gate repair node, building it on first use.
+
+    Returns:
+        LLM node runnable
+    """
+    global _repairer
+    if _repairer is None:
+        _repairer = build_repairer(get_model())
+
+    return _repairer
+
+
+def use_model(chat_model) -> None:
+    """
+    Rebuild the agent (and its repair node) around a different chat model.
+
+    Args:
+        chat_model: Chat model supporting bind_tools
+    """
+    global _agent, _repairer
+    _agent = build_agent(chat_model)
+    _repairer = build_repairer(chat_model)
 
-# Add edges to connect nodes
-agent_builder.add_edge(START, "llm_call")
-agent_builder.add_conditional_edges("llm_call", should_continue, ["tool_node", END])
-agent_builder.add_edge("tool_node", "llm_call")
 
-# Compile the agent
-agent = agent_builder.compile()
+def __getattr__(name: str):
+    # Keep `from ... import agent` / `model` working without eager construction
+    if name == "agent":
+        return get_agent()
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Utility functions
@@ -111,32 +230,45 @@ def save_ac_to_file(content: str, filename: str) -> str:
     Returns:
         Path to saved file
     """
-    ac_dir = Path(__file__).parent.parent / "data" / "ac"
-    ac_dir.mkdir(parents=True, exist_ok=True)
-
-    output_path = ac_dir / filename
+    AC_DIR.mkdir(parents=True, exist_ok=True)
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    output_path = AC_DIR / filename
+    write_atomic(output_path, content)
 
     return str(output_path)
 
 
-def generate_ac(
-    filename: str, source_type: str = "idea", save_output: bool = True
-) -> dict:
+def ac_output_filename(filename: str, source_type: str = "idea") -> str:
     """
-    Generate acceptance criteria from a feature idea or user story file.
+    Derive the AC filename for an idea or story file.
 
     Args:
-        filename: Name of the file (e.g., "02-feat-refresh-button.md" or "02-refresh-button-stories.feature")
+        filename: Name of the source file
         source_type: Type of source file - "idea" or "story" (default: "idea")
-        save_output: Whether to save the output to a file
 
     Returns:
-        Dictionary with:
-        - content: Generated AC content
-        - output_file: Path to saved file (if save_output=True)
+        Name of the AC file (e.g., "02-refresh-button-scenario-ac.md")
+    """
+    if source_type == "story":
+        return filename.replace("-stories.md", "-scenario-ac.md")
+
+    return filename.replace("feat-", "").replace(".md", "-ac.md")
+
+
+def ac_prompt(
+    filename: str, source_type: str = "idea", direct_context: bool = False
+) -> str:
+    """
+    Build the user prompt asking for AC for an idea or story file.
+
+    Args:
+        filename: Name of the source file
+        source_type: Type of source file - "idea" or "story" (default: "idea")
+        direct_context: Inline the file content (left out if the file cannot
+            be read, so the agent falls back to tool retrieval)
+
+    Returns:
+        Prompt text
     """
     # Build appropriate prompt based on source type
     if source_type == "story":
@@ -144,39 +276,439 @@ def generate_ac(
     else:
         prompt = f"Generate acceptance criteria for the feature in {filename}"
 
-    # Invoke the agent
-    result = agent.invoke(
-        {
-            "messages": [HumanMessage(content=prompt)],
-            "ac_generated": False,
-        }
-    )
+    # Pre-seed the source content to skip the tool-calling round trip
+    if direct_context:
+        kind = "stories" if source_type == "story" else "ideas"
+        content = read_file_context(kind, filename)
+        if content is not None:
+            prompt = with_file_context(prompt, filename, content)
+
+    return prompt
+
 
-    # Extract the final AC content (last message from assistant)
-    ac_content = None
-    for msg in reversed(result["messages"]):
+def _build_input(
+    filename: str, source_type: str, direct_context: bool = False
+) -> dict:
+    """Build the initial agent state for an idea or story file"""
+    return {
+        "messages": [
+            HumanMessage(content=ac_prompt(filename, source_type, direct_context))
+        ],
+        "ac_generated": False,
+    }
+
+
+def _final_content(messages: list) -> str | None:
+    """Final AC content (last assistant message without tool calls)"""
+    for msg in reversed(messages):
         if (
             hasattr(msg, "content") and not msg.tool_calls
             if hasattr(msg, "tool_calls")
             else True
         ):
-            ac_content = msg.content
-            break
+            return msg.content
+    return None
+
+
+def _build_response(
+    result: dict, filename: str, source_type: str, save_output: bool
+) -> dict:
+    """Extract the generated AC from the agent result and optionally save them"""
+    ac_content = _final_content(result["messages"])
 
     response = {
         "content": ac_content,
         "messages": result["messages"],
+        "validation": result.get("validation"),
     }
 
     # Save to file if requested
     if save_output and ac_content:
-        # Generate output filename based on source type
-        if source_type == "story":
-            output_filename = filename.replace("-stories.md", "-scenario-ac.md")
-        else:
-            output_filename = filename.replace("feat-", "").replace(".md", "-ac.md")
-
+        output_filename = ac_output_filename(filename, source_type)
         output_path = save_ac_to_file(ac_content, output_filename)
         response["output_file"] = output_path
 
     return response
+
+
+def _flight(
+    filename: str,
+    source_type: str,
+    save_output: bool,
+    direct_context: bool,
+    per_scenario: bool,
+) -> dict:
+    """
+    Coalescing arguments for a generation (see runtime.singleflight).
+
+    Identical requests (same source content, prompt, model and options) that
+    run at the same time are generated once, and generations writing the
+    same AC file never run at once. Missing source files get no key.
+    """
+    kind = "stories" if source_type == "story" else "ideas"
+    path = get_index().path(kind, filename)
+    if path is None:
+        return {"key": None}
+
+    key = flight_key(
+        "ac_writer",
+        SYSTEM_PROMPT,
+        SCENARIO_PROMPT,
+        MODEL_NAME,
+        str(path),
+        files=[path],
+        save_output=save_output,
+        direct_context=direct_context,
+        per_scenario=per_scenario,
+    )
+    output_path = AC_DIR / ac_output_filename(filename, source_type)
+    return {
+        "key": key,
+        "encode": encode_response,
+        "decode": decode_response,
+        "resource": output_path if save_output else None,
+    }
+
+
+def _generate_single(
+    filename: str, source_type: str, save_output: bool, direct_context: bool
+) -> dict:
+    """Generate AC with one agent request (outside the single-flight group)"""
+    agent_input = _build_input(filename, source_type, direct_context)
+    result = apply_gates(
+        get_agent().invoke(agent_input), "ac", get_repairer(), filename
+    )
+    return _build_response(result, filename, source_type, save_output)
+
+
+async def _agenerate_single(
+    filename: str, source_type: str, save_output: bool, direct_context: bool
+) -> dict:
+    """Async variant of _generate_single"""
+    result = await get_agent().ainvoke(
+        _build_input(filename, source_type, direct_context)
+    )
+    result = await aapply_gates(result, "ac", get_repairer(), filename)
+    return _build_response(result, filename, source_type, save_output)
+
+
+def generate_ac(
+    filename: str,
+    source_type: str = "idea",
+    save_output: bool = True,
+    direct_context: bool = False,
+    per_scenario: bool = False,
+) -> dict:
+    """
+    Generate acceptance criteria from a feature idea or user story file.
+
+    Args:
+        filename: Name of the file (e.g., "02-feat-refresh-button.md" or "02-refresh-button-stories.feature")
+        source_type: Type of source file - "idea" or "story" (default: "idea")
+        save_output: Whether to save the output to a file
+        direct_context: Inject the source content into the prompt instead of
+            letting the model fetch it with a tool call
+        per_scenario: For story files, generate AC for each scenario
+            concurrently (see generate_ac_per_scenario)
+
+    Returns:
+        Dictionary with:
+        - content: Generated AC content
+        - validation: Eval gate report (see evals.gherkin.validate)
+        - output_file: Path to saved file (if save_output=True)
+    """
+    per_scenario = per_scenario and source_type == "story"
+
+    def run() -> dict:
+        if per_scenario:
+            return generate_ac_per_scenario(
+                filename, save_output, direct_context=direct_context
+            )
+        return _generate_single(filename, source_type, save_output, direct_context)
+
+    flight = _flight(filename, source_type, save_output, direct_context, per_scenario)
+    response, _ = get_single_flight().do(fn=run, **flight)
+    return dict(response)
+
+
+async def agenerate_ac(
+    filename: str,
+    source_type: str = "idea",
+    save_output: bool = True,
+    direct_context: bool = False,
+    per_scenario: bool = False,
+) -> dict:
+    """
+    Async variant of generate_ac that drives the agent with ainvoke.
+
+    Args:
+        filename: Name of the file (e.g., "02-feat-refresh-button.md" or "02-refresh-button-stories.md")
+        source_type: Type of source file - "idea" or "story" (default: "idea")
+        save_output: Whether to save the output to a file
+        direct_context: Inject the source content into the prompt
+        per_scenario: For story files, generate AC for each scenario concurrently
+
+    Returns:
+        Same dictionary as generate_ac
+    """
+    per_scenario = per_scenario and source_type == "story"
+
+    async def run() -> dict:
+        if per_scenario:
+            return await agenerate_ac_per_scenario(
+                filename, save_output, direct_context=direct_context
+            )
+        return await _agenerate_single(
+            filename, source_type, save_output, direct_context
+        )
+
+    flight = _flight(filename, source_type, save_output, direct_context, per_scenario)
+    response, _ = await get_single_flight().ado(afn=run, **flight)
+    return dict(response)
+
+
+# Per-scenario fan-out
+
+
+def _scenario_inputs(story_filename: str) -> list[tuple[Scenario, dict]] | None:
+    """
+    One agent input per scenario of a story file.
+
+    Returns:
+        (scenario, agent input) pairs, or None if the file is missing or has
+        fewer than two scenarios (nothing to fan out)
+    """
+    content = read_data_file("stories", story_filename)
+    scenarios = split_scenarios(content) if content is not None else []
+    if len(scenarios) < 2:
+        return None
+
+    inputs = []
+    for index, scenario in enumerate(scenarios, start=1):
+        prompt = SCENARIO_PROMPT.format(
+            index=index,
+            total=len(scenarios),
+            name=scenario["name"],
+            filename=story_filename,
+        )
+        # Shared Feature/Background context first, the scenario after it
+        excerpt = f"{scenario['context']}\n\n{scenario['text']}".strip()
+        inputs.append(
+            (
+                scenario,
+                {
+                    "messages": [
+                        HumanMessage(
+                            content=with_file_context(prompt, story_filename, excerpt)
+                        )
+                    ],
+                    "ac_generated": False,
+                },
+            )
+        )
+
+    return inputs
+
+
+def _build_scenario_response(
+    inputs: list[tuple[Scenario, dict]],
+    results: list[dict],
+    story_filename: str,
+    save_output: bool,
+) -> dict:
+    """Stitch per-scenario AC into one document, in scenario order"""
+    sections = []
+    for (scenario, _), result in zip(inputs, results):
+        scenario_ac = (_final_content(result["messages"]) or "").strip()
+        sections.append(f"## {scenario['name']}\n\n{scenario_ac}")
+
+    ac_content = "\n\n".join(sections) + "\n"
+
+    response = {
+        "content": ac_content,
+        "messages": [msg for result in results for msg in result["messages"]],
+        "validation": combine(
+            [result["validation"] for result in results if "validation" in result]
+        ),
+        "scenarios": len(inputs),
+    }
+
+    if save_output:
+        output_filename = ac_output_filename(story_filename, source_type="story")
+        response["output_file"] = save_ac_to_file(ac_content, output_filename)
+
+    return response
+
+
+def generate_ac_per_scenario(
+    story_filename: str,
+    save_output: bool = True,
+    max_concurrency: int = 8,
+    direct_context: bool = False,
+) -> dict:
+    """
+    Generate AC for every scenario of a story file concurrently.
+
+    Each scenario is sent with the shared Feature/Background context in its
+    own request, so wall-clock time is close to one scenario's latency
+    instead of one long completion for the whole file. The results are
+    stitched into the usual -scenario-ac.md output in scenario order.
+    Files with fewer than two scenarios fall back to a single request.
+
+    Args:
+        story_filename: Name of the story file (e.g., "02-refresh-button-stories.md")
+        save_output: Whether to save the output to a file
+        max_concurrency: Maximum number of scenarios generated at once
+        direct_context: For the single-request fallback, inject the story into
+            the prompt instead of letting the model fetch it
+
+    Returns:
+        Same dictionary as generate_ac, plus the number of scenarios
+    """
+    inputs = _scenario_inputs(story_filename)
+    if inputs is None:
+        # Not through generate_ac: its single flight already holds the
+        # output's lock when it runs this
+        return _generate_single(story_filename, "story", save_output, direct_context)
+
+    agent, repairer = get_agent(), get_repairer()
+
+    def run(agent_input: dict) -> dict:
+        # Each scenario's AC is checked (and repaired) on its own
+        return apply_gates(agent.invoke(agent_input), "ac", repairer, story_filename)
+
+    # Copy the context into each worker so callbacks (metrics, tracing) still
+    # see the calling run
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run, agent_input)
+            for _, agent_input in inputs
+        ]
+        results = [future.result() for future in futures]
+
+    return _build_scenario_response(inputs, results, story_filename, save_output)
+
+
+async def agenerate_ac_per_scenario(
+    story_filename: str,
+    save_output: bool = True,
+    max_concurrency: int = 8,
+    direct_context: bool = False,
+) -> dict:
+    """Async variant of generate_ac_per_scenario that gathers the scenarios"""
+    inputs = _scenario_inputs(story_filename)
+    if inputs is None:
+        return await _agenerate_single(
+            story_filename, "story", save_output, direct_context
+        )
+
+    agent, repairer = get_agent(), get_repairer()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(agent_input: dict) -> dict:
+        async with semaphore:
+            result = await agent.ainvoke(agent_input)
+            return await aapply_gates(result, "ac", repairer, story_filename)
+
+    results = await asyncio.gather(*(run(agent_input) for _, agent_input in inputs))
+
+    return _build_scenario_response(inputs, results, story_filename, save_output)
+
+
+def stream_ac(
+    filename: str,
+    source_type: str = "idea",
+    save_output: bool = True,
+    direct_context: bool = False,
+    on_token: Callable[[str], None] | None = None,
+) -> dict:
+    """
+    Generate acceptance criteria, streaming tokens to a callback and to disk.
+
+    Tokens are written to a partial file as they arrive; the file is renamed
+    into place once generation completes (and kept for inspection on a crash).
+    A caller that joins an identical generation already in flight receives
+    the finished content as a single token.
+
+    Args:
+        filename: Name of the idea or story file
+        source_type: Type of source file - "idea" or "story" (default: "idea")
+        save_output: Whether to save the output to a file
+        direct_context: Inject the source content into the prompt
+        on_token: Called with each generated token (e.g., to print it)
+
+    Returns:
+        Same dictionary as generate_ac
+    """
+    output_path = AC_DIR / ac_output_filename(filename, source_type)
+
+    def run() -> dict:
+        with StreamingFileWriter(output_path if save_output else None) as writer:
+
+            def handle_token(token: str) -> None:
+                writer.write(token)
+                if on_token:
+                    on_token(token)
+
+            result = stream_agent(
+                get_agent(),
+                _build_input(filename, source_type, direct_context),
+                on_token=handle_token,
+                on_message_start=writer.reset,
+            )
+            result = apply_gates(result, "ac", get_repairer(), filename)
+            response = _build_response(
+                result, filename, source_type, save_output=False
+            )
+
+            if save_output and response["content"]:
+                response["output_file"] = writer.commit(response["content"])
+
+        return response
+
+    flight = _flight(filename, source_type, save_output, direct_context, False)
+    response, shared = get_single_flight().do(fn=run, **flight)
+    if shared and on_token and response["content"]:
+        on_token(response["content"])
+    return dict(response)
+
+
+async def astream_ac(
+    filename: str,
+    source_type: str = "idea",
+    save_output: bool = True,
+    direct_context: bool = False,
+    on_token: Callable[[str], None] | None = None,
+) -> dict:
+    """Async variant of stream_ac built on astream"""
+    output_path = AC_DIR / ac_output_filename(filename, source_type)
+
+    async def run() -> dict:
+        with StreamingFileWriter(output_path if save_output else None) as writer:
+
+            def handle_token(token: str) -> None:
+                writer.write(token)
+                if on_token:
+                    on_token(token)
+
+            result = await astream_agent(
+                get_agent(),
+                _build_input(filename, source_type, direct_context),
+                on_token=handle_token,
+                on_message_start=writer.reset,
+            )
+            result = await aapply_gates(result, "ac", get_repairer(), filename)
+            response = _build_response(
+                result, filename, source_type, save_output=False
+            )
+
+            if save_output and response["content"]:
+                response["output_file"] = writer.commit(response["content"])
+
+        return response
+
+    flight = _flight(filename, source_type, save_output, direct_context, False)
+    response, shared = await get_single_flight().ado(afn=run, **flight)
+    if shared and on_token and response["content"]:
+        on_token(response["content"])
+    return dict(response)
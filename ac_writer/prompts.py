@@ -46,3 +46,13 @@ Examples:
 | 1    | <value>              | <result>                          |
 
 """
+
+
+# Human prompt for one scenario in per-scenario mode (the scenario and its
+# Feature/Background context are attached as file content)
+SCENARIO_PROMPT = (
+    "Generate acceptance criteria for scenario {index} of {total} "
+    "({name}) in the user story file {filename}. The scenario and its shared "
+    "Feature/Background context are included below; write AC for this "
+    "scenario only."
+)
@@ -0,0 +1,119 @@
+"""
+Gherkin scenario parsing for per-scenario AC generation.
+
+Splits a user story document into its `Scenario:` blocks, each paired with
+the context it depends on: the enclosing `Feature:` header (with its
+description) and any `Background:` block. Markdown around the Gherkin
+(headings, code fences) is ignored.
+
+Usage:
+    from ac_writer.scenarios import split_scenarios
+
+    for scenario in split_scenarios(story_text):
+        print(scenario["name"], scenario["context"], scenario["text"])
+"""
+
+import re
+
+from typing_extensions import TypedDict
+
+
+SCENARIO_KEYWORDS = ("Scenario Outline:", "Scenario Template:", "Scenario:", "Example:")
+
+# Lines that end the current Gherkin block without belonging to any block.
+# Only unindented ones: indented `#` lines are Gherkin comments inside a block.
+MARKDOWN_BREAK = re.compile(r"^(#{1,6}\s|```|~~~|---\s*$)")
+
+
+class Scenario(TypedDict):
+    """One scenario with the Feature/Background context it depends on"""
+
+    name: str
+    context: str
+    text: str
+
+
+def _keyword(line: str) -> str | None:
+    """Gherkin block keyword starting a line, if any"""
+    stripped = line.strip()
+    for keyword in ("Feature:", "Background:", "Rule:") + SCENARIO_KEYWORDS:
+        if stripped.startswith(keyword):
+            return keyword
+    return None
+
+
+def _block(lines: list[str]) -> str:
+    """Join block lines, dropping surrounding blank lines"""
+    return "\n".join(lines).strip("\n")
+
+
+def split_scenarios(text: str) -> list[Scenario]:
+    """
+    Split a Gherkin document into scenarios with their shared context.
+
+    Tag lines (`@...`) directly above a block belong to that block.
+
+    Args:
+        text: User story document (Gherkin, optionally inside markdown)
+
+    Returns:
+        Scenarios in document order (empty if none were found)
+    """
+    scenarios: list[Scenario] = []
+    feature: list[str] = []
+    background: list[str] = []
+    current: list[str] | None = None  # Lines of the block being read
+    name: str | None = None  # Set while the current block is a scenario
+    tags: list[str] = []  # Tag lines waiting for the next line
+
+    def finish() -> None:
+        if name is not None and current is not None:
+            scenarios.append(
+                {
+                    "name": name,
+                    "context": "\n\n".join(
+                        block for block in (_block(feature), _block(background)) if block
+                    ),
+                    "text": _block(current),
+                }
+            )
+
+    for line in text.splitlines():
+        if MARKDOWN_BREAK.match(line):
+            finish()
+            current, name, tags = None, None, []
+            continue
+
+        keyword = _keyword(line)
+
+        if keyword is None:
+            if line.strip().startswith("@"):
+                tags.append(line)
+            elif current is not None:
+                current.extend(tags + [line])
+                tags = []
+            continue
+
+        finish()
+        name = None
+
+        if keyword == "Feature:":
+            feature = tags + [line]
+            background = []
+            current = feature
+        elif keyword == "Background:":
+            background = tags + [line]
+            current = background
+        elif keyword == "Rule:":
+            # A Rule scopes its own Background
+            feature.extend(["", *tags, line])
+            background = []
+            current = feature
+        else:
+            current = tags + [line]
+            name = line.strip()
+
+        tags = []
+
+    finish()
+    return scenarios
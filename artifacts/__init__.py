@@ -0,0 +1,17 @@
+"""
+Helpers for reading and writing SDLC artifacts in the data directory.
+"""
+
+from .index import ArtifactIndex, get_index
+from .sections import outline, read_range, read_section
+from .writer import StreamingFileWriter, write_atomic
+
+__all__ = [
+    "ArtifactIndex",
+    "get_index",
+    "outline",
+    "read_range",
+    "read_section",
+    "StreamingFileWriter",
+    "write_atomic",
+]
@@ -0,0 +1,283 @@
+"""
+In-memory index of the artifacts in the data directory.
+
+Replaces repeated directory globbing with a shared index of idea, story and
+AC files. Each subdirectory listing is rebuilt only when the directory's
+mtime changes (files added, removed or renamed into place), and file content
+is cached until the file's mtime, inode or size changes (files larger than
+MAX_CACHED_BYTES are re-read instead, and are best read in sections, see
+artifacts.sections). The content cache holds at most CONTENT_CACHE_BYTES
+(SDLC_INDEX_CACHE_BYTES, default 64 MiB) and drops the least recently read
+files first, so long-lived processes (the daemon, large batches) do not
+keep every file they ever read. Prefix lookups use binary search over the sorted names,
+exact lookups are set membership.
+
+Usage:
+    from artifacts.index import get_index
+
+    index = get_index()
+    index.find("ideas", "01")          # ['01-feat-pagination.md']
+    index.read("ideas", "01-feat-pagination.md")
+    index.outline("ideas", "01-feat-pagination.md")
+    index.lineage("01-feat-pagination.md")
+"""
+
+import bisect
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Literal
+
+from .sections import Section, outline
+
+
+# Base directory for data files (override with SDLC_DATA_DIR)
+DATA_DIR = Path(
+    os.environ.get("SDLC_DATA_DIR", Path(__file__).parent.parent / "data")
+)
+
+# Files above this size are not kept in the content cache
+MAX_CACHED_BYTES = 1024 * 1024
+
+# Total size of the files kept in the content cache
+CONTENT_CACHE_BYTES = int(
+    os.environ.get("SDLC_INDEX_CACHE_BYTES", 64 * 1024 * 1024)
+)
+
+ArtifactKind = Literal["ideas", "stories", "ac"]
+
+
+def feature_key(kind: ArtifactKind, filename: str) -> str:
+    """
+    Key shared by an idea and the stories/AC generated from it.
+
+    "01-feat-pagination.md", "01-pagination-stories.md" and
+    "01-pagination-scenario-ac.md" all map to "01-pagination".
+    """
+    if kind == "ideas":
+        return filename.replace("feat-", "").removesuffix(".md")
+    if kind == "stories":
+        return filename.removesuffix("-stories.md")
+    if filename.endswith("-scenario-ac.md"):
+        return filename.removesuffix("-scenario-ac.md")
+    return filename.removesuffix("-ac.md")
+
+
+class _Listing:
+    """Sorted snapshot of the markdown files in one directory"""
+
+    def __init__(self, mtime_ns: int, names: list[str]):
+        self.mtime_ns = mtime_ns
+        self.names = names
+        self.name_set = set(names)
+
+
+class ArtifactIndex:
+    """
+    Shared index over data/ideas, data/stories and data/ac.
+
+    Args:
+        data_dir: Base data directory
+        cache_bytes: Total size of the files kept in the content cache
+    """
+
+    def __init__(
+        self, data_dir: Path = DATA_DIR, cache_bytes: int = CONTENT_CACHE_BYTES
+    ):
+        self.data_dir = Path(data_dir)
+        self.cache_bytes = cache_bytes
+        self._listings: dict[str, _Listing] = {}
+        # Least recently read first
+        self._content: OrderedDict[tuple[str, str], tuple[tuple, str]] = (
+            OrderedDict()
+        )
+        self._content_bytes = 0
+        self._outlines: dict[tuple[str, str], tuple[tuple, list[Section]]] = {}
+        self._lock = threading.Lock()
+
+    def _listing(self, kind: ArtifactKind) -> _Listing:
+        """Current listing for a directory, rescanning it only if it changed"""
+        directory = self.data_dir / kind
+
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            return _Listing(0, [])
+
+        listing = self._listings.get(kind)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            return listing
+
+        with self._lock:
+            names = sorted(
+                entry.name
+                for entry in os.scandir(directory)
+                if entry.name.endswith(".md") and entry.is_file()
+            )
+            listing = _Listing(mtime_ns, names)
+            self._listings[kind] = listing
+
+        return listing
+
+    def names(self, kind: ArtifactKind) -> list[str]:
+        """Sorted names of every markdown file of a kind"""
+        return list(self._listing(kind).names)
+
+    def exists(self, kind: ArtifactKind, filename: str) -> bool:
+        """Whether a file of a kind exists"""
+        return filename in self._listing(kind).name_set
+
+    def find(
+        self, kind: ArtifactKind, prefix: str, suffix: str = ".md"
+    ) -> list[str]:
+        """
+        Files whose name starts with a prefix (same matches as `{prefix}*{suffix}`).
+
+        Args:
+            kind: Data subdirectory ("ideas", "stories" or "ac")
+            prefix: Filename prefix (e.g., "01")
+            suffix: Required filename suffix (e.g., "-stories.md")
+
+        Returns:
+            Sorted list of matching filenames
+        """
+        names = self._listing(kind).names
+        start = bisect.bisect_left(names, prefix)
+        matches = []
+
+        for name in names[start:]:
+            if not name.startswith(prefix):
+                break
+            if name.endswith(suffix):
+                matches.append(name)
+
+        return matches
+
+    def path(self, kind: ArtifactKind, filename: str) -> Path | None:
+        """Path of a file in the index, or None if it does not exist"""
+        if not self.exists(kind, filename):
+            return None
+        return self.data_dir / kind / filename
+
+    def _signature(self, path: Path) -> tuple | None:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_ino, stat.st_size)
+
+    def size(self, kind: ArtifactKind, filename: str) -> int | None:
+        """Size of a file in bytes, or None if it is not in the index"""
+        path = self.path(kind, filename)
+        signature = self._signature(path) if path else None
+        return signature[2] if signature else None
+
+    def read(self, kind: ArtifactKind, filename: str) -> str | None:
+        """
+        Content of a file, cached until its mtime, inode or size changes.
+
+        Args:
+            kind: Data subdirectory ("ideas", "stories" or "ac")
+            filename: Name of the file
+
+        Returns:
+            File content, or None if the file is not in the index
+        """
+        path = self.path(kind, filename)
+        signature = self._signature(path) if path else None
+        if signature is None:
+            return None
+
+        key = (kind, filename)
+        with self._lock:
+            cached = self._content.get(key)
+            if cached is not None and cached[0] == signature:
+                self._content.move_to_end(key)
+                return cached[1]
+
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+
+        if signature[2] <= min(MAX_CACHED_BYTES, self.cache_bytes):
+            self._cache_content(key, signature, content)
+        return content
+
+    def _cache_content(self, key: tuple[str, str], signature: tuple, content: str):
+        """Keep a file's content, evicting least recently read files over the cap"""
+        with self._lock:
+            previous = self._content.pop(key, None)
+            if previous is not None:
+                self._content_bytes -= previous[0][2]
+
+            self._content[key] = (signature, content)
+            self._content_bytes += signature[2]
+
+            while self._content_bytes > self.cache_bytes:
+                _, (evicted, _) = self._content.popitem(last=False)
+                self._content_bytes -= evicted[2]
+
+    def outline(self, kind: ArtifactKind, filename: str) -> list[Section] | None:
+        """
+        Markdown sections of a file, cached until the file changes.
+
+        Args:
+            kind: Data subdirectory ("ideas", "stories" or "ac")
+            filename: Name of the file
+
+        Returns:
+            Sections with byte ranges (see artifacts.sections.outline), or
+            None if the file is not in the index
+        """
+        path = self.path(kind, filename)
+        signature = self._signature(path) if path else None
+        if signature is None:
+            return None
+
+        cached = self._outlines.get((kind, filename))
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        sections = outline(path)
+        self._outlines[(kind, filename)] = (signature, sections)
+        return sections
+
+    def lineage(self, idea_filename: str) -> dict:
+        """
+        Stories and AC generated from an idea file.
+
+        Args:
+            idea_filename: Name of the idea file (e.g., "01-feat-pagination.md")
+
+        Returns:
+            Dictionary with the idea filename, its story filename (or None)
+            and the list of AC filenames derived from it
+        """
+        key = feature_key("ideas", idea_filename)
+        story = f"{key}-stories.md"
+
+        return {
+            "idea": idea_filename,
+            "story": story if self.exists("stories", story) else None,
+            "ac": [
+                name
+                for name in self.find("ac", key)
+                if feature_key("ac", name) == key
+            ],
+        }
+
+    def invalidate(self) -> None:
+        """Drop every cached listing and file content"""
+        with self._lock:
+            self._listings.clear()
+            self._content.clear()
+            self._content_bytes = 0
+            self._outlines.clear()
+
+
+_index = ArtifactIndex()
+
+
+def get_index() -> ArtifactIndex:
+    """Return the process-wide artifact index"""
+    return _index
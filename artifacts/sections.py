@@ -0,0 +1,179 @@
+"""
+Memory-mapped, sectioned reads of large markdown artifacts.
+
+Imported ideas can be multi-megabyte spec dumps. Instead of reading a whole
+file into a string, the file is memory-mapped and only the requested bytes
+are decoded: a Markdown section (a heading and everything up to the next
+heading of the same or a higher level) or an explicit byte range. Heading
+outlines are built by scanning the mapped bytes, skipping fenced code blocks.
+
+Usage:
+    from artifacts.sections import outline, read_range, read_section
+
+    for section in outline(path):
+        print(section["level"], section["title"], section["start"], section["end"])
+
+    text = read_section(path, "Acceptance Notes")
+    chunk = read_range(path, 0, 65536)
+"""
+
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+from typing_extensions import TypedDict
+
+
+# ATX headings and code fence delimiters, one match per line
+_LINE = re.compile(rb"^(?:(#{1,6})[ \t]+(.*?)[ \t#]*|(```|~~~).*?)\r?$", re.MULTILINE)
+
+
+class Section(TypedDict):
+    """One Markdown section and its byte range in the file"""
+
+    level: int
+    title: str
+    start: int
+    end: int
+
+
+@contextmanager
+def mapped(path: Path):
+    """
+    Map a file read-only.
+
+    Yields:
+        mmap of the file, or b"" for an empty file (which cannot be mapped)
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield b""
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            yield data
+
+
+def _decode(data: bytes) -> str:
+    # Range edges may split a multi-byte character
+    return data.decode("utf-8", errors="replace")
+
+
+def outline(path: Path) -> list[Section]:
+    """
+    Headings of a Markdown file with the byte range of each section.
+
+    A section ends where the next heading of the same or a higher level
+    starts, so it includes its subsections.
+
+    Args:
+        path: Markdown file
+
+    Returns:
+        Sections in document order (empty if the file has no headings)
+    """
+    sections: list[Section] = []
+    in_fence = None
+
+    with mapped(path) as data:
+        size = len(data)
+
+        for match in _LINE.finditer(data):
+            hashes, title, fence = match.groups()
+
+            if fence:
+                if in_fence is None:
+                    in_fence = fence
+                elif fence == in_fence:
+                    in_fence = None
+                continue
+            if in_fence is not None:
+                continue
+
+            sections.append(
+                {
+                    "level": len(hashes),
+                    "title": _decode(title).strip(),
+                    "start": match.start(),
+                    "end": size,
+                }
+            )
+
+    # Close each section at the next heading of the same or a higher level
+    for i, section in enumerate(sections):
+        for following in sections[i + 1 :]:
+            if following["level"] <= section["level"]:
+                section["end"] = following["start"]
+                break
+
+    return sections
+
+
+def read_range(path: Path, start: int = 0, end: int | None = None) -> str:
+    """
+    Decode a byte range of a file without reading the rest of it.
+
+    Args:
+        path: File to read
+        start: First byte (clamped to the file)
+        end: Byte after the last one (None = end of file)
+
+    Returns:
+        Text of the range
+    """
+    with mapped(path) as data:
+        size = len(data)
+        start = min(max(0, start), size)
+        end = size if end is None else min(max(start, end), size)
+        return _decode(data[start:end])
+
+
+def find_section(sections: list[Section], heading: str) -> Section | None:
+    """
+    Section matching a heading: exact title first, then case-insensitive,
+    then the first title containing the text.
+    """
+    wanted = heading.strip().lstrip("#").strip()
+
+    for matches in (
+        lambda title: title == wanted,
+        lambda title: title.lower() == wanted.lower(),
+        lambda title: wanted.lower() in title.lower(),
+    ):
+        for section in sections:
+            if matches(section["title"]):
+                return section
+
+    return None
+
+
+def read_section(path: Path, heading: str) -> str | None:
+    """
+    Text of the section under a heading (including its subsections).
+
+    Args:
+        path: Markdown file
+        heading: Heading title, with or without leading #'s
+
+    Returns:
+        Section text, or None if no heading matches
+    """
+    section = find_section(outline(path), heading)
+    if section is None:
+        return None
+    return read_range(path, section["start"], section["end"])
+
+
+def format_outline(sections: list[Section], size: int) -> str:
+    """Outline as indented lines with byte ranges, for tool responses"""
+    lines = [f"File size: {size} bytes"]
+    for section in sections:
+        indent = "  " * (section["level"] - 1)
+        lines.append(
+            f"{indent}{'#' * section['level']} {section['title']} "
+            f"[bytes {section['start']}-{section['end']}]"
+        )
+    if not sections:
+        lines.append("(no Markdown headings)")
+    return "\n".join(lines)
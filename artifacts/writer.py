@@ -0,0 +1,172 @@
+"""
+Atomic and incremental writers for generated artifacts.
+
+Generated files are written to a hidden `.<name>.<random>.partial` file
+next to the target and renamed into place once complete, so readers never
+see a half-written artifact. Each writer gets its own partial file, so
+concurrent writers of one target (worker processes, daemon jobs, queue
+workers) never write into or rename each other's files; the last rename
+wins. If generation crashes, the partial file is left behind for
+inspection.
+
+Inside guard_writes(check), check(path) runs before each write is renamed
+into place and refuses it by raising. Queue workers use this so a worker
+that lost its lease on a feature cannot overwrite the new owner's output.
+
+Usage:
+    from artifacts.writer import StreamingFileWriter, write_atomic
+
+    write_atomic(path, content)
+
+    with StreamingFileWriter(path) as writer:
+        for token in tokens:
+            writer.write(token)
+        writer.commit(final_content)
+
+    with guard_writes(check):
+        write_atomic(path, content)   # check(path) raises to refuse the write
+"""
+
+import contextvars
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable
+
+
+# Check run before every write in the current context (see guard_writes)
+_guard: contextvars.ContextVar = contextvars.ContextVar(
+    "sdlc_write_guard", default=None
+)
+
+
+@contextmanager
+def guard_writes(check: Callable[[Path], None]):
+    """
+    Run a check before every artifact write made inside the block.
+
+    The guard is a context variable, so it follows the block into the
+    asyncio tasks and context-copying worker threads it starts.
+
+    Args:
+        check: Called with the target path; raises to refuse the write
+    """
+    token = _guard.set(check)
+    try:
+        yield
+    finally:
+        _guard.reset(token)
+
+
+def _check(path: Path) -> None:
+    check = _guard.get()
+    if check is not None:
+        check(Path(path))
+
+
+def open_partial(path: Path):
+    """
+    Create a unique temp file next to an artifact for writing it.
+
+    Args:
+        path: Target file path
+
+    Returns:
+        Tuple of the open text file and its path
+    """
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=path.parent, prefix=f".{path.name}.", suffix=".partial"
+    )
+    return os.fdopen(fd, "w", encoding="utf-8"), Path(tmp_path)
+
+
+def write_atomic(path: Path, content: str) -> None:
+    """
+    Write a file so it either has the old or the new content, never a mix.
+
+    Args:
+        path: Target file path
+        content: Content to write
+    """
+    f, tmp_path = open_partial(path)
+    try:
+        with f:
+            f.write(content)
+        _check(path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class StreamingFileWriter:
+    """
+    Context manager that streams text into a partial file and renames it on commit.
+
+    Args:
+        path: Target file path, or None to disable writing (all calls become no-ops)
+
+    Leaving the context without calling commit() after an exception keeps the
+    partial file; leaving it normally without commit() removes it. A commit
+    refused by guard_writes() removes it too.
+    """
+
+    def __init__(self, path: Path | None):
+        self.path = Path(path) if path else None
+        self.tmp_path = None
+        self._file = None
+        self.committed = False
+
+    def __enter__(self):
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file, self.tmp_path = open_partial(self.path)
+        return self
+
+    def write(self, text: str) -> None:
+        """Append text and flush it to disk"""
+        if self._file:
+            self._file.write(text)
+            self._file.flush()
+
+    def reset(self) -> None:
+        """Discard everything written so far (e.g., when a new message starts)"""
+        if self._file:
+            self._file.seek(0)
+            self._file.truncate()
+
+    def commit(self, content: str) -> str | None:
+        """
+        Replace the streamed text with the final content and move it into place.
+
+        Args:
+            content: Final artifact content
+
+        Returns:
+            Path of the committed file, or None if writing is disabled
+        """
+        if not self._file:
+            return None
+
+        self.reset()
+        self._file.write(content)
+        self._file.close()
+        try:
+            _check(self.path)
+            os.replace(self.tmp_path, self.path)
+        except BaseException:
+            # A refused or failed commit leaves nothing behind to inspect
+            self.tmp_path.unlink(missing_ok=True)
+            raise
+        self.committed = True
+
+        return str(self.path)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._file and not self.committed:
+            self._file.close()
+            if exc_type is None:
+                self.tmp_path.unlink(missing_ok=True)
+        return False
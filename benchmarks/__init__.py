@@ -0,0 +1,10 @@
+"""
+Offline benchmarks for the SDLC workflow.
+
+Runs the real workflow graph against a fake chat model on synthetic idea
+corpora, reporting throughput, latency percentiles and peak memory.
+
+Usage:
+    python -m benchmarks                       # 10, 1,000 and 10,000 ideas
+    python -m benchmarks --sizes 10 100        # Custom corpus sizes
+"""
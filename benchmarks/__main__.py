@@ -0,0 +1,88 @@
+"""
+Entry point for the offline workflow benchmark.
+
+Usage:
+    python -m benchmarks                           # 10, 1,000 and 10,000 ideas
+    python -m benchmarks --sizes 10 100            # Custom corpus sizes
+    python -m benchmarks --latency 0.2 --tokens-per-second 100
+    python -m benchmarks --output bench.json       # Save results for CI tracking
+"""
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark the SDLC workflow offline with a fake chat model"
+    )
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=[10, 1000, 10000],
+        help="Synthetic corpus sizes to run (default: 10 1000 10000)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.05,
+        help="Fake model latency per call in seconds (default: 0.05)",
+    )
+    parser.add_argument(
+        "--tokens-per-second",
+        type=float,
+        default=0.0,
+        help="Fake model output token rate (default: 0 = instant)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Maximum number of workflows in flight at once (default: 16)",
+    )
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="Inject file content into prompts instead of using tool calls",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="PATH",
+        help="Write the benchmark rows as JSON to this file",
+    )
+    parser.add_argument(
+        "--keep",
+        action="store_true",
+        help="Keep the scratch data directory instead of deleting it",
+    )
+
+    args = parser.parse_args()
+
+    # Point every agent at a scratch data directory before the repo modules
+    # resolve DATA_DIR at import time
+    data_dir = tempfile.mkdtemp(prefix="sdlc-bench-")
+    os.environ["SDLC_DATA_DIR"] = data_dir
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+
+    from .runner import run_benchmark
+
+    try:
+        rows = run_benchmark(
+            args.sizes,
+            latency=args.latency,
+            tokens_per_second=args.tokens_per_second,
+            max_concurrency=args.max_concurrency,
+            direct_context=args.direct,
+        )
+    finally:
+        if not args.keep:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+        print(f"📁 Results saved to: {args.output}")
@@ -0,0 +1,59 @@
+"""
+Synthetic feature-idea corpus for benchmarks.
+
+Writes numbered idea files shaped like the hand-written ones in data/ideas,
+so benchmarks exercise the same prompts, file lookups and output paths.
+
+Usage:
+    from benchmarks.corpus import write_corpus
+
+    filenames = write_corpus(Path("/tmp/bench-data"), 1000)
+"""
+
+from pathlib import Path
+
+
+IDEA_TEMPLATE = """# Feature: Synthetic Capability {number}
+
+## Problem
+Users of screen {number} wait too long for results and cannot tell whether
+the page is still loading.
+
+## Proposed Solution
+Add a loading indicator and paginate results in pages of 20 items.
+
+## Acceptance Notes
+- Show the indicator within 100 ms of a request
+- Hide the indicator when results arrive or the request fails
+- Keep the current page when results are refreshed
+"""
+
+
+def idea_filename(number: int) -> str:
+    """Name of the synthetic idea file with a given number"""
+    return f"{number:05d}-feat-synthetic-{number}.md"
+
+
+def write_corpus(data_dir: Path, count: int) -> list[str]:
+    """
+    Write a synthetic corpus of idea files.
+
+    Args:
+        data_dir: Data directory to populate (ideas are written to data_dir/ideas)
+        count: Number of idea files
+
+    Returns:
+        Sorted list of idea filenames
+    """
+    ideas_dir = Path(data_dir) / "ideas"
+    ideas_dir.mkdir(parents=True, exist_ok=True)
+
+    filenames = []
+    for number in range(1, count + 1):
+        filename = idea_filename(number)
+        (ideas_dir / filename).write_text(
+            IDEA_TEMPLATE.format(number=number), encoding="utf-8"
+        )
+        filenames.append(filename)
+
+    return filenames
@@ -0,0 +1,228 @@
+"""
+Deterministic fake chat model for offline benchmarks.
+
+Behaves like a tool-calling chat model without touching the network: by
+default, on the first turn it asks for the source file with
+`get_idea_file`/`get_story_file` (unless the content was already injected
+into the prompt), then answers with a fixed Gherkin document. A tool script
+replaces that first turn with any number of tool-calling rounds, so
+multi-round tool loops can be measured too. Latency and token rate are
+configurable so the orchestration overhead of the real graphs can be
+measured in isolation.
+
+Usage:
+    from benchmarks.fake_model import FakeChatModel
+
+    model = FakeChatModel(latency=0.05, tokens_per_second=500)
+
+    # Outline first, then two sections in parallel, then the answer
+    outline = {"name": "get_idea_section", "args": {"filename": "{filename}"}}
+    section = {"name": "get_idea_section", "args": {"filename": "{filename}",
+                                                   "start": 0, "end": 512}}
+    model = FakeChatModel(tool_script=[[outline], [section, section]])
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    BaseMessage,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+FILENAME_PATTERN = re.compile(r"[\w.-]+\.md")
+
+
+def fake_gherkin(scenarios: int) -> str:
+    """Deterministic Gherkin document with the given number of scenarios"""
+    lines = [
+        "Feature: Synthetic feature",
+        "  As a user, I want a synthetic capability so that benchmarks are stable.",
+        "",
+    ]
+
+    for index in range(1, scenarios + 1):
+        lines += [
+            f"  Scenario: Happy — synthetic behavior {index}",
+            f"    Given the catalog contains {index * 10} items",
+            f"    When the user requests page {index}",
+            f"    Then the response contains {min(index * 10, 20)} items",
+            "",
+        ]
+
+    return "\n".join(lines)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Scripted chat model with configurable latency and token rate.
+
+    Attributes:
+        latency: Seconds before the first token of every response
+        tokens_per_second: Output token rate (0 = the whole response at once)
+        scenarios: Number of scenarios in generated documents
+        model_name: Reported model name (part of the response cache key)
+        tool_script: Tool-calling rounds answered before the document, each
+            a list of {"name", "args"} calls; "{filename}" in a string
+            argument is replaced by the file named in the prompt (None = fetch
+            the source file unless it is inlined)
+    """
+
+    latency: float = 0.05
+    tokens_per_second: float = 0.0
+    scenarios: int = 4
+    model_name: str = "fake-chat"
+    tool_script: list[list[dict]] | None = None
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    # Scripted behavior
+
+    def _tool_calls(self, messages: list[BaseMessage], prompt: str) -> list[dict]:
+        """Tool calls for the current turn (empty once it is time to answer)"""
+        match = FILENAME_PATTERN.search(prompt)
+        filename = match.group(0) if match else ""
+
+        if self.tool_script is None:
+            has_context = "<file name=" in prompt or any(
+                isinstance(m, ToolMessage) for m in messages
+            )
+            if has_context:
+                return []
+            tool = "get_story_file" if "-stories" in filename else "get_idea_file"
+            return [{"name": tool, "args": {"filename": filename}, "id": "call_0"}]
+
+        rounds = sum(
+            1 for m in messages if isinstance(m, AIMessage) and m.tool_calls
+        )
+        if rounds >= len(self.tool_script):
+            return []
+
+        return [
+            {
+                "name": call["name"],
+                "args": {
+                    name: value.replace("{filename}", filename)
+                    if isinstance(value, str)
+                    else value
+                    for name, value in call.get("args", {}).items()
+                },
+                "id": f"call_{rounds}_{index}",
+            }
+            for index, call in enumerate(self.tool_script[rounds])
+        ]
+
+    def _respond(self, messages: list[BaseMessage]) -> AIMessage:
+        """Make the scripted tool calls first, then answer with Gherkin"""
+        prompt = next(
+            (m.content for m in messages if isinstance(m, HumanMessage)), ""
+        )
+        input_tokens = sum(len(str(m.content)) for m in messages) // 4
+
+        tool_calls = self._tool_calls(messages, prompt)
+        if tool_calls:
+            return AIMessage(
+                content="",
+                tool_calls=tool_calls,
+                usage_metadata={
+                    "input_tokens": input_tokens,
+                    "output_tokens": 10,
+                    "total_tokens": input_tokens + 10,
+                },
+                response_metadata={"model_name": self.model_name},
+            )
+
+        content = fake_gherkin(self.scenarios)
+        output_tokens = len(content.split())
+
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self.model_name},
+        )
+
+    def _generation_time(self, message: AIMessage) -> float:
+        if not self.tokens_per_second:
+            return self.latency
+        tokens = message.usage_metadata["output_tokens"]
+        return self.latency + tokens / self.tokens_per_second
+
+    def _chunks(self, message: AIMessage) -> list[AIMessageChunk]:
+        """Split a response into per-token chunks (tool calls stay whole)"""
+        if message.tool_calls or not message.content:
+            return [
+                AIMessageChunk(
+                    content=message.content,
+                    tool_call_chunks=[
+                        {
+                            "name": call["name"],
+                            "args": str(call["args"]).replace("'", '"'),
+                            "id": call["id"],
+                            "index": i,
+                        }
+                        for i, call in enumerate(message.tool_calls)
+                    ],
+                    usage_metadata=message.usage_metadata,
+                )
+            ]
+
+        words = re.findall(r"\S+\s*", message.content)
+        chunks = [AIMessageChunk(content=word) for word in words]
+        chunks[-1].usage_metadata = message.usage_metadata
+        return chunks
+
+    # BaseChatModel interface
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._respond(messages)
+        time.sleep(self._generation_time(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        message = self._respond(messages)
+        await asyncio.sleep(self._generation_time(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+
+        for chunk in self._chunks(self._respond(messages)):
+            time.sleep(delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.content, chunk=generation)
+            yield generation
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        await asyncio.sleep(self.latency)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+
+        for chunk in self._chunks(self._respond(messages)):
+            await asyncio.sleep(delay)
+            generation = ChatGenerationChunk(message=chunk)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.content, chunk=generation)
+            yield generation
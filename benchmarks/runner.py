@@ -0,0 +1,149 @@
+"""
+Offline end-to-end benchmark of the SDLC workflow.
+
+Drives the real compiled workflow graph (batch runner, tool executor,
+artifact index, manifests and file writes) with a fake chat model, so
+orchestration throughput and latency can be measured without network access.
+
+SDLC_DATA_DIR must point at a scratch directory before this module is
+imported; `python -m benchmarks` takes care of that.
+
+Usage:
+    from benchmarks.runner import run_benchmark
+
+    rows = run_benchmark([10, 1000], latency=0.05, max_concurrency=16)
+"""
+
+import asyncio
+import contextlib
+import io
+import resource
+import sys
+import time
+
+from ac_writer.agent import use_model as use_ac_model
+from artifacts.index import DATA_DIR, get_index
+from runtime.cache import configure_cache
+from user_story.agent import use_model as use_story_model
+from workflow.batch import arun_batch
+
+from .corpus import write_corpus
+from .fake_model import FakeChatModel
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MiB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_size(idea_filenames: list[str], max_concurrency: int, direct_context: bool) -> dict:
+    """
+    Run one batch and measure it.
+
+    Args:
+        idea_filenames: Idea files in the batch
+        max_concurrency: Maximum number of workflows in flight at once
+        direct_context: Inject file content into the agent prompts
+
+    Returns:
+        Benchmark row with throughput, latency percentiles, LLM calls and peak RSS
+    """
+    started = time.perf_counter()
+
+    # The batch runner prints a line per file; keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = asyncio.run(
+            arun_batch(
+                idea_filenames,
+                max_concurrency=max_concurrency,
+                force=True,
+                direct_context=direct_context,
+            )
+        )
+
+    wall_time = time.perf_counter() - started
+    stats = report["stats"]
+    llm_calls = sum(1 for e in report["metrics"].events if e["kind"] == "llm")
+
+    return {
+        "size": len(idea_filenames),
+        "failed": stats["failed"],
+        "wall_time": wall_time,
+        "throughput_per_s": len(idea_filenames) / wall_time if wall_time else 0.0,
+        "latency_p50": stats["latency_p50"],
+        "latency_p95": stats["latency_p95"],
+        "latency_max": stats["latency_max"],
+        "llm_calls": llm_calls,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def print_rows(rows: list[dict]) -> None:
+    """Print benchmark rows as a table"""
+    print("=" * 80)
+    print("Workflow Benchmark (fake chat model)")
+    print("=" * 80)
+    print(
+        f"{'files':>7}{'failed':>8}{'wall s':>9}{'files/s':>10}"
+        f"{'p50 s':>8}{'p95 s':>8}{'max s':>8}{'llm calls':>11}{'peak MiB':>11}"
+    )
+    print("-" * 80)
+
+    for row in rows:
+        print(
+            f"{row['size']:>7}{row['failed']:>8}{row['wall_time']:>9.2f}"
+            f"{row['throughput_per_s']:>10.1f}{row['latency_p50']:>8.2f}"
+            f"{row['latency_p95']:>8.2f}{row['latency_max']:>8.2f}"
+            f"{row['llm_calls']:>11}{row['peak_rss_mb']:>11.1f}"
+        )
+
+    print()
+
+
+def run_benchmark(
+    sizes: list[int],
+    latency: float = 0.05,
+    tokens_per_second: float = 0.0,
+    max_concurrency: int = 16,
+    direct_context: bool = False,
+    tool_script: list[list[dict]] | None = None,
+) -> list[dict]:
+    """
+    Benchmark the workflow on synthetic corpora of increasing size.
+
+    Args:
+        sizes: Corpus sizes to run (e.g., [10, 1000, 10000])
+        latency: Fake model latency before the first token, in seconds
+        tokens_per_second: Fake model output rate (0 = instant)
+        max_concurrency: Maximum number of workflows in flight at once
+        direct_context: Inject file content into the agent prompts
+        tool_script: Tool-calling rounds the fake model makes before each
+            answer (see FakeChatModel; None = fetch the source file once)
+
+    Returns:
+        One benchmark row per corpus size
+    """
+    chat_model = FakeChatModel(
+        latency=latency, tokens_per_second=tokens_per_second, tool_script=tool_script
+    )
+    use_story_model(chat_model)
+    use_ac_model(chat_model)
+
+    # Every call must reach the (fake) model to measure the full path
+    configure_cache(enabled=False)
+
+    print(f"📝 Writing {max(sizes)} synthetic ideas to {DATA_DIR}")
+    idea_filenames = write_corpus(DATA_DIR, max(sizes))
+    get_index().invalidate()
+    print()
+
+    rows = []
+    for size in sorted(sizes):
+        print(f"⏱️  Running {size} files...")
+        rows.append(run_size(idea_filenames[:size], max_concurrency, direct_context))
+
+    print()
+    print_rows(rows)
+    return rows
@@ -0,0 +1,15 @@
+"""
+Local eval gates for generated stories and acceptance criteria.
+"""
+
+from .gherkin import combine, format_report, validate
+from .repair import aapply_gates, apply_gates, check_output
+
+__all__ = [
+    "aapply_gates",
+    "apply_gates",
+    "check_output",
+    "combine",
+    "format_report",
+    "validate",
+]
@@ -0,0 +1,227 @@
+"""
+Local Gherkin eval-gate validator for story and AC outputs.
+
+Checks generated documents against the Eval Gates in the agent prompts
+without an LLM call:
+
+- 3–7 Scenarios per stories document (document gate)
+- At least one Given, one When and one Then per Scenario / AC block
+- A single primary action per When (one When step, no "and/or")
+- No banned words: should, etc., maybe, quickly, intuitive, TBD
+
+Blocks are `Scenario:`-style blocks in stories and `AC-<n>:` blocks (or
+scenarios) in AC documents; markdown around them (headings, code fences) is
+tolerated. Parsing is a single pass over the lines with precompiled
+patterns, so a typical document validates in microseconds.
+
+Usage:
+    from evals.gherkin import validate
+
+    report = validate(story_text, kind="stories")
+    if not report["passed"]:
+        for violation in report["violations"]:
+            print(violation["block"], violation["gate"], violation["message"])
+"""
+
+import re
+from typing import Literal
+
+from typing_extensions import TypedDict
+
+
+OutputKind = Literal["stories", "ac"]
+
+MIN_SCENARIOS = 3
+MAX_SCENARIOS = 7
+
+BANNED_WORDS = ("should", "etc.", "maybe", "quickly", "intuitive", "TBD")
+
+_BANNED = re.compile(
+    r"\b(should|maybe|quickly|intuitive|TBD)\b|\betc\b\.?", re.IGNORECASE
+)
+
+# Start of a scenario or AC block, optionally as a markdown heading or in bold
+_BLOCK = re.compile(
+    r"^\s*(?:#{1,6}\s*)?(?:\*\*)?"
+    r"(Scenario Outline|Scenario Template|Scenario|Example|AC-\d+)\s*:",
+)
+_CONTEXT = re.compile(r"^\s*(Feature|Background|Rule)\s*:")
+_STEP = re.compile(r"^[\s*\-]*(Given|When|Then|And|But)\b[*\s]*(.*)$")
+_FENCE = re.compile(r"^\s*(```|~~~)")
+# Unindented markdown only: indented `#` lines are Gherkin comments
+_BREAK = re.compile(r"^(#{1,6}\s|---\s*$)")
+
+# Several actions in one When step
+_COMPOUND_ACTION = re.compile(r"\band/or\b|\band then\b|,\s*then\b", re.IGNORECASE)
+
+
+class Block(TypedDict):
+    """One scenario or AC block"""
+
+    name: str
+    text: str
+    steps: list[tuple[str, str]]
+
+
+class Violation(TypedDict):
+    """One failed gate (block is None for document gates)"""
+
+    block: str | None
+    gate: str
+    message: str
+
+
+class GateReport(TypedDict):
+    """Validation result of one document"""
+
+    passed: bool
+    blocks: int
+    violations: list[Violation]
+
+
+def _join(lines: list[str]) -> str:
+    return "\n".join(lines).strip("\n")
+
+
+def parse(text: str) -> tuple[str, list[Block]]:
+    """
+    Split a document into its shared context and scenario/AC blocks.
+
+    Args:
+        text: Stories or AC document
+
+    Returns:
+        Tuple of the Feature/Background context text and the blocks in
+        document order (each with its exact text and (keyword, text) steps,
+        And/But resolved to the keyword they continue)
+    """
+    context: list[str] = []
+    blocks: list[Block] = []
+    current: list[str] | None = None
+    in_context = False
+
+    def finish() -> None:
+        if current:
+            block_text = _join(current)
+            steps, keyword = [], None
+            for line in current[1:]:
+                step = _STEP.match(line)
+                if step:
+                    word, rest = step.groups()
+                    keyword = keyword if word in ("And", "But") and keyword else word
+                    steps.append((keyword, rest))
+            blocks.append(
+                {"name": current[0].strip(), "text": block_text, "steps": steps}
+            )
+
+    for line in text.splitlines():
+        if _BLOCK.match(line):
+            finish()
+            current, in_context = [line], False
+        elif _CONTEXT.match(line):
+            finish()
+            current, in_context = None, True
+            context.append(line)
+        elif _FENCE.match(line):
+            continue
+        elif _BREAK.match(line):
+            finish()
+            current, in_context = None, False
+        elif current is not None:
+            current.append(line)
+        elif in_context:
+            context.append(line)
+
+    finish()
+    return _join(context), blocks
+
+
+def block_violations(block: Block) -> list[Violation]:
+    """Gate violations of one scenario/AC block"""
+    violations = []
+
+    def fail(gate: str, message: str) -> None:
+        violations.append({"block": block["name"], "gate": gate, "message": message})
+
+    keywords = [keyword for keyword, _ in block["steps"]]
+    missing = [k for k in ("Given", "When", "Then") if k not in keywords]
+    if missing:
+        fail("steps", f"Missing {'/'.join(missing)} step")
+
+    actions = [text for keyword, text in block["steps"] if keyword == "When"]
+    if len(actions) > 1:
+        fail("single_action", f"{len(actions)} When steps; use one primary action")
+    elif actions and _COMPOUND_ACTION.search(actions[0]):
+        fail("single_action", f"Compound action in When: '{actions[0]}'")
+
+    banned = sorted({match.group(0) for match in _BANNED.finditer(block["text"])})
+    if banned:
+        fail("banned_words", f"Banned words: {', '.join(banned)}")
+
+    return violations
+
+
+def validate(text: str, kind: OutputKind = "stories") -> GateReport:
+    """
+    Check a generated document against the eval gates.
+
+    Args:
+        text: Generated stories or AC document
+        kind: "stories" (scenario count gate applies) or "ac"
+
+    Returns:
+        GateReport with passed, number of blocks and the violations
+    """
+    context, blocks = parse(text or "")
+    violations: list[Violation] = []
+
+    if kind == "stories" and not MIN_SCENARIOS <= len(blocks) <= MAX_SCENARIOS:
+        violations.append(
+            {
+                "block": None,
+                "gate": "scenario_count",
+                "message": f"{len(blocks)} scenarios; expected "
+                f"{MIN_SCENARIOS}–{MAX_SCENARIOS}",
+            }
+        )
+    elif kind == "ac" and not blocks:
+        violations.append(
+            {"block": None, "gate": "steps", "message": "No AC or scenario blocks"}
+        )
+
+    banned = sorted({match.group(0) for match in _BANNED.finditer(context)})
+    if banned:
+        violations.append(
+            {
+                "block": None,
+                "gate": "banned_words",
+                "message": f"Banned words in Feature/Background: {', '.join(banned)}",
+            }
+        )
+
+    for block in blocks:
+        violations.extend(block_violations(block))
+
+    return {"passed": not violations, "blocks": len(blocks), "violations": violations}
+
+
+def format_report(report: GateReport) -> str:
+    """One-line summary of a report (e.g., for status output)"""
+    if report["passed"]:
+        return f"{report['blocks']} blocks, all eval gates passed"
+
+    gates = sorted({violation["gate"] for violation in report["violations"]})
+    return (
+        f"{report['blocks']} blocks, {len(report['violations'])} violations "
+        f"({', '.join(gates)})"
+    )
+
+
+def combine(reports: list[GateReport]) -> GateReport:
+    """Merge the reports of the parts of one document (e.g., per-scenario AC)"""
+    violations = [violation for report in reports for violation in report["violations"]]
+    return {
+        "passed": not violations,
+        "blocks": sum(report["blocks"] for report in reports),
+        "violations": violations,
+    }
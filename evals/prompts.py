@@ -0,0 +1,11 @@
+"""
+Prompts for targeted repairs of outputs that fail the eval gates.
+"""
+
+REPAIR_PROMPT = """The {count} blocks from {filename} shown above fail these Eval Gates:
+
+{violations}
+
+Rewrite only these {count} blocks so that every Eval Gate passes. Keep each \
+block's header line and the behavior it describes. Return exactly {count} \
+blocks in the same order and nothing else (no Feature line, no commentary)."""
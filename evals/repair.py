@@ -0,0 +1,239 @@
+"""
+Targeted repair of generated outputs that fail the eval gates.
+
+Instead of regenerating a whole document when a gate fails, only the
+offending scenario/AC blocks (with the shared Feature/Background context)
+are sent back to the agent's model. Each rewritten block is spliced into
+the original text in place of the block it repairs, and only if it fails
+fewer gates than before; the document is then validated again. Document
+gates (scenario count, banned words in the Feature text) are reported but
+not repaired.
+
+Repair rounds per output come from SDLC_REPAIR_ROUNDS (default: 1; 0 only
+validates).
+
+Usage:
+    from evals.repair import apply_gates
+
+    result = agent.invoke(agent_input)
+    result = apply_gates(result, "stories", repairer, "01-feat-pagination.md")
+    result["validation"]    # GateReport of the final output
+"""
+
+import os
+import textwrap
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from tools.file_retrieval import with_file_context
+from .gherkin import (
+    Block,
+    GateReport,
+    OutputKind,
+    block_violations,
+    parse,
+    validate,
+)
+from .prompts import REPAIR_PROMPT
+
+
+# Repair calls per output before the remaining violations are reported
+REPAIR_ROUNDS = int(os.environ.get("SDLC_REPAIR_ROUNDS", "1"))
+
+
+def final_content(messages: list) -> str | None:
+    """Content of the last assistant message without tool calls"""
+    for msg in reversed(messages):
+        if not getattr(msg, "tool_calls", None):
+            return msg.content
+    return None
+
+
+def repair_prompt(
+    text: str, report: GateReport, filename: str
+) -> tuple[str, list[Block]] | None:
+    """
+    Prompt asking for rewrites of the failing blocks of an output.
+
+    Args:
+        text: Generated stories or AC document
+        report: Its GateReport
+        filename: Source name shown to the model
+
+    Returns:
+        Tuple of the prompt (with the blocks inlined) and the failing blocks,
+        or None if no block can be repaired
+    """
+    failing_names = {v["block"] for v in report["violations"] if v["block"]}
+    if not failing_names:
+        return None
+
+    context, blocks = parse(text)
+    failing = [block for block in blocks if block["name"] in failing_names]
+
+    violations = "\n".join(
+        f"- {v['block']}: {v['message']}" for v in report["violations"] if v["block"]
+    )
+    prompt = REPAIR_PROMPT.format(
+        count=len(failing), filename=filename, violations=violations
+    )
+    excerpt = "\n\n".join([context] + [block["text"] for block in failing]).strip()
+
+    return with_file_context(prompt, filename, excerpt), failing
+
+
+def _repair_input(
+    text: str, report: GateReport, filename: str
+) -> tuple[dict, list[Block]] | None:
+    """Repair request for the failing blocks, or None if none can be repaired"""
+    request = repair_prompt(text, report, filename)
+    if request is None:
+        return None
+
+    prompt, failing = request
+    return {"messages": [HumanMessage(content=prompt)]}, failing
+
+
+def splice(text: str, failing: list[Block], rewritten: str) -> str:
+    """
+    Replace each failing block with its rewrite if the rewrite is better.
+
+    Args:
+        text: Document the blocks come from
+        failing: Blocks sent for repair (see repair_prompt)
+        rewritten: Model answer with one rewritten block per failing block
+
+    Returns:
+        The document with the improved blocks spliced in (unchanged if the
+        answer does not have one block per failing block)
+    """
+    _, rewrites = parse(rewritten)
+    if len(rewrites) != len(failing):
+        return text
+
+    for block, rewrite in zip(failing, rewrites):
+        if len(block_violations(rewrite)) >= len(block_violations(block)):
+            continue
+
+        header = block["text"].splitlines()[0]
+        indent = header[: len(header) - len(header.lstrip())]
+        replacement = textwrap.indent(textwrap.dedent(rewrite["text"]), indent)
+        text = text.replace(block["text"], replacement, 1)
+
+    return text
+
+
+def _splice(text: str, failing: list[Block], response) -> str:
+    """splice() for a repairer's response message"""
+    if getattr(response, "tool_calls", None) or not isinstance(response.content, str):
+        return text
+    return splice(text, failing, response.content)
+
+
+def check_output(
+    text: str,
+    kind: OutputKind,
+    repairer,
+    filename: str = "output",
+    rounds: int | None = None,
+) -> tuple[str, GateReport]:
+    """
+    Validate an output and repair its failing blocks.
+
+    Args:
+        text: Generated stories or AC document
+        kind: "stories" or "ac"
+        repairer: LLM node answering repair requests (see create_llm_node)
+        filename: Source name shown to the model
+        rounds: Repair rounds (default: REPAIR_ROUNDS)
+
+    Returns:
+        Tuple of the (possibly repaired) text and its GateReport
+    """
+    report = validate(text, kind)
+
+    for _ in range(REPAIR_ROUNDS if rounds is None else rounds):
+        request = None if report["passed"] else _repair_input(text, report, filename)
+        if request is None:
+            break
+
+        agent_input, failing = request
+        response = repairer.invoke(agent_input)["messages"][-1]
+        repaired = _splice(text, failing, response)
+        if repaired == text:
+            break
+
+        text, report = repaired, validate(repaired, kind)
+
+    return text, report
+
+
+async def acheck_output(
+    text: str,
+    kind: OutputKind,
+    repairer,
+    filename: str = "output",
+    rounds: int | None = None,
+) -> tuple[str, GateReport]:
+    """Async variant of check_output that awaits the repair calls"""
+    report = validate(text, kind)
+
+    for _ in range(REPAIR_ROUNDS if rounds is None else rounds):
+        request = None if report["passed"] else _repair_input(text, report, filename)
+        if request is None:
+            break
+
+        agent_input, failing = request
+        response = (await repairer.ainvoke(agent_input))["messages"][-1]
+        repaired = _splice(text, failing, response)
+        if repaired == text:
+            break
+
+        text, report = repaired, validate(repaired, kind)
+
+    return text, report
+
+
+def _with_output(result: dict, original: str, text: str, report: GateReport) -> dict:
+    """Agent result with the repaired output as its final message"""
+    messages = result["messages"]
+    if text != original:
+        messages = messages + [AIMessage(content=text)]
+    return {**result, "messages": messages, "validation": report}
+
+
+def apply_gates(
+    result: dict, kind: OutputKind, repairer, filename: str = "output"
+) -> dict:
+    """
+    Run the eval gates (and repairs) on the final output of an agent run.
+
+    Args:
+        result: Agent result with a "messages" list
+        kind: "stories" or "ac"
+        repairer: LLM node answering repair requests
+        filename: Source name shown to the model
+
+    Returns:
+        The result with the repaired output appended as the final message
+        and its GateReport under "validation" (unchanged if there is no
+        output)
+    """
+    original = final_content(result["messages"])
+    if not original:
+        return result
+
+    text, report = check_output(original, kind, repairer, filename)
+    return _with_output(result, original, text, report)
+
+
+async def aapply_gates(
+    result: dict, kind: OutputKind, repairer, filename: str = "output"
+) -> dict:
+    """Async variant of apply_gates"""
+    original = final_content(result["messages"])
+    if not original:
+        return result
+
+    text, report = await acheck_output(original, kind, repairer, filename)
+    return _with_output(result, original, text, report)
@@ -4,7 +4,13 @@ Reusable node functions for LangGraph agents.
 This module provides common node patterns that can be shared across different agents.
 """
 
+from .llm_call import create_llm_node, prefix_cache_key
 from .router import should_continue_on_tool_calls
 from .tool_executor import create_tool_executor
 
-__all__ = ["should_continue_on_tool_calls", "create_tool_executor"]
+__all__ = [
+    "should_continue_on_tool_calls",
+    "create_tool_executor",
+    "create_llm_node",
+    "prefix_cache_key",
+]
@@ -0,0 +1,128 @@
+"""
+Model node for calling a tool-bound LLM with a system prompt.
+"""
+
+import hashlib
+
+from langchain_core.callbacks import adispatch_custom_event, dispatch_custom_event
+from langchain_core.messages import SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from runtime.cache import get_cache
+from runtime.context import get_context_budget
+from runtime.metrics import CACHE_EVENT, CONTEXT_EVENT, RETRY_EVENT
+from runtime.ratelimit import get_rate_limiter
+
+
+# Completion tokens reserved per call until the actual usage is known
+OUTPUT_TOKEN_ESTIMATE = 1024
+
+
+def prefix_cache_key(name: str, system_prompt: str) -> str:
+    """
+    Provider prompt-cache routing key for an agent's stable request prefix.
+
+    Requests with the same key are routed to the same provider cache, so
+    every call from one agent (across features in a batch run) can reuse the
+    cached system prompt and tool definitions. The key changes whenever the
+    system prompt does.
+
+    Args:
+        name: Agent name (e.g., "user_story")
+        system_prompt: System prompt that starts every request
+
+    Returns:
+        Key such as "user_story-3f2a9c1b7d04"
+    """
+    digest = hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+    return f"{name}-{digest[:12]}"
+
+
+def total_tokens(response) -> int | None:
+    """Tokens actually used by a response, if the provider reported them"""
+    usage = getattr(response, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+def create_llm_node(
+    model_with_tools, system_prompt: str, prompt_cache_key: str | None = None
+):
+    """
+    Factory function that creates an LLM call node.
+
+    The node trims the conversation to the process-wide context budget
+    (deduplicated and stale tool results elided, input tokens capped),
+    prepends the system prompt and answers from the shared response cache
+    when the exact same request was seen before.
+    Cache misses go through the process-wide rate limiter, which paces calls
+    and retries throttled or transient failures. Trimming, cache lookups
+    and retries are reported as custom callback events for instrumentation.
+    Like the tool executor, it supports both `invoke` and `ainvoke`.
+
+    Requests are laid out for provider-side prefix caching: tools and the
+    system prompt first (identical on every call), then the conversation,
+    which only ever grows at the end.
+
+    Args:
+        model_with_tools: Chat model with tools bound
+        system_prompt: System prompt sent ahead of the conversation
+        prompt_cache_key: Provider prompt-cache routing key (see
+            prefix_cache_key; None = let the provider route by prefix)
+
+    Returns:
+        An llm_call runnable that appends the model response to the messages
+    """
+    if prompt_cache_key:
+        model_with_tools = model_with_tools.bind(prompt_cache_key=prompt_cache_key)
+
+    def llm_call(state: dict):
+        """LLM decides whether to call a tool or generate the final output"""
+        conversation, context = get_context_budget().trim(
+            system_prompt, state["messages"]
+        )
+        dispatch_custom_event(CONTEXT_EVENT, context)
+
+        cache = get_cache()
+        key = cache.key_for(model_with_tools, system_prompt, conversation)
+
+        response = cache.get(key)
+        dispatch_custom_event(CACHE_EVENT, {"hit": response is not None})
+
+        if response is None:
+            messages = [SystemMessage(content=system_prompt)] + conversation
+            response = get_rate_limiter().call(
+                lambda: model_with_tools.invoke(messages),
+                tokens=context["sent_tokens"] + OUTPUT_TOKEN_ESTIMATE,
+                usage=total_tokens,
+                on_retry=lambda info: dispatch_custom_event(RETRY_EVENT, info),
+            )
+            cache.put(key, response)
+
+        return {"messages": [response]}
+
+    async def allm_call(state: dict):
+        """Async variant of llm_call that awaits the model without blocking"""
+        conversation, context = get_context_budget().trim(
+            system_prompt, state["messages"]
+        )
+        await adispatch_custom_event(CONTEXT_EVENT, context)
+
+        cache = get_cache()
+        key = cache.key_for(model_with_tools, system_prompt, conversation)
+
+        response = cache.get(key)
+        await adispatch_custom_event(CACHE_EVENT, {"hit": response is not None})
+
+        if response is None:
+            messages = [SystemMessage(content=system_prompt)] + conversation
+            response = await get_rate_limiter().acall(
+                lambda: model_with_tools.ainvoke(messages),
+                tokens=context["sent_tokens"] + OUTPUT_TOKEN_ESTIMATE,
+                usage=total_tokens,
+                on_retry=lambda info: adispatch_custom_event(RETRY_EVENT, info),
+            )
+            cache.put(key, response)
+
+        return {"messages": [response]}
+
+    return RunnableLambda(llm_call, afunc=allm_call, name="llm_call")
@@ -1,33 +1,216 @@
 """
 Tool executor node for executing LLM tool calls.
+
+Each tool call gets its timeout measured from the moment it is submitted,
+so calls queued behind a large fan-out never wait longer than their own
+timeout in total. Python threads cannot be killed: a synchronous tool that
+times out keeps its worker thread until it returns. Once every worker is
+held by such a call, the node replaces its thread pool so new calls are not
+starved; the stuck threads exit when their tools return.
 """
 
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
 from langchain_core.messages import ToolMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.tools import BaseTool
+
+
+def _content(observation) -> str:
+    """Tool output as message content (strings are passed through, not copied)"""
+    return observation if isinstance(observation, str) else str(observation)
+
+
+def _has_sync(tool) -> bool:
+    """Whether a tool runs natively with invoke (a sync function or _run)"""
+    if getattr(tool, "func", None) is not None:
+        return True
+    return getattr(tool, "coroutine", None) is None
+
+
+def _has_async(tool) -> bool:
+    """Whether a tool runs natively with ainvoke (a coroutine or _arun)"""
+    if getattr(tool, "coroutine", None) is not None:
+        return True
+    if getattr(tool, "func", None) is not None:
+        return False
+    return type(tool)._arun is not BaseTool._arun
+
+
+def _run_sync(tool, args: dict):
+    """Run a tool on a worker thread, whichever interface it implements"""
+    if _has_sync(tool):
+        return tool.invoke(args)
+    return asyncio.run(tool.ainvoke(args))
+
 
+class _ToolPool:
+    """
+    Thread pool for synchronous tool calls that survives hung calls.
 
-def create_tool_executor(tools_by_name: dict):
+    Args:
+        max_workers: Worker threads per pool
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = self._new_executor()
+        self._hung: set[Future] = set()
+        self._lock = threading.Lock()
+
+    def _new_executor(self) -> ThreadPoolExecutor:
+        return ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="tool"
+        )
+
+    def submit(self, tool, args: dict) -> Future:
+        # Copy the context into the worker so callbacks (metrics, tracing)
+        # still see the calling node's run
+        with self._lock:
+            executor = self._executor
+        return executor.submit(contextvars.copy_context().run, _run_sync, tool, args)
+
+    def abandon(self, future: Future) -> None:
+        """Give up on a timed-out call (a queued call is dropped)"""
+        if future.cancel():
+            return
+
+        with self._lock:
+            self._hung.add(future)
+            stuck = None
+            if len(self._hung) >= self.max_workers:
+                # Every worker is stuck: new calls go to a fresh pool, and
+                # the old threads exit when their tools return
+                stuck, self._executor = self._executor, self._new_executor()
+                self._hung.clear()
+
+        if stuck is None:
+            future.add_done_callback(self._finished)
+        else:
+            stuck.shutdown(wait=False)
+
+    def _finished(self, future: Future) -> None:
+        with self._lock:
+            self._hung.discard(future)
+
+
+def create_tool_executor(
+    tools_by_name: dict,
+    max_parallelism: int = 4,
+    timeout: float | None = 30.0,
+    timeouts: dict[str, float] | None = None,
+):
     """
     Factory function that creates a tool execution node.
 
+    Independent tool calls from the same model turn are dispatched
+    concurrently. Each tool runs through the interface it implements: tools
+    with only a synchronous function run on a bounded thread pool (also
+    under `ainvoke`), coroutine tools are awaited (under `invoke`, on a pool
+    thread with their own event loop). ToolMessages are always returned in
+    the order of the original tool calls so the conversation stays
+    deterministic.
+
     Args:
         tools_by_name: Dictionary mapping tool names to tool functions
+        max_parallelism: Maximum number of tool calls running at once
+        timeout: Default per-tool timeout in seconds, measured from
+            submission (None = no timeout)
+        timeouts: Per-tool timeout overrides keyed by tool name
 
     Returns:
-        A tool_node function that executes tool calls
+        A tool_node runnable that executes tool calls
     """
+    timeouts = timeouts or {}
+    pool = _ToolPool(max(1, max_parallelism))
+
+    def _timeout_for(tool_call: dict) -> float | None:
+        return timeouts.get(tool_call["name"], timeout)
+
+    def _timed_out(tool_call: dict) -> ToolMessage:
+        return ToolMessage(
+            content=(
+                f"Error: Tool '{tool_call['name']}' timed out after "
+                f"{_timeout_for(tool_call)}s"
+            ),
+            tool_call_id=tool_call["id"],
+            status="error",
+        )
 
     def tool_node(state: dict):
         """Executes the tool calls from the last message"""
-        result = []
         last_message = state["messages"][-1]
+        tool_calls = last_message.tool_calls
+
+        submitted = time.monotonic()
+        futures = [
+            pool.submit(tools_by_name[tool_call["name"]], tool_call["args"])
+            for tool_call in tool_calls
+        ]
+
+        result = []
+        for tool_call, future in zip(tool_calls, futures):
+            limit = _timeout_for(tool_call)
+            remaining = (
+                None
+                if limit is None
+                else max(0.0, submitted + limit - time.monotonic())
+            )
+            try:
+                observation = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                pool.abandon(future)
+                result.append(_timed_out(tool_call))
+                continue
 
-        for tool_call in last_message.tool_calls:
-            tool = tools_by_name[tool_call["name"]]
-            observation = tool.invoke(tool_call["args"])
             result.append(
-                ToolMessage(content=str(observation), tool_call_id=tool_call["id"])
+                ToolMessage(content=_content(observation), tool_call_id=tool_call["id"])
             )
 
         return {"messages": result}
 
-    return tool_node
+    async def atool_node(state: dict):
+        """Async variant of tool_node that gathers the tool calls"""
+        last_message = state["messages"][-1]
+        semaphore = asyncio.Semaphore(max(1, max_parallelism))
+
+        async def call(tool, args: dict):
+            if _has_async(tool):
+                async with semaphore:
+                    return await tool.ainvoke(args)
+
+            # The pool bounds synchronous tools; waiting on it never blocks
+            # the event loop
+            future = pool.submit(tool, args)
+            try:
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except asyncio.CancelledError:
+                pool.abandon(future)
+                raise
+
+        async def run(tool_call: dict) -> ToolMessage:
+            tool = tools_by_name[tool_call["name"]]
+
+            try:
+                observation = await asyncio.wait_for(
+                    call(tool, tool_call["args"]), _timeout_for(tool_call)
+                )
+            except asyncio.TimeoutError:
+                return _timed_out(tool_call)
+
+            return ToolMessage(
+                content=_content(observation), tool_call_id=tool_call["id"]
+            )
+
+        result = await asyncio.gather(
+            *(run(tool_call) for tool_call in last_message.tool_calls)
+        )
+
+        return {"messages": list(result)}
+
+    return RunnableLambda(tool_node, afunc=atool_node, name="tool_node")
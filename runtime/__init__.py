@@ -0,0 +1,34 @@
+"""
+Runtime services shared by every agent in a process.
+
+This package holds cross-cutting infrastructure used by the LangGraph nodes,
+such as the LLM response cache, the shared LLM client pool, the rate
+limiter, the context budget, the batch API backends and request coalescing.
+"""
+
+from .batch_api import BatchBackend, get_batch_backend
+from .cache import LLMCache, configure_cache, get_cache
+from .clients import ClientRegistry, configure_clients, get_chat_model
+from .context import ContextBudget, configure_context_budget, get_context_budget
+from .ratelimit import RateLimiter, configure_rate_limiter, get_rate_limiter
+from .singleflight import SingleFlight, configure_single_flight, get_single_flight
+
+__all__ = [
+    "BatchBackend",
+    "get_batch_backend",
+    "LLMCache",
+    "configure_cache",
+    "get_cache",
+    "ClientRegistry",
+    "configure_clients",
+    "get_chat_model",
+    "ContextBudget",
+    "configure_context_budget",
+    "get_context_budget",
+    "RateLimiter",
+    "configure_rate_limiter",
+    "get_rate_limiter",
+    "SingleFlight",
+    "configure_single_flight",
+    "get_single_flight",
+]
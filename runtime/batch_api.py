@@ -0,0 +1,414 @@
+"""
+Pluggable backends for provider batch (offline) LLM jobs.
+
+Bulk regenerations do not need interactive latency, so their requests can be
+packed into one JSONL job file and submitted to a provider batch API, which
+is billed at a discount and does not count against interactive rate limits.
+Every backend speaks the OpenAI Batch file format: one request per line
+with a `custom_id`, and one result per line keyed by the same `custom_id`.
+
+Backends:
+    openai  OpenAI Batch API (files + batches endpoints, 24h window)
+    local   File-based stand-in that answers the job in a background thread
+            with an ordinary chat model (for testing the bulk flow)
+
+The default backend comes from SDLC_BATCH_BACKEND (default: openai). Local
+job files live in .cache/batches/ (override with SDLC_BATCH_DIR).
+wait_for_batch() gives up after SDLC_BATCH_TIMEOUT seconds (default: 25h,
+the provider's 24h window plus time to finalize the job).
+
+Usage:
+    from runtime.batch_api import batch_request, get_batch_backend, wait_for_batch
+
+    backend = get_batch_backend("local")
+    job_id = backend.submit([batch_request("01", "gpt-4o-mini", messages)])
+    wait_for_batch(backend, job_id, poll_interval=5)
+    outputs = backend.results(job_id)   # {"01": {"content", "error", "usage"}}
+"""
+
+import abc
+import json
+import os
+import secrets
+import threading
+import time
+from pathlib import Path
+
+from artifacts.writer import write_atomic
+
+
+# Endpoint every batch request targets
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+# Job states after which a job will not change any more
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+# Local job files
+BATCH_DIR = Path(
+    os.environ.get(
+        "SDLC_BATCH_DIR", Path(__file__).parent.parent / ".cache" / "batches"
+    )
+)
+
+# Seconds wait_for_batch() waits for a job by default
+BATCH_TIMEOUT = float(os.environ.get("SDLC_BATCH_TIMEOUT", 25 * 3600))
+
+
+def batch_request(
+    custom_id: str,
+    model: str,
+    messages: list[dict],
+    temperature: float = 0,
+    **options,
+) -> dict:
+    """
+    Build one line of a batch job file.
+
+    Args:
+        custom_id: Key the result is returned under (unique within a job)
+        model: Model name (e.g., "gpt-4o-mini")
+        messages: Chat messages as role/content dictionaries
+        temperature: Sampling temperature
+        **options: Extra request body fields (e.g., prompt_cache_key)
+
+    Returns:
+        Request dictionary in the OpenAI Batch format
+    """
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": model,
+            "temperature": temperature,
+            "messages": messages,
+            **options,
+        },
+    }
+
+
+def parse_results(lines: list[str]) -> dict[str, dict]:
+    """
+    Parse batch output/error file lines.
+
+    Args:
+        lines: JSONL lines in the OpenAI Batch output format
+
+    Returns:
+        Dictionary of custom_id to {"content", "error", "usage"}
+    """
+    results = {}
+
+    for line in lines:
+        if not line.strip():
+            continue
+
+        record = json.loads(line)
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        error = record.get("error")
+
+        content = None
+        if response.get("status_code") == 200 and body.get("choices"):
+            content = body["choices"][0]["message"].get("content")
+        elif error is None:
+            error = body.get("error") or f"HTTP {response.get('status_code')}"
+
+        if isinstance(error, dict):
+            error = error.get("message") or json.dumps(error)
+
+        results[record["custom_id"]] = {
+            "content": content,
+            "error": error,
+            "usage": body.get("usage"),
+        }
+
+    return results
+
+
+class BatchBackend(abc.ABC):
+    """
+    Interface of a batch job backend.
+
+    Subclasses submit a list of batch_request() dictionaries as one job and
+    report the job's state and results.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def submit(self, requests: list[dict]) -> str:
+        """Submit requests as one job and return its job ID"""
+
+    @abc.abstractmethod
+    def status(self, job_id: str) -> str:
+        """Current job state (e.g., "in_progress", "completed", "failed")"""
+
+    @abc.abstractmethod
+    def results(self, job_id: str) -> dict[str, dict]:
+        """Results of a finished job keyed by custom_id (see parse_results)"""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """
+    OpenAI Batch API backend.
+
+    Args:
+        completion_window: Time the provider has to finish the job
+    """
+
+    name = "openai"
+
+    def __init__(self, completion_window: str = "24h"):
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
+        from .clients import get_registry
+
+        load_dotenv()
+        self.completion_window = completion_window
+        self.client = OpenAI(http_client=get_registry().http_client())
+
+    def submit(self, requests: list[dict]) -> str:
+        data = "".join(json.dumps(request) + "\n" for request in requests)
+        input_file = self.client.files.create(
+            file=("batch.jsonl", data.encode("utf-8")), purpose="batch"
+        )
+        job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return job.id
+
+    def status(self, job_id: str) -> str:
+        return self.client.batches.retrieve(job_id).status
+
+    def results(self, job_id: str) -> dict[str, dict]:
+        job = self.client.batches.retrieve(job_id)
+        lines = []
+
+        # Expired and cancelled jobs still return the requests that finished
+        for file_id in (job.output_file_id, job.error_file_id):
+            if file_id:
+                lines.extend(self.client.files.content(file_id).text.splitlines())
+
+        return parse_results(lines)
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    File-based stand-in for a provider batch API.
+
+    Jobs are written to `<job>.input.jsonl` and answered in a background
+    thread with an ordinary chat model; the job completes when
+    `<job>.output.jsonl` appears. If answering the job fails as a whole, an
+    error line per request is written to `<job>.error.jsonl` and the job
+    fails. A job whose process exited before it finished is picked up again
+    on the next status() call.
+
+    Args:
+        directory: Directory for job files (default: BATCH_DIR)
+        chat_model: Model answering every request (default: the shared
+            model named in each request, see runtime.clients)
+        max_concurrency: Requests answered at once
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        directory: Path | None = None,
+        chat_model=None,
+        max_concurrency: int = 8,
+    ):
+        self.directory = Path(directory or BATCH_DIR)
+        self.chat_model = chat_model
+        self.max_concurrency = max_concurrency
+        self._workers: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, job_id: str, kind: str) -> Path:
+        return self.directory / f"{job_id}.{kind}.jsonl"
+
+    def submit(self, requests: list[dict]) -> str:
+        job_id = f"local-{time.strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(
+            self._path(job_id, "input"),
+            "".join(json.dumps(request) + "\n" for request in requests),
+        )
+        self._start(job_id)
+
+        return job_id
+
+    def _start(self, job_id: str) -> None:
+        with self._lock:
+            worker = self._workers.get(job_id)
+            if worker is None or not worker.is_alive():
+                worker = threading.Thread(target=self._process, args=(job_id,), daemon=True)
+                self._workers[job_id] = worker
+                worker.start()
+
+    def _process(self, job_id: str) -> None:
+        """Answer a job, writing its output file or, on failure, its error file"""
+        requests = []
+        try:
+            with open(self._path(job_id, "input"), "r", encoding="utf-8") as f:
+                requests = [json.loads(line) for line in f if line.strip()]
+            lines = self._answer(requests)
+        except Exception as e:
+            print(f"❌ Local batch job {job_id} failed: {type(e).__name__}: {e}")
+            lines = [
+                json.dumps(_local_result(request, e)) + "\n"
+                for request in requests
+                if isinstance(request, dict) and "custom_id" in request
+            ]
+            write_atomic(self._path(job_id, "error"), "".join(lines))
+            return
+
+        write_atomic(self._path(job_id, "output"), "".join(lines))
+
+    def _answer(self, requests: list[dict]) -> list[str]:
+        """Output file lines answering every request"""
+        from langchain_core.messages import convert_to_messages
+
+        from .clients import get_chat_model
+
+        # One .batch() call per model answers its requests concurrently
+        by_model: dict[tuple, list[dict]] = {}
+        for request in requests:
+            body = request["body"]
+            by_model.setdefault((body["model"], body.get("temperature", 0)), []).append(
+                request
+            )
+
+        lines = []
+        for (model, temperature), group in by_model.items():
+            chat_model = self.chat_model or get_chat_model(model, temperature)
+            responses = chat_model.batch(
+                [convert_to_messages(r["body"]["messages"]) for r in group],
+                config={"max_concurrency": self.max_concurrency},
+                return_exceptions=True,
+            )
+
+            for request, response in zip(group, responses):
+                lines.append(json.dumps(_local_result(request, response)) + "\n")
+
+        return lines
+
+    def status(self, job_id: str) -> str:
+        if self._path(job_id, "output").exists():
+            return "completed"
+        if self._path(job_id, "error").exists():
+            return "failed"
+        if not self._path(job_id, "input").exists():
+            return "failed"
+
+        self._start(job_id)
+        return "in_progress"
+
+    def results(self, job_id: str) -> dict[str, dict]:
+        lines = []
+
+        for kind in ("output", "error"):
+            try:
+                with open(self._path(job_id, kind), "r", encoding="utf-8") as f:
+                    lines.extend(f.readlines())
+            except FileNotFoundError:
+                pass
+
+        return parse_results(lines)
+
+
+def _local_result(request: dict, response) -> dict:
+    """Output line for one locally answered request"""
+    if isinstance(response, Exception):
+        return {
+            "custom_id": request["custom_id"],
+            "response": None,
+            "error": {"message": f"{type(response).__name__}: {response}"},
+        }
+
+    usage = getattr(response, "usage_metadata", None) or {}
+    return {
+        "custom_id": request["custom_id"],
+        "response": {
+            "status_code": 200,
+            "body": {
+                "model": request["body"]["model"],
+                "choices": [
+                    {"message": {"role": "assistant", "content": response.content}}
+                ],
+                "usage": {
+                    "prompt_tokens": usage.get("input_tokens", 0),
+                    "completion_tokens": usage.get("output_tokens", 0),
+                    "total_tokens": usage.get("total_tokens", 0),
+                },
+            },
+        },
+        "error": None,
+    }
+
+
+BATCH_BACKENDS = {
+    OpenAIBatchBackend.name: OpenAIBatchBackend,
+    LocalBatchBackend.name: LocalBatchBackend,
+}
+
+
+def get_batch_backend(name: str | None = None, **kwargs) -> BatchBackend:
+    """
+    Create a batch backend by name.
+
+    Args:
+        name: Backend name (default: $SDLC_BATCH_BACKEND or "openai")
+        **kwargs: Backend options (e.g., chat_model for the local backend)
+
+    Returns:
+        BatchBackend instance
+
+    Raises:
+        ValueError: If no backend has this name
+    """
+    name = name or os.environ.get("SDLC_BATCH_BACKEND", "openai")
+
+    if name not in BATCH_BACKENDS:
+        raise ValueError(
+            f"Unknown batch backend '{name}' (available: {', '.join(BATCH_BACKENDS)})"
+        )
+
+    return BATCH_BACKENDS[name](**kwargs)
+
+
+def wait_for_batch(
+    backend: BatchBackend,
+    job_id: str,
+    poll_interval: float = 30.0,
+    timeout: float | None = BATCH_TIMEOUT,
+) -> str:
+    """
+    Poll a job until it reaches a terminal state.
+
+    Args:
+        backend: Backend the job was submitted to
+        job_id: Job ID returned by submit()
+        poll_interval: Seconds between status checks
+        timeout: Give up after this many seconds (default: BATCH_TIMEOUT,
+            None = wait indefinitely)
+
+    Returns:
+        Terminal job state ("completed", "failed", "expired" or "cancelled")
+
+    Raises:
+        TimeoutError: If the job is still running after timeout seconds
+    """
+    started = time.monotonic()
+
+    while (state := backend.status(job_id)) not in TERMINAL_STATES:
+        if timeout is not None and time.monotonic() - started >= timeout:
+            raise TimeoutError(f"Batch job {job_id} still {state} after {timeout:.0f}s")
+        time.sleep(poll_interval)
+
+    return state
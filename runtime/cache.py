@@ -0,0 +1,273 @@
+"""
+Content-addressed, on-disk cache for LLM responses.
+
+Responses are keyed by the model name, a hash of the system prompt, the
+bound tool schema and the full message list. Fields that differ between
+identical runs (message IDs, which LangGraph assigns at random when
+streaming, and response and usage metadata) are left out of the key.
+Because the agents run with
+`temperature=0`, an unchanged request can be answered from disk instead of
+paying for another round trip.
+
+Usage:
+    from runtime.cache import configure_cache, get_cache
+
+    configure_cache(enabled=True, refresh=False)
+    cache = get_cache()
+    print(cache.stats())
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from langchain_core.messages import AnyMessage, messages_from_dict, messages_to_dict
+
+from .scope import scoped, set_scoped
+
+
+# Default location for cached responses (override with SDLC_CACHE_DIR)
+DEFAULT_CACHE_DIR = Path(
+    os.environ.get(
+        "SDLC_CACHE_DIR", Path(__file__).parent.parent / ".cache" / "llm"
+    )
+)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _model_name(model_with_tools) -> str:
+    """Best-effort model name for a chat model or a tool-bound chat model"""
+    model = getattr(model_with_tools, "bound", model_with_tools)
+    return str(
+        getattr(model, "model_name", None) or getattr(model, "model", None) or ""
+    )
+
+
+# Message fields that change between otherwise identical requests
+VOLATILE_FIELDS = ("id", "response_metadata", "usage_metadata")
+
+
+def _stable_messages(messages: list[AnyMessage]) -> list[dict]:
+    """Serialized messages without the fields in VOLATILE_FIELDS"""
+    stable = []
+    for message in messages_to_dict(messages):
+        data = {
+            name: value
+            for name, value in message["data"].items()
+            if name not in VOLATILE_FIELDS
+        }
+        stable.append({**message, "data": data})
+    return stable
+
+
+def _bound_tools(model_with_tools) -> list:
+    """Tool schema bound to the model (empty when no tools are bound)"""
+    return getattr(model_with_tools, "kwargs", {}).get("tools", [])
+
+
+class LLMCache:
+    """
+    On-disk response cache with size and age based eviction.
+
+    Args:
+        cache_dir: Directory holding one JSON file per cached response
+        enabled: When False, every lookup misses and nothing is written
+        refresh: When True, lookups miss but fresh responses are written
+        max_age: Maximum age of an entry in seconds (None = no limit)
+        max_bytes: Maximum total size of the cache in bytes (None = no limit)
+        prune_every: Run size-based eviction after this many writes
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path = DEFAULT_CACHE_DIR,
+        enabled: bool = True,
+        refresh: bool = False,
+        max_age: float | None = 7 * 24 * 3600,
+        max_bytes: int | None = 256 * 1024 * 1024,
+        prune_every: int = 100,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.enabled = enabled
+        self.refresh = refresh
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.prune_every = prune_every
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    def key_for(
+        self, model_with_tools, system_prompt: str, messages: list[AnyMessage]
+    ) -> str:
+        """
+        Compute the content address of a model request.
+
+        Args:
+            model_with_tools: Chat model (optionally with tools bound)
+            system_prompt: System prompt sent ahead of the messages
+            messages: Conversation messages (excluding the system prompt)
+
+        Returns:
+            Hex digest identifying the request
+        """
+        payload = {
+            "model": _model_name(model_with_tools),
+            "system_prompt": _sha256(system_prompt),
+            "tools": _bound_tools(model_with_tools),
+            "messages": _stable_messages(messages),
+        }
+        return _sha256(json.dumps(payload, sort_keys=True, default=str))
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> AnyMessage | None:
+        """Return the cached response for a key, or None on a miss"""
+        if not self.enabled or self.refresh:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        path = self._path(key)
+
+        try:
+            age = time.time() - path.stat().st_mtime
+            if self.max_age is not None and age > self.max_age:
+                path.unlink(missing_ok=True)
+                with self._lock:
+                    self.evictions += 1
+                    self.misses += 1
+                return None
+
+            with open(path, "r", encoding="utf-8") as f:
+                message = messages_from_dict([json.load(f)])[0]
+        except (OSError, ValueError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return message
+
+    def put(self, key: str, message: AnyMessage) -> None:
+        """Store a response under a key"""
+        if not self.enabled:
+            return
+
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to a temp file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(messages_to_dict([message])[0], f)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self.writes += 1
+            should_prune = self.writes % self.prune_every == 0
+
+        if should_prune:
+            self.prune()
+
+    def prune(self) -> int:
+        """
+        Evict expired entries, then the oldest entries until under max_bytes.
+
+        Returns:
+            Number of evicted entries
+        """
+        entries = []
+        now = time.time()
+        evicted = 0
+
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                evicted += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        if self.max_bytes is not None:
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+
+        with self._lock:
+            self.evictions += evicted
+        return evicted
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        for path in self.cache_dir.glob("*/*.json"):
+            path.unlink(missing_ok=True)
+
+    def stats(self) -> dict:
+        """Hit/miss/write/eviction counters"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+    def add_stats(self, stats: dict) -> None:
+        """Add counters reported by another process (e.g., a worker)"""
+        with self._lock:
+            self.hits += stats.get("hits", 0)
+            self.misses += stats.get("misses", 0)
+            self.writes += stats.get("writes", 0)
+            self.evictions += stats.get("evictions", 0)
+
+
+_cache = LLMCache()
+
+
+def get_cache() -> LLMCache:
+    """Return the LLM response cache (the job's own inside a job scope)"""
+    return scoped("cache", _cache)
+
+
+def configure_cache(
+    enabled: bool = True, refresh: bool = False, **kwargs
+) -> LLMCache:
+    """
+    Replace the process-wide LLM response cache.
+
+    Inside runtime.scope.job_scope() only the current job's cache is
+    replaced, so its hit/miss counters cover that job alone.
+
+    Args:
+        enabled: When False, bypass the cache entirely (--no-cache)
+        refresh: When True, ignore cached entries but store new ones (--refresh)
+        **kwargs: Extra LLMCache options (cache_dir, max_age, max_bytes, ...)
+
+    Returns:
+        The new cache
+    """
+    global _cache
+    cache = LLMCache(enabled=enabled, refresh=refresh, **kwargs)
+    if not set_scoped("cache", cache):
+        _cache = cache
+    return cache
@@ -0,0 +1,276 @@
+"""
+Shared, pooled LLM clients.
+
+Every agent and every concurrent workflow in a process gets its chat model
+from one registry. Models with the same settings are the same instance, and
+all of them send requests through one pair of keep-alive httpx clients (sync
+and async), so connection and TLS setup is paid once per process rather than
+once per agent. HTTP/2 is used when the optional `h2` package is installed,
+multiplexing concurrent requests over a few connections. Async connections
+belong to the event loop that opened them, so the async client keeps one
+pool per running loop. Repeated asyncio.run() calls (daemon jobs, benchmark
+sizes, several batches in one process) each get a fresh pool instead of
+reusing connections from a closed loop.
+
+Pool size and timeouts come from configure_clients() or from the
+environment: SDLC_HTTP_MAX_CONNECTIONS, SDLC_HTTP_MAX_KEEPALIVE,
+SDLC_HTTP_KEEPALIVE_EXPIRY, SDLC_HTTP_TIMEOUT, SDLC_HTTP_CONNECT_TIMEOUT.
+
+Usage:
+    from runtime.clients import configure_clients, get_chat_model
+
+    configure_clients(max_connections=50, timeout=120)
+    model = get_chat_model("gpt-4o-mini", temperature=0)
+"""
+
+import asyncio
+import importlib.util
+import os
+import threading
+
+
+def _env_number(name: str, default: float) -> float:
+    """Numeric setting from the environment, falling back to a default"""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _loop_local_transport(**options):
+    """
+    httpx async transport keeping one connection pool per running event loop.
+
+    Args:
+        **options: httpx.AsyncHTTPTransport options (http2, limits)
+
+    Returns:
+        httpx.AsyncBaseTransport instance
+    """
+    import httpx
+
+    class LoopLocalTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self._transports: dict[asyncio.AbstractEventLoop, object] = {}
+            self._lock = threading.Lock()
+
+        def _transport(self):
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                # Pools of finished asyncio.run() calls are unusable; drop them
+                for stale in [other for other in self._transports if other.is_closed()]:
+                    del self._transports[stale]
+
+                transport = self._transports.get(loop)
+                if transport is None:
+                    transport = self._transports[loop] = httpx.AsyncHTTPTransport(
+                        **options
+                    )
+                return transport
+
+        async def handle_async_request(self, request):
+            return await self._transport().handle_async_request(request)
+
+        async def aclose(self) -> None:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                transport = self._transports.pop(loop, None)
+            if transport is not None:
+                await transport.aclose()
+
+    return LoopLocalTransport()
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of chat models sharing one HTTP connection pool.
+
+    Args:
+        max_connections: Maximum number of open connections
+        max_keepalive_connections: Idle connections kept open for reuse
+        keepalive_expiry: Seconds an idle connection is kept open
+        timeout: Read/write/pool timeout in seconds
+        connect_timeout: Connection timeout in seconds
+        http2: Use HTTP/2 (None = when the `h2` package is installed)
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+        timeout: float | None = None,
+        connect_timeout: float | None = None,
+        http2: bool | None = None,
+    ):
+        self.max_connections = int(
+            max_connections or _env_number("SDLC_HTTP_MAX_CONNECTIONS", 100)
+        )
+        self.max_keepalive_connections = int(
+            max_keepalive_connections or _env_number("SDLC_HTTP_MAX_KEEPALIVE", 20)
+        )
+        self.keepalive_expiry = keepalive_expiry or _env_number(
+            "SDLC_HTTP_KEEPALIVE_EXPIRY", 60.0
+        )
+        self.timeout = timeout or _env_number("SDLC_HTTP_TIMEOUT", 120.0)
+        self.connect_timeout = connect_timeout or _env_number(
+            "SDLC_HTTP_CONNECT_TIMEOUT", 10.0
+        )
+        self.http2 = (
+            http2 if http2 is not None else importlib.util.find_spec("h2") is not None
+        )
+
+        self._http_client = None
+        self._http_async_client = None
+        self._models: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _client_options(self) -> dict:
+        import httpx
+
+        return {
+            "http2": self.http2,
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(self.timeout, connect=self.connect_timeout),
+        }
+
+    def _async_client_options(self) -> dict:
+        """Async client options with a pool per event loop"""
+        options = self._client_options()
+        transport = _loop_local_transport(
+            http2=options.pop("http2"), limits=options.pop("limits")
+        )
+        return {**options, "transport": transport}
+
+    def http_client(self):
+        """Shared synchronous httpx client, created on first use"""
+        with self._lock:
+            if self._http_client is None:
+                import httpx
+
+                self._http_client = httpx.Client(**self._client_options())
+
+            return self._http_client
+
+    def http_async_client(self):
+        """
+        Shared asynchronous httpx client, created on first use.
+
+        The client can be used from any event loop; each running loop gets
+        its own connection pool (see _loop_local_transport).
+        """
+        with self._lock:
+            if self._http_async_client is None:
+                import httpx
+
+                self._http_async_client = httpx.AsyncClient(
+                    **self._async_client_options()
+                )
+
+            return self._http_async_client
+
+    def chat_model(self, model: str, temperature: float = 0, **kwargs):
+        """
+        Shared ChatOpenAI instance for a model and its settings.
+
+        Args:
+            model: Model name (e.g., "gpt-4o-mini")
+            temperature: Sampling temperature
+            **kwargs: Extra ChatOpenAI options (e.g., stream_usage=True)
+
+        Returns:
+            ChatOpenAI using the shared connection pool
+        """
+        key = (model, temperature, tuple(sorted(kwargs.items())))
+
+        with self._lock:
+            chat_model = self._models.get(key)
+        if chat_model is not None:
+            return chat_model
+
+        from dotenv import load_dotenv
+        from langchain_openai import ChatOpenAI
+
+        load_dotenv()
+        # Retries are scheduled by the process-wide rate limiter (see
+        # runtime.ratelimit), so the SDK's own retry loop is disabled
+        kwargs.setdefault("max_retries", 0)
+        chat_model = ChatOpenAI(
+            model=model,
+            temperature=temperature,
+            timeout=self.timeout,
+            http_client=self.http_client(),
+            http_async_client=self.http_async_client(),
+            **kwargs,
+        )
+
+        with self._lock:
+            return self._models.setdefault(key, chat_model)
+
+    def close(self) -> None:
+        """Close the synchronous pool and forget every model"""
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+
+            # Async pools belong to the event loops that opened them and are
+            # released with them; they cannot be closed from synchronous code
+            self._http_client = None
+            self._http_async_client = None
+            self._models.clear()
+
+    def stats(self) -> dict:
+        """Pool settings and number of shared models"""
+        with self._lock:
+            return {
+                "models": len(self._models),
+                "http2": self.http2,
+                "max_connections": self.max_connections,
+                "max_keepalive_connections": self.max_keepalive_connections,
+                "timeout": self.timeout,
+            }
+
+
+_registry = ClientRegistry()
+
+
+def get_registry() -> ClientRegistry:
+    """Return the process-wide client registry"""
+    return _registry
+
+
+def get_chat_model(model: str, temperature: float = 0, **kwargs):
+    """
+    Shared ChatOpenAI instance from the process-wide registry.
+
+    Args:
+        model: Model name (e.g., "gpt-4o-mini")
+        temperature: Sampling temperature
+        **kwargs: Extra ChatOpenAI options
+
+    Returns:
+        ChatOpenAI using the shared connection pool
+    """
+    return _registry.chat_model(model, temperature, **kwargs)
+
+
+def configure_clients(**kwargs) -> ClientRegistry:
+    """
+    Replace the process-wide client registry.
+
+    Models already handed out keep using the old pool; agents built
+    afterwards use the new settings.
+
+    Args:
+        **kwargs: ClientRegistry options (max_connections, timeout, http2, ...)
+
+    Returns:
+        The new process-wide registry
+    """
+    global _registry
+    _registry = ClientRegistry(**kwargs)
+    return _registry
@@ -0,0 +1,307 @@
+"""
+Token-budget-aware context trimming for agent message loops.
+
+Agent state keeps every message of a conversation, and each LLM round trip
+re-sends all of it, including the full content of every tool result. Before
+each call the LLM node passes the conversation through a process-wide
+ContextBudget, which counts tokens locally and rewrites only the copy that
+is sent (the graph state is never changed):
+
+1. Duplicate tool results (e.g., the same file fetched twice) are sent in
+   full once, at their latest position; earlier copies become a short note.
+2. Tool results older than the last few tool-calling rounds are stale and
+   are replaced by a note naming the tool and the tokens elided.
+3. If the request still exceeds the input-token budget, older tool results
+   are elided oldest first and then the largest message is cut down until
+   it fits, so large idea files cannot overflow the context window.
+
+Messages are never dropped, so every tool call keeps its tool result.
+Tokens are counted with tiktoken when its encoding is available locally and
+estimated at ~4 characters per token otherwise.
+
+Settings come from configure_context_budget() or from the environment:
+SDLC_MAX_INPUT_TOKENS (default: 100000) and SDLC_KEEP_TOOL_ROUNDS (default: 2).
+
+Usage:
+    from runtime.context import get_context_budget
+
+    messages, stats = get_context_budget().trim(SYSTEM_PROMPT, state["messages"])
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage, AnyMessage, ToolMessage
+
+from .scope import scoped, set_scoped
+
+
+# Tokenizer used by the gpt-4o model family
+ENCODING_NAME = "o200k_base"
+
+# Per-message framing tokens added by the chat format
+MESSAGE_OVERHEAD = 4
+
+# Tool results shorter than this are cheaper to keep than to elide
+MIN_ELIDE_TOKENS = 64
+
+# Token counts remembered (keyed by a digest, so the texts are not kept)
+TOKEN_COUNT_CACHE_SIZE = 8192
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+_token_counts: OrderedDict[bytes, int] = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+
+def _get_encoding():
+    """tiktoken encoding, or None if it or its encoding file is unavailable"""
+    global _encoding, _encoding_loaded
+
+    with _encoding_lock:
+        if not _encoding_loaded:
+            _encoding_loaded = True
+            try:
+                import tiktoken
+
+                _encoding = tiktoken.get_encoding(ENCODING_NAME)
+            except Exception:
+                # Not installed, or the encoding cannot be downloaded (offline)
+                _encoding = None
+
+    return _encoding
+
+
+def count_text_tokens(text: str) -> int:
+    """Number of tokens in a string"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _token_counts_lock:
+        tokens = _token_counts.get(key)
+        if tokens is not None:
+            _token_counts.move_to_end(key)
+            return tokens
+
+    tokens = len(encoding.encode(text, disallowed_special=()))
+
+    with _token_counts_lock:
+        _token_counts[key] = tokens
+        if len(_token_counts) > TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return tokens
+
+
+def count_message_tokens(message: AnyMessage) -> int:
+    """Tokens a message costs as model input"""
+    tokens = count_text_tokens(str(message.content)) + MESSAGE_OVERHEAD
+
+    for tool_call in getattr(message, "tool_calls", None) or []:
+        tokens += count_text_tokens(f"{tool_call['name']}{tool_call['args']}")
+
+    return tokens
+
+
+def count_tokens(messages: list[AnyMessage], system_prompt: str = "") -> int:
+    """
+    Tokens a request costs as model input.
+
+    Args:
+        messages: Conversation messages
+        system_prompt: System prompt sent ahead of the messages
+
+    Returns:
+        Input token count
+    """
+    tokens = sum(count_message_tokens(message) for message in messages)
+    if system_prompt:
+        tokens += count_text_tokens(system_prompt) + MESSAGE_OVERHEAD
+    return tokens
+
+
+def truncate_text(text: str, max_tokens: int) -> str:
+    """Keep the start of a string so it fits in max_tokens (plus a marker)"""
+    total = count_text_tokens(text)
+    if total <= max_tokens:
+        return text
+
+    encoding = _get_encoding()
+    if encoding is None:
+        kept = text[: max(0, max_tokens) * 4]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        kept = encoding.decode(tokens[:max_tokens])
+
+    return (
+        f"{kept}\n\n[... {total - max_tokens} tokens truncated to fit the input budget]"
+    )
+
+
+def _with_content(message: AnyMessage, content: str) -> AnyMessage:
+    return message.model_copy(update={"content": content})
+
+
+class ContextBudget:
+    """
+    Per-call input-token budget with tool-result deduplication and elision.
+
+    Args:
+        max_input_tokens: Input tokens allowed per call, system prompt included
+        keep_tool_rounds: Most recent tool-calling rounds whose results are
+            always sent in full (unless the budget is exceeded)
+    """
+
+    def __init__(self, max_input_tokens: int = 100_000, keep_tool_rounds: int = 2):
+        self.max_input_tokens = max_input_tokens
+        self.keep_tool_rounds = max(1, keep_tool_rounds)
+
+    def trim(
+        self, system_prompt: str, messages: list[AnyMessage]
+    ) -> tuple[list[AnyMessage], dict]:
+        """
+        Build the message list to send for one call.
+
+        Args:
+            system_prompt: System prompt sent ahead of the messages
+            messages: Full conversation from the agent state
+
+        Returns:
+            Tuple of the messages to send and stats with request_tokens
+            (before trimming), sent_tokens, deduplicated, elided and truncated
+        """
+        messages = list(messages)
+        stats = {"request_tokens": count_tokens(messages, system_prompt)}
+
+        # Tool names and round number of every tool call
+        tool_names, rounds, round_number = {}, {}, 0
+        for message in messages:
+            if isinstance(message, AIMessage) and message.tool_calls:
+                round_number += 1
+                for tool_call in message.tool_calls:
+                    tool_names[tool_call["id"]] = tool_call["name"]
+                    rounds[tool_call["id"]] = round_number
+
+        tool_positions = [
+            i for i, message in enumerate(messages) if isinstance(message, ToolMessage)
+        ]
+
+        def name_of(message: ToolMessage) -> str:
+            return tool_names.get(message.tool_call_id, "tool")
+
+        def elide(i: int) -> bool:
+            tokens = count_message_tokens(messages[i])
+            if tokens < MIN_ELIDE_TOKENS:
+                return False
+            messages[i] = _with_content(
+                messages[i],
+                f"[{name_of(messages[i])} output elided ({tokens} tokens); "
+                f"call the tool again if it is still needed]",
+            )
+            return True
+
+        # 1. Send each distinct tool result once, at its latest position
+        seen, deduplicated = set(), 0
+        for i in reversed(tool_positions):
+            content = str(messages[i].content)
+            if count_text_tokens(content) < MIN_ELIDE_TOKENS:
+                continue
+            if content in seen:
+                messages[i] = _with_content(
+                    messages[i],
+                    f"[Same {name_of(messages[i])} output as a later tool result]",
+                )
+                deduplicated += 1
+            seen.add(content)
+
+        # 2. Elide results of stale tool-calling rounds
+        stale_before = round_number - self.keep_tool_rounds + 1
+        elided = sum(
+            elide(i)
+            for i in tool_positions
+            if rounds.get(messages[i].tool_call_id, round_number) < stale_before
+        )
+
+        # 3. Enforce the budget: older tool results first (the latest round is
+        # only cut down), then the largest message is cut down to size
+        total = count_tokens(messages, system_prompt)
+        for i in tool_positions:
+            if total <= self.max_input_tokens:
+                break
+            if rounds.get(messages[i].tool_call_id) == round_number:
+                continue
+            if elide(i):
+                elided += 1
+                total = count_tokens(messages, system_prompt)
+
+        truncated = 0
+        while total > self.max_input_tokens:
+            largest = max(
+                range(len(messages)), key=lambda i: count_message_tokens(messages[i])
+            )
+            content = str(messages[largest].content)
+            # Leave room for the truncation marker
+            keep = count_text_tokens(content) - (total - self.max_input_tokens) - 32
+            if keep <= 0 or truncated >= len(messages):
+                break
+            messages[largest] = _with_content(
+                messages[largest], truncate_text(content, keep)
+            )
+            truncated += 1
+            total = count_tokens(messages, system_prompt)
+
+        stats.update(
+            sent_tokens=total,
+            deduplicated=deduplicated,
+            elided=elided,
+            truncated=truncated,
+        )
+        return messages, stats
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ[name])
+    except (KeyError, ValueError):
+        return default
+
+
+def _from_env(**kwargs) -> ContextBudget:
+    kwargs.setdefault("max_input_tokens", _env_int("SDLC_MAX_INPUT_TOKENS", 100_000))
+    kwargs.setdefault("keep_tool_rounds", _env_int("SDLC_KEEP_TOOL_ROUNDS", 2))
+    return ContextBudget(**kwargs)
+
+
+_budget = _from_env()
+
+
+def get_context_budget() -> ContextBudget:
+    """Return the context budget (the job's own inside a job scope)"""
+    return scoped("context_budget", _budget)
+
+
+def configure_context_budget(**kwargs) -> ContextBudget:
+    """
+    Replace the process-wide context budget.
+
+    Inside runtime.scope.job_scope() only the current job's budget is
+    replaced.
+
+    Args:
+        **kwargs: ContextBudget options (max_input_tokens, keep_tool_rounds);
+            unset options fall back to SDLC_MAX_INPUT_TOKENS /
+            SDLC_KEEP_TOOL_ROUNDS
+
+    Returns:
+        The new budget
+    """
+    global _budget
+    budget = _from_env(**{k: v for k, v in kwargs.items() if v is not None})
+    if not set_scoped("context_budget", budget):
+        _budget = budget
+    return budget
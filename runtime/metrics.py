@@ -0,0 +1,357 @@
+"""
+Per-node latency, token and cost instrumentation for LangGraph runs.
+
+A LangChain callback handler records one event per graph node execution,
+LLM round trip, tool execution, context trim, response-cache lookup and LLM
+retry. Events from any
+number of runs (e.g., every feature in a batch) can share one RunMetrics
+store, which exports them as JSON lines or as a p50/p95 summary table.
+
+Usage:
+    from runtime.metrics import MetricsCallbackHandler, RunMetrics
+
+    metrics = RunMetrics()
+    handler = MetricsCallbackHandler(metrics, feature="01-feat-pagination.md")
+    workflow.invoke(state, config={"callbacks": [handler]})
+
+    metrics.print_summary()
+    metrics.write_jsonl("metrics.jsonl")
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+# USD per 1M tokens: (input, cached input, output)
+PRICING = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+}
+
+# Names of the custom callback events emitted by the LLM node on context
+# trimming, cache lookups and rate-limit/transient-error retries
+CONTEXT_EVENT = "llm_context"
+CACHE_EVENT = "llm_cache"
+RETRY_EVENT = "llm_retry"
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def stage_name(metadata: dict | None, default: str) -> str:
+    """
+    Qualified stage name from LangGraph run metadata.
+
+    Nested graphs produce names such as "generate_stories/llm_call", so the
+    same agent node is reported separately per workflow stage. Repeated
+    subgraph calls from one node (numbered by LangGraph) share a name.
+    """
+    namespace = (metadata or {}).get("langgraph_checkpoint_ns") or ""
+    nodes = [part.split(":")[0] for part in namespace.split("|") if part]
+    nodes = [node for node in nodes if not node.isdigit()]
+    return "/".join(nodes) or (metadata or {}).get("langgraph_node") or default
+
+
+def estimate_cost(
+    model_name: str, input_tokens: int, cached_tokens: int, output_tokens: int
+) -> float:
+    """Estimated cost in USD of one LLM call (0.0 for unknown models)"""
+    prices = next(
+        (p for name, p in PRICING.items() if model_name.startswith(name)), None
+    )
+    if prices is None:
+        return 0.0
+
+    input_price, cached_price, output_price = prices
+    uncached = max(0, input_tokens - cached_tokens)
+
+    return (
+        uncached * input_price
+        + cached_tokens * cached_price
+        + output_tokens * output_price
+    ) / 1_000_000
+
+
+class RunMetrics:
+    """Thread-safe store of instrumentation events"""
+
+    def __init__(self):
+        self.events: list[dict] = []
+        self._lock = threading.Lock()
+
+    def record(self, **event) -> None:
+        """Append one event (kind, name, elapsed, tokens, ...)"""
+        event.setdefault("timestamp", time.time())
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self) -> list[dict]:
+        """
+        Aggregate events per (kind, name).
+
+        Returns:
+            One row per stage with count, p50/p95/total wall time, tokens,
+            time to first token (streamed calls), cost, cache hits/misses,
+            retry backoff and trimmed context tokens
+        """
+        groups: dict[tuple[str, str], list[dict]] = {}
+        with self._lock:
+            for event in self.events:
+                groups.setdefault((event["kind"], event["name"]), []).append(event)
+
+        rows = []
+        for (kind, name), events in sorted(groups.items()):
+            elapsed = [e["elapsed"] for e in events if "elapsed" in e]
+            ttft = [e["ttft"] for e in events if "ttft" in e]
+            rows.append(
+                {
+                    "kind": kind,
+                    "name": name,
+                    "count": len(events),
+                    "p50": percentile(elapsed, 50),
+                    "p95": percentile(elapsed, 95),
+                    "total": sum(elapsed),
+                    "input_tokens": sum(e.get("input_tokens", 0) for e in events),
+                    "cached_tokens": sum(e.get("cached_tokens", 0) for e in events),
+                    "output_tokens": sum(e.get("output_tokens", 0) for e in events),
+                    "cost": sum(e.get("cost", 0.0) for e in events),
+                    "ttft_p50": percentile(ttft, 50),
+                    "ttft_p95": percentile(ttft, 95),
+                    "hits": sum(1 for e in events if e.get("hit") is True),
+                    "misses": sum(1 for e in events if e.get("hit") is False),
+                    "delay": sum(e.get("delay", 0.0) for e in events),
+                    "trimmed_tokens": sum(
+                        e.get("request_tokens", 0) - e.get("sent_tokens", 0)
+                        for e in events
+                        if "sent_tokens" in e
+                    ),
+                }
+            )
+
+        return rows
+
+    def print_summary(self) -> None:
+        """Print the per-stage summary as a table"""
+        rows = self.summary()
+
+        print("=" * 80)
+        print("Run Metrics")
+        print("=" * 80)
+        print(
+            f"{'stage':<36}{'count':>6}{'p50 s':>8}{'p95 s':>8}"
+            f"{'tokens in/out':>14}{'cost $':>8}"
+        )
+        print("-" * 80)
+
+        for row in rows:
+            stage = f"{row['kind']}:{row['name']}"
+            if row["kind"] == "cache":
+                hits = f"hits {row['hits']}  misses {row['misses']}"
+                print(f"{stage:<36}{row['count']:>6}   {hits}")
+                continue
+            if row["kind"] == "retry":
+                print(f"{stage:<36}{row['count']:>6}   backoff {row['delay']:.1f}s")
+                continue
+            if row["kind"] == "context":
+                trimmed = f"trimmed {row['trimmed_tokens']} tokens"
+                print(f"{stage:<36}{row['count']:>6}   {trimmed}")
+                continue
+
+            tokens = (
+                f"{row['input_tokens']}/{row['output_tokens']}"
+                if row["kind"] == "llm"
+                else ""
+            )
+            cost = f"{row['cost']:.4f}" if row["kind"] == "llm" else ""
+            print(
+                f"{stage:<36}{row['count']:>6}{row['p50']:>8.2f}{row['p95']:>8.2f}"
+                f"{tokens:>14}{cost:>8}"
+            )
+
+        # Provider-side prompt caching across every LLM call of the run
+        llm_rows = [row for row in rows if row["kind"] == "llm"]
+        input_tokens = sum(row["input_tokens"] for row in llm_rows)
+        if input_tokens:
+            cached_tokens = sum(row["cached_tokens"] for row in llm_rows)
+            print("-" * 80)
+            print(
+                f"Prompt cache: {cached_tokens}/{input_tokens} input tokens cached "
+                f"({cached_tokens / input_tokens:.0%})"
+            )
+            for row in llm_rows:
+                if row["ttft_p50"]:
+                    print(
+                        f"  ttft {row['name']:<30} p50 {row['ttft_p50']:.2f}s  "
+                        f"p95 {row['ttft_p95']:.2f}s"
+                    )
+
+        print()
+
+    def write_jsonl(self, path: Path) -> None:
+        """Write every event as one JSON object per line"""
+        with self._lock:
+            events = list(self.events)
+
+        with open(path, "w", encoding="utf-8") as f:
+            for event in events:
+                f.write(json.dumps(event, default=str) + "\n")
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Callback handler that feeds graph, LLM, tool and cache events into RunMetrics.
+
+    Args:
+        metrics: Store receiving the events
+        feature: Label attached to every event (e.g., the idea filename)
+    """
+
+    def __init__(self, metrics: RunMetrics, feature: str | None = None):
+        self.metrics = metrics
+        self.feature = feature
+        self._started: dict[UUID, tuple[str, str, float]] = {}
+        self._first_token: dict[UUID, float] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id: UUID, kind: str, name: str) -> None:
+        with self._lock:
+            self._started[run_id] = (kind, name, time.perf_counter())
+
+    def _end(self, run_id: UUID, **extra) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+
+        if started is None:
+            return
+
+        kind, name, start = started
+        self.metrics.record(
+            feature=self.feature,
+            kind=kind,
+            name=name,
+            elapsed=time.perf_counter() - start,
+            **extra,
+        )
+
+    # Graph nodes
+
+    def on_chain_start(
+        self, serialized, inputs, *, run_id: UUID, metadata=None, **kwargs: Any
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if not node or kwargs.get("name") != node:
+            return
+
+        # A node's own runnable may share its name; only time the outermost run
+        with self._lock:
+            parent = self._started.get(kwargs.get("parent_run_id"))
+        if parent and parent[:2] == ("node", stage_name(metadata, node)):
+            return
+
+        self._start(run_id, "node", stage_name(metadata, node))
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=str(error))
+
+    # LLM round trips
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any
+    ) -> None:
+        self._start(run_id, "llm", stage_name(metadata, "chat_model"))
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        # Only the first streamed token of each call matters
+        if run_id in self._first_token:
+            return
+        with self._lock:
+            self._first_token.setdefault(run_id, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs: Any) -> None:
+        message = getattr(response.generations[0][0], "message", None)
+        usage = getattr(message, "usage_metadata", None) or {}
+        model_name = (getattr(message, "response_metadata", None) or {}).get(
+            "model_name", ""
+        )
+
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        cached_tokens = (usage.get("input_token_details") or {}).get("cache_read", 0)
+
+        # Time to first token, for streamed calls
+        with self._lock:
+            first_token = self._first_token.pop(run_id, None)
+            started = self._started.get(run_id)
+        extra = {"ttft": first_token - started[2]} if first_token and started else {}
+
+        self._end(
+            run_id,
+            **extra,
+            model=model_name,
+            input_tokens=input_tokens,
+            cached_tokens=cached_tokens,
+            output_tokens=output_tokens,
+            cost=estimate_cost(model_name, input_tokens, cached_tokens, output_tokens),
+        )
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._first_token.pop(run_id, None)
+        self._end(run_id, error=str(error))
+
+    # Tool execution
+
+    def on_tool_start(
+        self, serialized, input_str, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name", "tool")
+        self._start(run_id, "tool", name)
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id: UUID, **kwargs: Any) -> None:
+        self._end(run_id, error=str(error))
+
+    # Context trimming, response cache and retries
+
+    def on_custom_event(
+        self, name: str, data: Any, *, metadata=None, **kwargs: Any
+    ) -> None:
+        if name == CONTEXT_EVENT:
+            self.metrics.record(
+                feature=self.feature,
+                kind="context",
+                name=stage_name(metadata, "llm_call"),
+                **data,
+            )
+        elif name == CACHE_EVENT:
+            self.metrics.record(
+                feature=self.feature,
+                kind="cache",
+                name=stage_name(metadata, "llm_call"),
+                hit=data["hit"],
+            )
+        elif name == RETRY_EVENT:
+            self.metrics.record(
+                feature=self.feature,
+                kind="retry",
+                name=stage_name(metadata, "llm_call"),
+                **data,
+            )
@@ -0,0 +1,407 @@
+"""
+Process-wide rate limiter and retry scheduler for LLM calls.
+
+Every LLM round trip in the process passes through one limiter that keeps
+two token buckets, requests/minute and tokens/minute, plus an adaptive cap
+on calls in flight. Throttled or transiently failing calls (429, 5xx,
+timeouts, dropped connections) are retried with jittered exponential
+backoff, honoring the provider's Retry-After header. A 429 also pauses new
+calls until the Retry-After delay has passed and halves the concurrency
+cap. The cap grows back by one after each full window of successful calls
+(AIMD), so batch runs settle at the provider's ceiling instead of failing.
+
+Limits come from configure_rate_limiter() or from the environment:
+SDLC_RPM, SDLC_TPM and SDLC_LLM_CONCURRENCY (unset = no rate limit).
+
+Usage:
+    from runtime.ratelimit import configure_rate_limiter, get_rate_limiter
+
+    configure_rate_limiter(requests_per_minute=500, tokens_per_minute=200_000)
+    response = get_rate_limiter().call(lambda: model.invoke(messages), tokens=1200)
+"""
+
+import asyncio
+import email.utils
+import math
+import os
+import random
+import threading
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from .scope import in_job_scope, scoped, set_scoped
+
+T = TypeVar("T")
+
+# HTTP status codes worth retrying
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Exception class names raised by the OpenAI SDK for transient network errors
+RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError"}
+
+# Seconds between checks for a free slot when the concurrency cap is reached
+POLL_INTERVAL = 0.05
+
+
+def _env_number(name: str) -> float | None:
+    """Numeric setting from the environment, or None if unset/invalid"""
+    try:
+        return float(os.environ[name])
+    except (KeyError, ValueError):
+        return None
+
+
+def status_code(error: BaseException) -> int | None:
+    """HTTP status code of a provider error, if any"""
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether an error is transient (throttling, server error, network)"""
+    return (
+        status_code(error) in RETRYABLE_STATUS
+        or type(error).__name__ in RETRYABLE_ERRORS
+        or isinstance(error, (TimeoutError, ConnectionError))
+    )
+
+
+def retry_after(error: BaseException) -> float | None:
+    """
+    Delay requested by the provider, in seconds.
+
+    Reads `retry-after-ms` and `retry-after` (seconds or an HTTP date) from
+    the error's response headers.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+    except ValueError:
+        pass
+
+    value = headers.get("retry-after")
+    if not value:
+        return None
+
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value).timestamp()
+        return max(0.0, retry_at - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate.
+
+    Args:
+        per_minute: Bucket capacity and refill rate per minute
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` can be taken (capped at a full bucket)"""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        """Remove tokens (the level may go negative when usage is reconciled)"""
+        self.level -= amount
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter with adaptive concurrency and retries.
+
+    Args:
+        requests_per_minute: Request budget (None = unlimited)
+        tokens_per_minute: Token budget (None = unlimited)
+        max_concurrency: Upper bound on calls in flight
+        min_concurrency: Lower bound the adaptive cap never goes below
+        max_retries: Retries per call before the error is raised
+        base_delay: Initial backoff delay in seconds
+        max_delay: Maximum backoff delay in seconds
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 6,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.concurrency = self.max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.throttled = 0
+        self.retries = 0
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def settings(self) -> dict:
+        """Constructor options this limiter was built with"""
+        return {
+            "requests_per_minute": self.requests.capacity if self.requests else None,
+            "tokens_per_minute": self.tokens.capacity if self.tokens else None,
+            "max_concurrency": self.max_concurrency,
+            "min_concurrency": self.min_concurrency,
+            "max_retries": self.max_retries,
+            "base_delay": self.base_delay,
+            "max_delay": self.max_delay,
+        }
+
+    # Admission
+
+    def _try_acquire(self, tokens: int) -> float:
+        """
+        Take a slot and budget if available.
+
+        Returns:
+            0.0 when admitted, otherwise seconds to wait before trying again
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = self.paused_until - now
+
+            if self.requests is not None:
+                wait = max(wait, self.requests.wait_time(1, now))
+            if self.tokens is not None:
+                wait = max(wait, self.tokens.wait_time(tokens, now))
+            if wait <= 0 and self.in_flight >= self.concurrency:
+                wait = POLL_INTERVAL
+
+            if wait > 0:
+                return wait
+
+            if self.requests is not None:
+                self.requests.take(1)
+            if self.tokens is not None:
+                self.tokens.take(tokens)
+            self.in_flight += 1
+            return 0.0
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until a call estimated at `tokens` may start"""
+        while (wait := self._try_acquire(tokens)) > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0) -> None:
+        """Async variant of acquire"""
+        while (wait := self._try_acquire(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def release(self, estimated: int = 0, actual: int | None = None) -> None:
+        """
+        Free a slot and reconcile the token budget with actual usage.
+
+        Args:
+            estimated: Tokens taken when the call was admitted
+            actual: Tokens the call really used (None = keep the estimate)
+        """
+        with self._lock:
+            self.in_flight -= 1
+            if self.tokens is not None and actual is not None:
+                self.tokens.take(actual - estimated)
+
+    # Feedback
+
+    def _on_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.concurrency:
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                self._successes = 0
+
+    def _on_retry(self, error: BaseException, attempt: int) -> float:
+        """Record a failed attempt and return the delay before retrying"""
+        requested = retry_after(error)
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+        delay = (
+            requested + random.uniform(0, self.base_delay)
+            if requested is not None
+            else backoff
+        )
+
+        with self._lock:
+            self.retries += 1
+            if status_code(error) == 429:
+                now = time.monotonic()
+                # Halve once per throttling episode, not once per rejected call
+                if now >= self.paused_until:
+                    self.concurrency = max(
+                        self.min_concurrency, math.ceil(self.concurrency / 2)
+                    )
+                    self._successes = 0
+                self.throttled += 1
+                self.paused_until = max(self.paused_until, now + delay)
+
+        return delay
+
+    # Scheduling
+
+    def call(
+        self,
+        func: Callable[[], T],
+        tokens: int = 0,
+        usage: Callable[[T], int | None] | None = None,
+        on_retry: Callable[[dict], None] | None = None,
+    ) -> T:
+        """
+        Run a call under the limiter, retrying transient failures.
+
+        Args:
+            func: Zero-argument function making the call
+            tokens: Estimated tokens the call will consume
+            usage: Extracts the actual token count from the result
+            on_retry: Called with {"attempt", "delay", "status", "error"} before each retry
+
+        Returns:
+            Result of func
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens)
+            actual = None
+
+            try:
+                result = func()
+                actual = usage(result) if usage else None
+            except Exception as error:
+                if attempt == self.max_retries or not is_retryable(error):
+                    raise
+                delay = self._on_retry(error, attempt)
+                info = _retry_info(error, attempt, delay)
+            else:
+                self._on_success()
+                return result
+            finally:
+                self.release(tokens, actual)
+
+            if on_retry:
+                on_retry(info)
+            time.sleep(delay)
+
+    async def acall(
+        self,
+        func: Callable[[], Awaitable[T]],
+        tokens: int = 0,
+        usage: Callable[[T], int | None] | None = None,
+        on_retry: Callable[[dict], Awaitable[None]] | None = None,
+    ) -> T:
+        """Async variant of call (func returns an awaitable, on_retry is awaited)"""
+        for attempt in range(self.max_retries + 1):
+            await self.aacquire(tokens)
+            actual = None
+
+            try:
+                result = await func()
+                actual = usage(result) if usage else None
+            except Exception as error:
+                if attempt == self.max_retries or not is_retryable(error):
+                    raise
+                delay = self._on_retry(error, attempt)
+                info = _retry_info(error, attempt, delay)
+            else:
+                self._on_success()
+                return result
+            finally:
+                self.release(tokens, actual)
+
+            if on_retry:
+                await on_retry(info)
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        """Current concurrency cap and throttling counters"""
+        with self._lock:
+            return {
+                "concurrency": self.concurrency,
+                "in_flight": self.in_flight,
+                "throttled": self.throttled,
+                "retries": self.retries,
+            }
+
+
+def _retry_info(error: BaseException, attempt: int, delay: float) -> dict:
+    return {
+        "attempt": attempt + 1,
+        "delay": delay,
+        "status": status_code(error),
+        "error": type(error).__name__,
+    }
+
+
+def _from_env(**kwargs) -> RateLimiter:
+    concurrency = _env_number("SDLC_LLM_CONCURRENCY")
+    kwargs.setdefault("requests_per_minute", _env_number("SDLC_RPM"))
+    kwargs.setdefault("tokens_per_minute", _env_number("SDLC_TPM"))
+    if concurrency:
+        kwargs.setdefault("max_concurrency", int(concurrency))
+    return RateLimiter(**kwargs)
+
+
+_limiter = _from_env()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the rate limiter (the job's own inside a job scope)"""
+    return scoped("rate_limiter", _limiter)
+
+
+def configure_rate_limiter(**kwargs) -> RateLimiter:
+    """
+    Replace the process-wide rate limiter.
+
+    Inside runtime.scope.job_scope() only the current job's limiter is
+    replaced. A job asking for the process-wide limiter's settings keeps
+    sharing it, budgets and adaptive concurrency state included, with the
+    other jobs in the process.
+
+    Args:
+        **kwargs: RateLimiter options (requests_per_minute, tokens_per_minute,
+            max_concurrency, max_retries, ...); unset limits fall back to the
+            SDLC_RPM / SDLC_TPM / SDLC_LLM_CONCURRENCY environment variables
+
+    Returns:
+        The new limiter
+    """
+    global _limiter
+    limiter = _from_env(**{k: v for k, v in kwargs.items() if v is not None})
+    if in_job_scope():
+        if limiter.settings() == _limiter.settings():
+            limiter = _limiter
+        set_scoped("rate_limiter", limiter)
+    else:
+        _limiter = limiter
+    return limiter
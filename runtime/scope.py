@@ -0,0 +1,79 @@
+"""
+Per-job overrides of the process-wide runtime services.
+
+The response cache, rate limiter and context budget are process-wide
+singletons that a CLI run replaces with configure_*() from its options.
+A long-lived process running several jobs at once (the daemon) wraps each
+job in job_scope(). Inside a scope, configure_*() stores the new service
+for that job only, and get_*() returns it. Other jobs and the process-wide
+services are left alone. The scope is a context variable, so it follows
+the job into the asyncio tasks and the context-copying worker threads it
+starts.
+
+Usage:
+    from runtime.scope import job_scope
+
+    with job_scope():
+        main(argv)   # configure_cache(enabled=False) only affects this job
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+
+# Services configured by the job running in the current context (None
+# outside a job scope)
+_overrides: contextvars.ContextVar = contextvars.ContextVar(
+    "sdlc_runtime_overrides", default=None
+)
+
+
+@contextmanager
+def job_scope():
+    """Give configure_*() calls made inside the block a job-local effect"""
+    token = _overrides.set({})
+    try:
+        yield
+    finally:
+        _overrides.reset(token)
+
+
+def in_job_scope() -> bool:
+    """Whether the current context runs inside job_scope()"""
+    return _overrides.get() is not None
+
+
+def scoped(name: str, default):
+    """
+    Service configured by the current job, or the process-wide default.
+
+    Args:
+        name: Service name (e.g., "cache")
+        default: Process-wide instance
+
+    Returns:
+        The job's instance if it configured one, else default
+    """
+    overrides = _overrides.get()
+    if overrides is None:
+        return default
+    return overrides.get(name, default)
+
+
+def set_scoped(name: str, value) -> bool:
+    """
+    Store a service for the current job.
+
+    Args:
+        name: Service name (e.g., "cache")
+        value: Instance configured by the job
+
+    Returns:
+        False outside a job scope (the caller replaces the process-wide
+        instance instead)
+    """
+    overrides = _overrides.get()
+    if overrides is None:
+        return False
+    overrides[name] = value
+    return True
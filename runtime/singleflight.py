@@ -0,0 +1,391 @@
+"""
+Request coalescing ("single flight") for identical concurrent generations.
+
+When several callers ask for the same work at the same time (same input
+file content, prompt, model and options), only the first one, the leader,
+runs it. Callers in the same process wait for the leader's in-flight
+computation and receive its result.
+
+Callers in other processes (queue or pool workers, the daemon, CI jobs on
+one host) coordinate through an exclusive lock file per output file. The
+leader holds the lock while it computes, so generations writing the same
+artifact never run at once, even with different options. A caller that
+finds the lock taken leaves a marker for its key and waits. Only when such
+a marker exists does the leader publish its result next to the lock before
+releasing it. The waiting caller then reads that result instead of
+repeating the work, and passes it on the same way to callers queued behind
+it. If the leader died, or ran different work for the same output, the
+waiting caller runs the work itself. Uncontended generations therefore
+cost one lock file open and one stat, with no result written.
+
+Lock, marker and result files live in .cache/singleflight/ (override with
+SDLC_SINGLEFLIGHT_DIR). Results and markers older than RESULT_TTL are swept
+at most once per SWEEP_INTERVAL. Set SDLC_COALESCE=0 to disable
+coalescing. Cross-process coalescing needs fcntl locks (POSIX); elsewhere
+only callers in the same process are coalesced.
+
+Usage:
+    from runtime.singleflight import flight_key, get_single_flight
+
+    key = flight_key("user_story", SYSTEM_PROMPT, MODEL_NAME, files=[idea_path])
+    result, shared = get_single_flight().do(key, generate, resource=output_path)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from artifacts.writer import write_atomic
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Lock, marker and result files
+SINGLEFLIGHT_DIR = Path(
+    os.environ.get(
+        "SDLC_SINGLEFLIGHT_DIR",
+        Path(__file__).parent.parent / ".cache" / "singleflight",
+    )
+)
+
+# Published results and stale markers older than this are removed
+RESULT_TTL = 600.0
+
+# Minimum seconds between sweeps of old results and markers
+SWEEP_INTERVAL = 300.0
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def flight_key(*parts: str, files: list[Path] = (), **options) -> str:
+    """
+    Key identifying one unit of work.
+
+    Args:
+        *parts: Names and versions (e.g., agent name, system prompt, model)
+        files: Input files; their content (not their mtime) is hashed
+        **options: Options that change the result (e.g., save_output)
+
+    Returns:
+        Hex digest usable as a file name
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(hashlib.sha256(str(part).encode("utf-8")).digest())
+
+    for path in files:
+        file_digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                file_digest.update(chunk)
+        digest.update(file_digest.digest())
+
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+def encode_response(response: dict) -> dict:
+    """JSON-safe form of an agent response (messages serialized)"""
+    from langchain_core.messages import messages_to_dict
+
+    return {**response, "messages": messages_to_dict(response.get("messages", []))}
+
+
+def decode_response(data: dict) -> dict:
+    """Agent response from encode_response() output"""
+    from langchain_core.messages import messages_from_dict
+
+    return {**data, "messages": messages_from_dict(data.get("messages", []))}
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+
+    Args:
+        lock_dir: Directory for cross-process lock, marker and result files
+        enabled: When False, every call runs on its own
+    """
+
+    def __init__(self, lock_dir: Path = SINGLEFLIGHT_DIR, enabled: bool = True):
+        self.lock_dir = Path(lock_dir)
+        self.enabled = enabled
+
+        self.leaders = 0
+        self.joined = 0
+        self.shared = 0
+        self.published = 0
+        self._calls: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._dir_ready = False
+        self._last_sweep = time.monotonic()
+
+    # In-process coalescing
+
+    def _join(self, key: str) -> tuple[Future, bool]:
+        """The in-flight call for a key, and whether this caller leads it"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.joined += 1
+                return future, False
+
+            future = self._calls[key] = Future()
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result=None, error=None) -> None:
+        with self._lock:
+            self._calls.pop(key, None)
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    # Cross-process coalescing
+
+    def _lock_path(self, resource: str) -> Path:
+        if not self._dir_ready:
+            self.lock_dir.mkdir(parents=True, exist_ok=True)
+            self._dir_ready = True
+        return self.lock_dir / f"{_digest(resource)}.lock"
+
+    def _marker_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.waiting"
+
+    def _result_path(self, key: str) -> Path:
+        return self.lock_dir / f"{key}.json"
+
+    def _acquire(self, f, key: str) -> bool:
+        """Lock a file exclusively; True if another caller held it first"""
+        try:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return False
+        except BlockingIOError:
+            # Ask the holder to publish its result if it runs the same work
+            self._marker_path(key).touch()
+            fcntl.flock(f, fcntl.LOCK_EX)
+            return True
+
+    @contextmanager
+    def _file_lock(self, key: str, resource: str):
+        """Hold the resource's lock file; yields whether the caller waited"""
+        if fcntl is None:
+            yield False
+            return
+
+        with open(self._lock_path(resource), "a+") as f:
+            waited = self._acquire(f, key)
+            try:
+                yield waited
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @asynccontextmanager
+    async def _afile_lock(self, key: str, resource: str):
+        """Async variant of _file_lock that waits for the lock in a thread"""
+        if fcntl is None:
+            yield False
+            return
+
+        with open(self._lock_path(resource), "a+") as f:
+            waited = await asyncio.to_thread(self._acquire, f, key)
+            try:
+                yield waited
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _read_result(self, key: str, since: float) -> dict | None:
+        """Result published for the key after `since`, if any"""
+        try:
+            with open(self._result_path(key), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if record.get("finished", 0) < since:
+            return None
+        with self._lock:
+            self.shared += 1
+        return record["result"]
+
+    def _publish(self, key: str, data: Callable[[], object]) -> None:
+        """
+        Publish a result if a caller in another process is waiting for it.
+
+        Args:
+            key: Work key
+            data: Returns the JSON-safe result (only called when publishing)
+        """
+        marker = self._marker_path(key)
+        if fcntl is None or not marker.exists():
+            return
+
+        try:
+            content = json.dumps({"finished": time.time(), "result": data()})
+        except (TypeError, ValueError):
+            # Not serializable: the waiting caller computes it itself
+            return
+
+        write_atomic(self._result_path(key), content)
+        marker.unlink(missing_ok=True)
+        with self._lock:
+            self.published += 1
+
+        self._sweep()
+
+    def _sweep(self) -> None:
+        """Remove old results and markers (at most once per SWEEP_INTERVAL)"""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep < SWEEP_INTERVAL:
+                return
+            self._last_sweep = now
+
+        # Lock files stay: removing one another process holds breaks locking
+        cutoff = time.time() - RESULT_TTL
+        for pattern in ("*.json", "*.waiting"):
+            for path in self.lock_dir.glob(pattern):
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.unlink()
+                except OSError:
+                    pass
+
+    # Entry points
+
+    def do(
+        self,
+        key: str | None,
+        fn: Callable[[], object],
+        encode: Callable = lambda result: result,
+        decode: Callable = lambda data: data,
+        resource: str | Path | None = None,
+    ) -> tuple[object, bool]:
+        """
+        Run fn once for every concurrent caller with the same key.
+
+        Args:
+            key: Work key (see flight_key); None runs fn without coalescing
+            fn: Computes the result
+            encode: Converts the result to JSON-safe data for other processes
+            decode: Converts that data back into a result
+            resource: File the work writes (e.g., the output path); work for
+                one resource never runs in two processes at once (default:
+                the key)
+
+        Returns:
+            Tuple of the result and whether it was shared from another
+            caller's computation (False for the caller that ran fn)
+        """
+        if key is None or not self.enabled:
+            return fn(), False
+
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+
+        arrived = time.time()
+        try:
+            with self._file_lock(key, str(resource or key)) as waited:
+                data = self._read_result(key, arrived) if waited else None
+                if data is not None:
+                    result, shared = decode(data), True
+                    # Pass it on to callers that queued up behind this one
+                    self._publish(key, lambda: data)
+                else:
+                    result, shared = fn(), False
+                    self._publish(key, lambda: encode(result))
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result)
+        return result, shared
+
+    async def ado(
+        self,
+        key: str | None,
+        afn: Callable[[], Awaitable[object]],
+        encode: Callable = lambda result: result,
+        decode: Callable = lambda data: data,
+        resource: str | Path | None = None,
+    ) -> tuple[object, bool]:
+        """Async variant of do (afn is awaited; waits never block the loop)"""
+        if key is None or not self.enabled:
+            return await afn(), False
+
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+
+        arrived = time.time()
+        try:
+            async with self._afile_lock(key, str(resource or key)) as waited:
+                data = self._read_result(key, arrived) if waited else None
+                if data is not None:
+                    result, shared = decode(data), True
+                    # Pass it on to callers that queued up behind this one
+                    self._publish(key, lambda: data)
+                else:
+                    result, shared = await afn(), False
+                    self._publish(key, lambda: encode(result))
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+
+        self._finish(key, future, result)
+        return result, shared
+
+    def stats(self) -> dict:
+        """
+        Coalescing counters: leaders (ran or awaited the lock), joined (same
+        process), shared (read from another process), published (results
+        written for waiting processes)
+        """
+        with self._lock:
+            return {
+                "leaders": self.leaders,
+                "joined": self.joined,
+                "shared": self.shared,
+                "published": self.published,
+            }
+
+
+def _from_env() -> SingleFlight:
+    return SingleFlight(enabled=os.environ.get("SDLC_COALESCE", "1") != "0")
+
+
+_single_flight = _from_env()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group"""
+    return _single_flight
+
+
+def configure_single_flight(**kwargs) -> SingleFlight:
+    """
+    Replace the process-wide single-flight group.
+
+    Args:
+        **kwargs: SingleFlight options (lock_dir, enabled)
+
+    Returns:
+        The new process-wide group
+    """
+    global _single_flight
+    _single_flight = SingleFlight(**kwargs)
+    return _single_flight
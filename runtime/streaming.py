@@ -0,0 +1,106 @@
+"""
+Token streaming for compiled agent graphs.
+
+Wraps LangGraph's `stream`/`astream` with `stream_mode="messages"` so callers
+receive model tokens from the `llm_call` node as they arrive, while still
+getting the final graph state back.
+
+Usage:
+    from runtime.streaming import stream_agent
+
+    final_state = stream_agent(
+        agent, agent_input, on_token=lambda t: print(t, end="", flush=True)
+    )
+"""
+
+from typing import Callable
+
+
+def _noop(*args) -> None:
+    pass
+
+
+def _token_text(chunk) -> str:
+    """Text content of a message chunk (tool-call chunks have none)"""
+    content = getattr(chunk, "content", "")
+    return content if isinstance(content, str) else ""
+
+
+def stream_agent(
+    agent,
+    agent_input: dict,
+    on_token: Callable[[str], None] | None = None,
+    on_message_start: Callable[[], None] | None = None,
+) -> dict:
+    """
+    Run an agent graph, reporting model tokens as they are generated.
+
+    Args:
+        agent: Compiled agent graph with an "llm_call" node
+        agent_input: Initial agent state
+        on_token: Called with each text token from the model
+        on_message_start: Called when the model starts a new message (the
+            text of an earlier message, e.g. before a tool call, is obsolete)
+
+    Returns:
+        Final agent state
+    """
+    on_token = on_token or _noop
+    on_message_start = on_message_start or _noop
+    final_state = None
+    current_id = None
+
+    for mode, payload in agent.stream(
+        agent_input, stream_mode=["messages", "values"]
+    ):
+        if mode == "values":
+            final_state = payload
+            continue
+
+        chunk, metadata = payload
+        if metadata.get("langgraph_node") != "llm_call":
+            continue
+
+        if chunk.id != current_id:
+            current_id = chunk.id
+            on_message_start()
+
+        text = _token_text(chunk)
+        if text:
+            on_token(text)
+
+    return final_state
+
+
+async def astream_agent(
+    agent,
+    agent_input: dict,
+    on_token: Callable[[str], None] | None = None,
+    on_message_start: Callable[[], None] | None = None,
+) -> dict:
+    """Async variant of stream_agent built on astream"""
+    on_token = on_token or _noop
+    on_message_start = on_message_start or _noop
+    final_state = None
+    current_id = None
+
+    async for mode, payload in agent.astream(
+        agent_input, stream_mode=["messages", "values"]
+    ):
+        if mode == "values":
+            final_state = payload
+            continue
+
+        chunk, metadata = payload
+        if metadata.get("langgraph_node") != "llm_call":
+            continue
+
+        if chunk.id != current_id:
+            current_id = chunk.id
+            on_message_start()
+
+        text = _token_text(chunk)
+        if text:
+            on_token(text)
+
+    return final_state
@@ -0,0 +1,26 @@
+"""
+Long-running daemon that keeps agents warm for the command line interfaces.
+
+`python -m server` starts it; `python -m workflow`, `user_story` and
+`ac_writer` then hand their invocations to it (see server.client) and only
+stream the output back.
+"""
+
+import importlib
+
+# Public names and the submodule defining each (imported on first use so the
+# thin client never loads the daemon or LangChain)
+_EXPORTS = {
+    "run_remote": ".client",
+    "daemon_request": ".client",
+    "Daemon": ".daemon",
+    "serve": ".daemon",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,58 @@
+"""
+Entry point for the SDLC daemon.
+
+Usage:
+    python -m server             # Start the daemon (foreground)
+    python -m server --status    # Show whether a daemon is running
+    python -m server --stop      # Stop the running daemon
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from .client import SOCKET_PATH, daemon_request
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keep agents warm and serve the workflow/user_story/ac_writer CLIs"
+    )
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        default=SOCKET_PATH,
+        help="Unix socket to listen on (default: $SDLC_DAEMON_SOCKET or "
+        ".cache/daemon.sock)",
+    )
+    parser.add_argument(
+        "--status", action="store_true", help="Show the running daemon's status"
+    )
+    parser.add_argument("--stop", action="store_true", help="Stop the running daemon")
+
+    args = parser.parse_args()
+
+    if args.status or args.stop:
+        command = "shutdown" if args.stop else "status"
+        reply = next(daemon_request({"command": command}, args.socket), None)
+
+        if reply is None:
+            print(f"💤 No daemon listening on {args.socket}")
+            sys.exit(1)
+        if args.stop:
+            print(f"👋 Daemon on {args.socket} stopping")
+        else:
+            print(
+                f"🚀 Daemon pid {reply['pid']} on {args.socket}: "
+                f"up {reply['uptime']:.0f}s, {reply['jobs']} running, "
+                f"{reply['served']} served"
+            )
+        sys.exit(0)
+
+    # Deferred so --status/--stop stay as fast as the thin clients
+    from .daemon import serve
+
+    try:
+        serve(args.socket)
+    except RuntimeError as e:
+        parser.error(str(e))
@@ -0,0 +1,142 @@
+"""
+Thin client for the SDLC daemon.
+
+Used by the command line interfaces before they import anything heavy: if a
+daemon is listening on the socket, the invocation (command, arguments and
+SDLC_* environment) is sent to it. The output is then streamed back to this
+terminal as it is produced, and the daemon's exit code is returned. Only the
+standard library is imported here, so a client invocation costs little more
+than interpreter startup.
+
+Set SDLC_DAEMON=0 to always run locally.
+
+Usage:
+    from server.client import run_remote
+
+    code = run_remote("workflow", ["01"])   # None if no daemon is running
+"""
+
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+
+
+# Unix socket the daemon listens on (override with SDLC_DAEMON_SOCKET)
+SOCKET_PATH = Path(
+    os.environ.get(
+        "SDLC_DAEMON_SOCKET", Path(__file__).parent.parent / ".cache" / "daemon.sock"
+    )
+)
+
+# Options whose values are file paths, resolved against the client's cwd
+PATH_OPTIONS = ("--metrics",)
+
+
+def daemon_env() -> dict[str, str]:
+    """SDLC_* settings a job must share with the daemon to run there"""
+    return {
+        name: value
+        for name, value in os.environ.items()
+        if name.startswith("SDLC_")
+        and name not in ("SDLC_DAEMON", "SDLC_DAEMON_SOCKET")
+    }
+
+
+def _absolute_paths(argv: list[str]) -> list[str]:
+    """Make path option values absolute, since the daemon has its own cwd"""
+    resolved = list(argv)
+
+    for i, arg in enumerate(resolved):
+        option, _, value = arg.partition("=")
+        if option not in PATH_OPTIONS:
+            continue
+        if value:
+            resolved[i] = f"{option}={os.path.abspath(value)}"
+        elif i + 1 < len(resolved):
+            resolved[i + 1] = os.path.abspath(resolved[i + 1])
+
+    return resolved
+
+
+def _connect(socket_path: Path | None = None) -> socket.socket | None:
+    path = Path(socket_path or SOCKET_PATH)
+    if not path.exists():
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(str(path))
+    except OSError:
+        # Stale socket file of a daemon that is no longer running
+        connection.close()
+        return None
+
+    return connection
+
+
+def daemon_request(request: dict, socket_path: Path | None = None):
+    """
+    Send one request to the daemon and yield its reply messages.
+
+    Args:
+        request: Request dictionary (see server.daemon for the commands)
+        socket_path: Daemon socket (default: SOCKET_PATH)
+
+    Yields:
+        Reply messages, or nothing if no daemon is running
+    """
+    connection = _connect(socket_path)
+    if connection is None:
+        return
+
+    with connection, connection.makefile("rb") as replies:
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        for line in replies:
+            yield json.loads(line)
+
+
+def run_remote(
+    command: str, argv: list[str], socket_path: Path | None = None
+) -> int | None:
+    """
+    Run a CLI invocation in the daemon, streaming its output to this process.
+
+    Args:
+        command: CLI module ("workflow", "user_story" or "ac_writer")
+        argv: Arguments without the program name
+        socket_path: Daemon socket (default: SOCKET_PATH)
+
+    Returns:
+        The invocation's exit code, or None if it must run locally (no
+        daemon, SDLC_DAEMON=0, or the daemon declined it)
+    """
+    if os.environ.get("SDLC_DAEMON") == "0":
+        return None
+
+    request = {"command": command, "argv": _absolute_paths(argv), "env": daemon_env()}
+    streams = {"stdout": sys.stdout, "stderr": sys.stderr}
+    started = False
+
+    try:
+        for message in daemon_request(request, socket_path):
+            if "text" in message:
+                started = True
+                stream = streams[message["stream"]]
+                stream.write(message["text"])
+                stream.flush()
+            elif "fallback" in message:
+                return None
+            elif "exit" in message:
+                return message["exit"]
+    except OSError:
+        pass
+
+    # Run locally unless the job already started in the daemon (no daemon
+    # listening, or it went away before answering)
+    if not started:
+        return None
+
+    print("❌ Daemon closed the connection before the job finished", file=sys.stderr)
+    return 1
@@ -0,0 +1,291 @@
+"""
+SDLC daemon: runs CLI invocations inside one warm, long-lived process.
+
+Each `python -m user_story` / `ac_writer` / `workflow` run otherwise pays
+for interpreter startup, LangChain/LangGraph imports, model construction
+and graph compilation. The daemon pays for these once. It then serves
+invocations from thin clients (see server.client) over a Unix socket, one
+thread per connection. Each job runs the CLI's main() with the client's
+arguments. Everything the job prints is streamed back to the client as it
+is written, including generated tokens.
+
+Protocol: the client sends one JSON line and the daemon replies with JSON
+lines.
+
+    {"command": "workflow", "argv": [...], "env": {...}}
+        -> {"stream": "stdout"|"stderr", "text": "..."}*, {"exit": 0}
+        -> {"fallback": "reason"}   (run locally instead)
+    {"command": "status"}    -> {"pid", "uptime", "jobs", "served"}
+    {"command": "shutdown"}  -> {"exit": 0}
+
+Jobs are declined (the client runs them locally) when the client's SDLC_*
+environment differs from the daemon's, since data directories, caches and
+limits are configured from it, and for modes that fork processes (--workers).
+Each job runs in a runtime.scope.job_scope(). The cache, rate limit and
+context budget options it passes (--no-cache, --rpm, ...) therefore apply
+to that job only. Jobs with the daemon's own limits share its rate limiter.
+
+Usage:
+    python -m server                  # Serve on .cache/daemon.sock
+    python -m server --status
+    python -m server --stop
+"""
+
+import contextvars
+import importlib
+import io
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from runtime.scope import job_scope
+from .client import SOCKET_PATH, daemon_env, daemon_request
+
+
+# CLI modules the daemon can run
+COMMANDS = {
+    "workflow": "workflow.__main__",
+    "user_story": "user_story.__main__",
+    "ac_writer": "ac_writer.__main__",
+}
+
+# Arguments that make a job run locally instead
+LOCAL_ONLY_OPTIONS = ("--workers",)
+
+# Output sink of the job running in the current thread/task
+_sink: contextvars.ContextVar = contextvars.ContextVar("sdlc_daemon_sink", default=None)
+
+
+class _JobOutput:
+    """Sends one stream of a job's output to its client"""
+
+    def __init__(self, connection: socket.socket, stream: str, lock: threading.Lock):
+        self.connection = connection
+        self.stream = stream
+        self.lock = lock
+        self.closed = False
+
+    def send(self, message: dict) -> None:
+        if self.closed:
+            return
+        data = json.dumps(message).encode("utf-8") + b"\n"
+        try:
+            with self.lock:
+                self.connection.sendall(data)
+        except OSError:
+            # The client went away; the job still finishes and saves its output
+            self.closed = True
+
+    def write(self, text: str) -> int:
+        if text:
+            self.send({"stream": self.stream, "text": text})
+        return len(text)
+
+
+class _Router(io.TextIOBase):
+    """
+    sys.stdout/sys.stderr replacement routing writes to the current job.
+
+    Writes from threads without a job (the daemon itself) go to the
+    original stream.
+    """
+
+    def __init__(self, stream: str, fallback):
+        self.stream = stream
+        self.fallback = fallback
+
+    def write(self, text: str) -> int:
+        outputs = _sink.get()
+        if outputs is None:
+            return self.fallback.write(text)
+        return outputs[self.stream].write(text)
+
+    def flush(self) -> None:
+        if _sink.get() is None:
+            self.fallback.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+
+def warm_up() -> None:
+    """Import the CLIs and agents and compile their graphs"""
+    for module in COMMANDS.values():
+        importlib.import_module(module)
+
+    from ac_writer.agent import get_agent as get_ac_agent
+    from ac_writer.agent import get_repairer as get_ac_repairer
+    from user_story.agent import get_agent as get_story_agent
+    from user_story.agent import get_repairer as get_story_repairer
+    from workflow.agent import get_workflow
+
+    get_workflow()
+    try:
+        # Builds the shared chat models and connection pool
+        for build in (
+            get_story_agent,
+            get_story_repairer,
+            get_ac_agent,
+            get_ac_repairer,
+        ):
+            build()
+    except Exception as e:
+        print(f"⚠️  Agents will be built on first use: {e}")
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    # sys.exit("message") prints the message and exits with 1
+    print(code, file=sys.stderr)
+    return 1
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server running CLI jobs in worker threads.
+
+    Args:
+        socket_path: Socket file to listen on
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path = SOCKET_PATH):
+        self.socket_path = Path(socket_path)
+        self.started = time.time()
+        self.env = daemon_env()
+        self.jobs = 0
+        self.served = 0
+        self._lock = threading.Lock()
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        self.socket_path.unlink(missing_ok=True)
+        super().__init__(str(self.socket_path), _Handler)
+        os.chmod(self.socket_path, 0o600)
+
+    def decline(self, request: dict) -> str | None:
+        """Reason a job must run locally, or None if it can run here"""
+        if request.get("env", {}) != self.env:
+            return "SDLC_* environment differs from the daemon's"
+        if any(
+            arg.split("=")[0] in LOCAL_ONLY_OPTIONS for arg in request.get("argv", [])
+        ):
+            return "worker processes are not forked from the daemon"
+        return None
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "jobs": self.jobs,
+                "served": self.served,
+            }
+
+    def run_job(self, request: dict, connection: socket.socket) -> int:
+        """Run a CLI invocation with its output streamed to the connection"""
+        lock = threading.Lock()
+        outputs = {
+            stream: _JobOutput(connection, stream, lock)
+            for stream in ("stdout", "stderr")
+        }
+        main = importlib.import_module(COMMANDS[request["command"]]).main
+
+        with self._lock:
+            self.jobs += 1
+
+        # Handler threads start with an empty context, so the sink only
+        # applies to this job (and the tasks and threads it copies it into)
+        _sink.set(outputs)
+        try:
+            # configure_*() calls made by main() only affect this job
+            with job_scope():
+                main(request["argv"])
+            code = 0
+        except SystemExit as e:
+            code = _exit_code(e.code)
+        except Exception as e:
+            print(f"❌ {type(e).__name__}: {e}", file=sys.stderr)
+            code = 1
+        finally:
+            _sink.set(None)
+            with self._lock:
+                self.jobs -= 1
+                self.served += 1
+
+        outputs["stdout"].send({"exit": code})
+        return code
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Reads one request line and answers it"""
+
+    def reply(self, message: dict) -> None:
+        self.wfile.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        request = json.loads(line)
+        command = request.get("command")
+
+        if command == "status":
+            self.reply(self.server.status())
+        elif command == "shutdown":
+            self.reply({"exit": 0})
+            # shutdown() waits for serve_forever, so it cannot run here
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif command not in COMMANDS:
+            self.reply({"fallback": f"unknown command '{command}'"})
+        elif reason := self.server.decline(request):
+            self.reply({"fallback": reason})
+        else:
+            self.server.run_job(request, self.connection)
+
+
+def serve(socket_path: Path = SOCKET_PATH) -> None:
+    """
+    Warm up and serve jobs until shut down (--stop or Ctrl-C).
+
+    Args:
+        socket_path: Socket file to listen on
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the socket
+    """
+    if any(True for _ in daemon_request({"command": "status"}, socket_path)):
+        raise RuntimeError(f"A daemon is already listening on {socket_path}")
+
+    started = time.perf_counter()
+    warm_up()
+
+    sys.stdout = _Router("stdout", sys.stdout)
+    sys.stderr = _Router("stderr", sys.stderr)
+
+    with Daemon(socket_path) as daemon:
+        print(
+            f"🚀 SDLC daemon ready on {socket_path} "
+            f"(pid {os.getpid()}, warm-up {time.perf_counter() - started:.2f}s)"
+        )
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            Path(socket_path).unlink(missing_ok=True)
+
+    print("👋 SDLC daemon stopped")
@@ -0,0 +1 @@
+"""Focused tests for the shared runtime, artifact and workflow services"""
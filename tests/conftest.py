@@ -0,0 +1,25 @@
+"""
+Test session setup.
+
+Every repo module resolves its data, cache and lock directories at import
+time, so they are pointed at a scratch directory before any test module
+imports them. Tests never touch data/ or .cache/ of the checkout.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+_scratch = Path(tempfile.mkdtemp(prefix="sdlc-tests-"))
+atexit.register(shutil.rmtree, _scratch, ignore_errors=True)
+
+os.environ["SDLC_DATA_DIR"] = str(_scratch / "data")
+os.environ["SDLC_CACHE_DIR"] = str(_scratch / "cache" / "llm")
+os.environ["SDLC_SINGLEFLIGHT_DIR"] = str(_scratch / "cache" / "singleflight")
+os.environ["SDLC_BATCH_DIR"] = str(_scratch / "cache" / "batches")
+os.environ["SDLC_CHECKPOINT_DB"] = str(_scratch / "cache" / "checkpoints.sqlite")
+os.environ["SDLC_QUEUE_DB"] = str(_scratch / "data" / ".queue.sqlite")
+os.environ["SDLC_DAEMON"] = "0"
+os.environ.setdefault("OPENAI_API_KEY", "offline-tests")
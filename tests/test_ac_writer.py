@@ -0,0 +1,60 @@
+"""Tests for ac_writer per-scenario generation"""
+
+import asyncio
+import threading
+
+import pytest
+from langchain_core.messages import ToolMessage
+
+from ac_writer import agent
+from artifacts.index import DATA_DIR
+from benchmarks.fake_model import FakeChatModel, fake_gherkin
+
+STORY = "01-feat-single-stories.md"
+
+
+@pytest.fixture(autouse=True)
+def single_scenario_story(monkeypatch):
+    monkeypatch.setattr(agent, "_agent", None)
+    monkeypatch.setattr(agent, "_repairer", None)
+    agent.use_model(FakeChatModel(latency=0, scenarios=1))
+
+    stories_dir = DATA_DIR / "stories"
+    stories_dir.mkdir(parents=True, exist_ok=True)
+    (stories_dir / STORY).write_text(fake_gherkin(1), encoding="utf-8")
+
+
+def _finishes(call, timeout: float = 10.0):
+    """Result of call(), failing the test if it does not return in time"""
+    outcome = {}
+    thread = threading.Thread(
+        target=lambda: outcome.update(result=call()), daemon=True
+    )
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "generation did not finish (deadlock?)"
+    return outcome["result"]
+
+
+@pytest.mark.parametrize("direct_context", [False, True])
+def test_single_scenario_story_falls_back_to_one_request(direct_context):
+    response = _finishes(
+        lambda: agent.generate_ac(
+            STORY, "story", True, direct_context=direct_context, per_scenario=True
+        )
+    )
+
+    assert response["content"]
+    assert response["output_file"].endswith("01-feat-single-scenario-ac.md")
+    # The caller's direct_context decides whether the model fetches the file
+    fetched = any(isinstance(m, ToolMessage) for m in response["messages"])
+    assert fetched is not direct_context
+
+
+def test_async_single_scenario_story_falls_back_to_one_request():
+    response = _finishes(
+        lambda: asyncio.run(agent.agenerate_ac(STORY, "story", True, per_scenario=True))
+    )
+
+    assert response["content"]
+    assert "scenarios" not in response
@@ -0,0 +1,62 @@
+"""Tests for runtime.batch_api"""
+
+import pytest
+
+from runtime.batch_api import (
+    BatchBackend,
+    LocalBatchBackend,
+    batch_request,
+    wait_for_batch,
+)
+
+
+class BrokenModel:
+    """Chat model whose batch call fails as a whole"""
+
+    def batch(self, *args, **kwargs):
+        raise RuntimeError("model unavailable")
+
+
+class StuckBackend(BatchBackend):
+    name = "stuck"
+
+    def submit(self, requests: list[dict]) -> str:
+        return "job"
+
+    def status(self, job_id: str) -> str:
+        return "in_progress"
+
+    def results(self, job_id: str) -> dict[str, dict]:
+        return {}
+
+
+def _requests() -> list[dict]:
+    messages = [{"role": "user", "content": "Hello"}]
+    return [batch_request(name, "gpt-4o-mini", messages) for name in ("01", "02")]
+
+
+def test_failed_local_job_reports_failure(tmp_path):
+    backend = LocalBatchBackend(directory=tmp_path, chat_model=BrokenModel())
+
+    job_id = backend.submit(_requests())
+    state = wait_for_batch(backend, job_id, poll_interval=0.01, timeout=5)
+
+    assert state == "failed"
+    results = backend.results(job_id)
+    assert sorted(results) == ["01", "02"]
+    assert "model unavailable" in results["01"]["error"]
+    assert results["01"]["content"] is None
+
+
+def test_wait_for_batch_gives_up_after_timeout():
+    with pytest.raises(TimeoutError):
+        wait_for_batch(StuckBackend(), "job", poll_interval=0.01, timeout=0.05)
+
+
+def test_backends_must_implement_the_interface():
+    class Incomplete(BatchBackend):
+        def submit(self, requests: list[dict]) -> str:
+            return "job"
+
+    with pytest.raises(TypeError):
+        Incomplete()
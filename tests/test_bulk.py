@@ -0,0 +1,84 @@
+"""Tests for the eval gates of workflow.bulk"""
+
+from runtime.batch_api import BatchBackend
+from workflow.bulk import _apply_gates
+
+
+def _scenario(number: int, when: bool = True) -> str:
+    when_step = f"    When the user opens page {number}\n" if when else ""
+    return (
+        f"  Scenario: Page {number}\n"
+        f"    Given a catalog with {number * 20} products\n"
+        f"{when_step}"
+        f"    Then page {number} is shown\n"
+    )
+
+
+def _document(broken: int | None = None) -> str:
+    return "Feature: Pagination\n\n" + "\n".join(
+        _scenario(n, when=n != broken) for n in range(1, 4)
+    )
+
+
+class RepairBackend(BatchBackend):
+    """Answers every repair request with the given content"""
+
+    name = "stub"
+
+    def __init__(self, content: str | None):
+        self.content = content
+        self.jobs: list[list[dict]] = []
+
+    def submit(self, requests: list[dict]) -> str:
+        self.jobs.append(requests)
+        return f"job-{len(self.jobs)}"
+
+    def status(self, job_id: str) -> str:
+        return "completed"
+
+    def results(self, job_id: str) -> dict[str, dict]:
+        requests = self.jobs[int(job_id.split("-")[1]) - 1]
+        return {
+            request["custom_id"]: {"content": self.content, "error": None}
+            for request in requests
+        }
+
+
+def _gate(backend: BatchBackend, texts: dict) -> dict:
+    return _apply_gates(
+        backend,
+        "Stories",
+        "stories",
+        texts,
+        ("gpt-4o-mini", "system", "stories"),
+        poll_interval=0,
+        timeout=5,
+    )
+
+
+def test_failing_blocks_are_repaired_in_one_batch_job():
+    backend = RepairBackend(_scenario(2))
+    texts = {
+        "01-idea.md": (_document(broken=2), "01-idea.md"),
+        "02-idea.md": (_document(), "02-idea.md"),
+    }
+
+    checked = _gate(backend, texts)
+
+    # Only the failing output is sent for repair
+    assert [[r["custom_id"] for r in job] for job in backend.jobs] == [["01-idea.md"]]
+    text, report = checked["01-idea.md"]
+    assert report["passed"]
+    assert "When the user opens page 2" in text
+    assert checked["02-idea.md"][0] == texts["02-idea.md"][0]
+
+
+def test_unrepaired_outputs_are_reported(capsys):
+    backend = RepairBackend(None)
+
+    checked = _gate(backend, {"01-idea.md": (_document(broken=2), "01-idea.md")})
+
+    text, report = checked["01-idea.md"]
+    assert text == _document(broken=2)
+    assert not report["passed"]
+    assert "Stories for 01-idea.md:" in capsys.readouterr().out
@@ -0,0 +1,66 @@
+"""Tests for runtime.cache"""
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from artifacts.index import DATA_DIR
+from benchmarks.fake_model import FakeChatModel
+from runtime import cache as cache_module
+from runtime.cache import LLMCache
+from user_story import agent
+
+IDEA = "01-feat-cached.md"
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    cache = LLMCache(tmp_path / "llm")
+    monkeypatch.setattr(cache_module, "_cache", cache)
+    return cache
+
+
+def test_key_ignores_message_ids_and_metadata(cache):
+    def conversation(run: int) -> list:
+        return [
+            HumanMessage(content="Write stories", id=f"human-{run}"),
+            AIMessage(
+                content="",
+                tool_calls=[{"name": "get_idea_file", "args": {}, "id": "call_0"}],
+                id=f"ai-{run}",
+                response_metadata={"created": run},
+                usage_metadata={
+                    "input_tokens": run,
+                    "output_tokens": 1,
+                    "total_tokens": run + 1,
+                },
+            ),
+            ToolMessage(content="# Idea", tool_call_id="call_0", id=f"tool-{run}"),
+        ]
+
+    model = FakeChatModel()
+    assert cache.key_for(model, "system", conversation(1)) == cache.key_for(
+        model, "system", conversation(2)
+    )
+    assert cache.key_for(model, "system", conversation(1)) != cache.key_for(
+        model, "other system", conversation(1)
+    )
+
+
+def test_streamed_run_hits_the_cache_on_replay(cache, monkeypatch):
+    monkeypatch.setattr(agent, "_agent", None)
+    monkeypatch.setattr(agent, "_repairer", None)
+    agent.use_model(FakeChatModel(latency=0))
+
+    ideas_dir = DATA_DIR / "ideas"
+    ideas_dir.mkdir(parents=True, exist_ok=True)
+    (ideas_dir / IDEA).write_text("# Cached feature\n\nA feature.\n")
+
+    agent.stream_stories(IDEA, save_output=False)
+    first = cache.stats()
+    agent.stream_stories(IDEA, save_output=False)
+    second = cache.stats()
+
+    # Tool request and final generation both replay from the cache
+    assert first["misses"] == 2
+    assert second["hits"] - first["hits"] == 2
+    assert second["misses"] == first["misses"]
@@ -0,0 +1,51 @@
+"""Tests for workflow.checkpoint"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from workflow import checkpoint
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_db(tmp_path, monkeypatch):
+    path = tmp_path / "checkpoints.sqlite"
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DB", path)
+    return path
+
+
+def test_run_record_waits_for_another_writer(checkpoint_db):
+    checkpoint.start_run([], {})
+
+    # Another process holds the write lock for a moment
+    other = sqlite3.connect(
+        checkpoint_db, isolation_level=None, check_same_thread=False
+    )
+    other.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.3, other.execute, args=("COMMIT",))
+    release.start()
+
+    started = time.monotonic()
+    run_id = checkpoint.start_run(["01-feat-a.md"], {"force": True})
+
+    assert time.monotonic() - started >= 0.2
+    assert checkpoint.load_run(run_id)["filenames"] == ["01-feat-a.md"]
+    release.join()
+    other.close()
+
+
+def test_checkpointers_use_wal(checkpoint_db):
+    with checkpoint.checkpointer() as saver:
+        saver.setup()
+
+    async def setup() -> None:
+        async with checkpoint.acheckpointer() as saver:
+            await saver.setup()
+
+    asyncio.run(setup())
+
+    with sqlite3.connect(checkpoint_db) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
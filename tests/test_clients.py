@@ -0,0 +1,69 @@
+"""Tests for runtime.clients (shared HTTP connection pools)"""
+
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from runtime.clients import ClientRegistry
+
+
+class _OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _OkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_client_survives_repeated_event_loops(server_url):
+    client = ClientRegistry(http2=False).http_async_client()
+
+    async def fetch():
+        return (await client.get(server_url)).text
+
+    # Each asyncio.run() closes its loop; the next one needs a fresh pool
+    assert [asyncio.run(fetch()) for _ in range(3)] == ["ok"] * 3
+
+
+def test_async_client_serves_loops_in_several_threads(server_url):
+    client = ClientRegistry(http2=False).http_async_client()
+    results = []
+
+    async def fetch():
+        return (await client.get(server_url)).text
+
+    threads = [
+        threading.Thread(target=lambda: results.append(asyncio.run(fetch())))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["ok"] * 4
+
+
+def test_chat_models_are_shared(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    registry = ClientRegistry(http2=False)
+
+    first = registry.chat_model("gpt-4o-mini", temperature=0)
+    assert registry.chat_model("gpt-4o-mini", temperature=0) is first
+    assert registry.chat_model("gpt-4o-mini", temperature=0.5) is not first
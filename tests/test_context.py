@@ -0,0 +1,54 @@
+"""Tests for runtime.context token counting"""
+
+import gc
+import weakref
+
+import pytest
+
+from runtime import context
+
+
+class WordEncoding:
+    """Stand-in tokenizer (one token per word) that counts its calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def encode(self, text: str, disallowed_special=()) -> list[str]:
+        self.calls += 1
+        return text.split()
+
+
+class Text(str):
+    """str subclass, so a test can hold a weak reference to it"""
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    encoding = WordEncoding()
+    monkeypatch.setattr(context, "_encoding", encoding)
+    monkeypatch.setattr(context, "_encoding_loaded", True)
+    monkeypatch.setattr(context, "_token_counts", context.OrderedDict())
+    return encoding
+
+
+def test_counts_are_remembered_without_keeping_the_text(encoding):
+    text = Text("word " * 10_000)
+    ref = weakref.ref(text)
+
+    assert context.count_text_tokens(text) == 10_000
+    assert context.count_text_tokens("word " * 10_000) == 10_000
+    assert encoding.calls == 1
+
+    del text
+    gc.collect()
+    assert ref() is None
+
+
+def test_count_cache_is_bounded(encoding, monkeypatch):
+    monkeypatch.setattr(context, "TOKEN_COUNT_CACHE_SIZE", 3)
+
+    for n in range(5):
+        context.count_text_tokens(f"text {n}")
+
+    assert len(context._token_counts) == 3
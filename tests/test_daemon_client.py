@@ -0,0 +1,84 @@
+"""Tests for server.client (daemon fallback)"""
+
+import json
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from server.client import run_remote
+
+
+@pytest.fixture
+def socket_path(monkeypatch):
+    monkeypatch.delenv("SDLC_DAEMON", raising=False)
+    # Unix socket paths are limited to about 100 characters
+    with tempfile.TemporaryDirectory(dir="/tmp") as directory:
+        yield Path(directory) / "daemon.sock"
+
+
+def _serve(path: Path, replies: list[dict]) -> threading.Thread:
+    """Answer one request with the given messages, then hang up"""
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(str(path))
+    server.listen(1)
+
+    def answer() -> None:
+        connection, _ = server.accept()
+        with connection, server:
+            connection.makefile("rb").readline()
+            for reply in replies:
+                connection.sendall(json.dumps(reply).encode("utf-8") + b"\n")
+
+    thread = threading.Thread(target=answer, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_no_daemon_runs_locally(socket_path):
+    assert run_remote("workflow", ["01"], socket_path) is None
+
+
+def test_disabled_daemon_runs_locally(socket_path, monkeypatch):
+    _serve(socket_path, [{"exit": 0}])
+    monkeypatch.setenv("SDLC_DAEMON", "0")
+
+    assert run_remote("workflow", ["01"], socket_path) is None
+
+
+def test_stale_socket_file_runs_locally(socket_path):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(socket_path))
+    stale.close()
+
+    assert socket_path.exists()
+    assert run_remote("workflow", ["01"], socket_path) is None
+
+
+def test_daemon_hanging_up_before_answering_runs_locally(socket_path):
+    thread = _serve(socket_path, [])
+
+    assert run_remote("workflow", ["01"], socket_path) is None
+    thread.join(5)
+
+
+def test_declined_job_runs_locally(socket_path):
+    _serve(socket_path, [{"fallback": "busy"}])
+
+    assert run_remote("workflow", ["01"], socket_path) is None
+
+
+def test_job_output_and_exit_code_are_relayed(socket_path, capsys):
+    _serve(socket_path, [{"stream": "stdout", "text": "done\n"}, {"exit": 3}])
+
+    assert run_remote("workflow", ["01"], socket_path) == 3
+    assert capsys.readouterr().out == "done\n"
+
+
+def test_daemon_closing_a_started_job_fails(socket_path, capsys):
+    _serve(socket_path, [{"stream": "stdout", "text": "working\n"}])
+
+    assert run_remote("workflow", ["01"], socket_path) == 1
+    assert "closed the connection" in capsys.readouterr().err
@@ -0,0 +1,46 @@
+"""Tests for the benchmark fake chat model"""
+
+import pytest
+from langchain_core.messages import AIMessage, ToolMessage
+
+from artifacts.index import DATA_DIR
+from benchmarks.fake_model import FakeChatModel
+from runtime import cache as cache_module
+from runtime.cache import LLMCache
+from user_story import agent
+
+IDEA = "01-feat-scripted.md"
+
+OUTLINE = {"name": "get_idea_section", "args": {"filename": "{filename}"}}
+SECTION = {
+    "name": "get_idea_section",
+    "args": {"filename": "{filename}", "heading": "Goals"},
+}
+
+
+@pytest.fixture(autouse=True)
+def scripted_agent(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_module, "_cache", LLMCache(tmp_path, enabled=False))
+    monkeypatch.setattr(agent, "_agent", None)
+    monkeypatch.setattr(agent, "_repairer", None)
+    agent.use_model(FakeChatModel(latency=0, tool_script=[[OUTLINE], [SECTION] * 2]))
+
+    ideas_dir = DATA_DIR / "ideas"
+    ideas_dir.mkdir(parents=True, exist_ok=True)
+    (ideas_dir / IDEA).write_text("# Scripted\n\n## Goals\n\nShip it.\n")
+
+
+@pytest.mark.parametrize("run", [agent.generate_stories, agent.stream_stories])
+def test_tool_script_drives_multi_round_tool_loops(run):
+    response = run(IDEA, save_output=False)
+
+    rounds = [
+        m.tool_calls for m in response["messages"]
+        if isinstance(m, AIMessage) and m.tool_calls
+    ]
+    assert [len(calls) for calls in rounds] == [1, 2]
+    assert rounds[1][0]["args"] == {"filename": IDEA, "heading": "Goals"}
+
+    results = [m.content for m in response["messages"] if isinstance(m, ToolMessage)]
+    assert "Ship it." in results[-1]
+    assert response["content"].startswith("Feature:")
@@ -0,0 +1,39 @@
+"""Tests for tools.file_retrieval"""
+
+import pytest
+
+from artifacts.index import ArtifactIndex
+from tools import file_retrieval
+from tools.file_retrieval import read_file_context
+from user_story.agent import story_prompt
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    (tmp_path / "ideas").mkdir()
+    index = ArtifactIndex(tmp_path)
+    monkeypatch.setattr(file_retrieval, "get_index", lambda: index)
+    monkeypatch.setattr(file_retrieval, "MAX_TOOL_READ_BYTES", 1024)
+    return tmp_path
+
+
+def test_small_file_is_inlined_whole(data_dir):
+    (data_dir / "ideas" / "01-small.md").write_text("# Small\n\nShort idea.\n")
+
+    assert read_file_context("ideas", "01-small.md") == "# Small\n\nShort idea.\n"
+
+
+def test_large_file_is_capped_for_direct_context(data_dir):
+    body = "".join(f"## Part {n}\n\n{'x' * 300}\n\n" for n in range(20))
+    (data_dir / "ideas" / "02-large.md").write_text(f"# Large\n\n{body}")
+
+    prompt = story_prompt("02-large.md", direct_context=True)
+
+    assert "[File truncated: showing the first 1024 of" in prompt
+    assert "get_idea_section" in prompt
+    assert "## Part 19" in prompt  # listed in the outline
+    assert len(prompt) < len(body)
+
+
+def test_missing_file_has_no_context(data_dir):
+    assert read_file_context("ideas", "03-missing.md") is None
@@ -0,0 +1,32 @@
+"""Tests for evals.gherkin (local eval gates)"""
+
+from evals.gherkin import parse, validate
+
+
+def _scenario(number: int, comment: str = "") -> str:
+    return (
+        f"  Scenario: Page {number}\n"
+        f"    Given a catalog with {number * 20} products\n"
+        f"{comment}"
+        f"    When the user opens page {number}\n"
+        f"    Then page {number} is shown\n"
+    )
+
+
+def test_indented_comment_does_not_cut_a_scenario_short():
+    text = "Feature: Pagination\n\n" + "\n".join(
+        _scenario(n, comment="    # Page size is 20\n") for n in range(1, 4)
+    )
+
+    _, blocks = parse(text)
+
+    assert [keyword for keyword, _ in blocks[0]["steps"]] == ["Given", "When", "Then"]
+    assert validate(text, "stories")["passed"]
+
+
+def test_unindented_heading_ends_a_scenario():
+    text = "Feature: Pagination\n\n" + _scenario(1) + "\n# Open questions\n- none\n"
+
+    _, [block] = parse(text)
+
+    assert "Open questions" not in block["text"]
@@ -0,0 +1,31 @@
+"""Tests for artifacts.index"""
+
+from artifacts.index import ArtifactIndex
+
+
+def test_content_cache_keeps_recently_read_files_under_the_cap(tmp_path):
+    ideas = tmp_path / "ideas"
+    ideas.mkdir()
+    for name in ("a", "b", "c"):
+        (ideas / f"{name}.md").write_text(name * 40)
+    index = ArtifactIndex(tmp_path, cache_bytes=100)
+
+    for name in ("a", "b", "a", "c"):
+        assert index.read("ideas", f"{name}.md") == name * 40
+
+    # "b" was read least recently and is dropped to stay under 100 bytes
+    assert [key[1] for key in index._content] == ["a.md", "c.md"]
+    assert index._content_bytes == 80
+
+
+def test_changed_file_replaces_its_cached_content(tmp_path):
+    ideas = tmp_path / "ideas"
+    ideas.mkdir()
+    path = ideas / "a.md"
+    path.write_text("old")
+    index = ArtifactIndex(tmp_path)
+
+    assert index.read("ideas", "a.md") == "old"
+    path.write_text("newer")
+    assert index.read("ideas", "a.md") == "newer"
+    assert index._content_bytes == 5
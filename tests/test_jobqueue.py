@@ -0,0 +1,91 @@
+"""Tests for workflow.jobqueue and the queue worker's lease handling"""
+
+import asyncio
+import time
+
+import pytest
+
+from artifacts.writer import guard_writes, write_atomic
+from workflow.jobqueue import JobQueue
+from workflow.queue_worker import _heartbeat, _lease_guard
+
+
+LEASE = 0.2
+
+
+@pytest.fixture
+def queue(tmp_path):
+    queue = JobQueue(tmp_path / "queue.sqlite", lease_seconds=LEASE, max_attempts=2)
+    queue.enqueue(["01-feat-a.md", "02-feat-b.md"], {"force": False})
+    return queue
+
+
+def _taken_over(queue: JobQueue) -> tuple[dict, dict]:
+    """A lease that expired, and the lease of the worker that took it over"""
+    stale = queue.claim("a")
+    queue.claim("a")
+    time.sleep(LEASE * 1.5)
+    return stale, queue.claim("b")
+
+
+def test_claim_leases_each_item_once(queue):
+    first, second = queue.claim("a"), queue.claim("b")
+
+    assert {first["filename"], second["filename"]} == {"01-feat-a.md", "02-feat-b.md"}
+    assert queue.claim("c") is None
+    assert queue.counts()["leased"] == 2
+
+
+def test_expired_lease_is_taken_over(queue):
+    stale, lease = _taken_over(queue)
+
+    assert lease["filename"] == stale["filename"]
+    assert lease["attempts"] == 2
+    assert not queue.heartbeat(stale)
+    assert not queue.holds(stale)
+    assert queue.holds(lease)
+
+
+def test_complete_with_lost_lease_records_nothing(queue):
+    stale, lease = _taken_over(queue)
+
+    assert not queue.complete(stale, {"errors": []})
+    assert queue.complete(lease, {"errors": []})
+    assert queue.counts()["done"] == 1
+
+
+def test_item_fails_after_max_attempts(queue):
+    _taken_over(queue)
+    time.sleep(LEASE * 1.5)
+
+    # Both items expired; the one claimed twice is failed instead of retried
+    lease = queue.claim("c")
+
+    assert lease["filename"] == "02-feat-b.md"
+    assert queue.counts()["failed"] == 1
+
+
+def test_lost_lease_cancels_the_workflow(queue):
+    stale, _ = _taken_over(queue)
+
+    async def run() -> tuple[bool, bool]:
+        workflow = asyncio.create_task(asyncio.sleep(10))
+        lost = await _heartbeat(queue, stale, workflow)
+        await asyncio.gather(workflow, return_exceptions=True)
+        return lost, workflow.cancelled()
+
+    assert asyncio.run(asyncio.wait_for(run(), 5)) == (True, True)
+
+
+def test_lost_lease_refuses_artifact_writes(queue, tmp_path):
+    stale, lease = _taken_over(queue)
+    path = tmp_path / "stories.feature"
+
+    with guard_writes(_lease_guard(queue, lease)):
+        write_atomic(path, "owner")
+    with guard_writes(_lease_guard(queue, stale)):
+        with pytest.raises(PermissionError):
+            write_atomic(path, "stale")
+
+    assert path.read_text() == "owner"
+    assert [p.name for p in tmp_path.iterdir() if p.suffix == ".partial"] == []
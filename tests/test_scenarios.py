@@ -0,0 +1,43 @@
+"""Tests for ac_writer.scenarios (Gherkin scenario splitting)"""
+
+from ac_writer.scenarios import split_scenarios
+
+
+STORIES = """\
+# Pagination stories
+
+```gherkin
+Feature: Pagination
+  As a shopper I want pages of results
+
+  Scenario: Next page
+    Given a catalog with 40 products
+    # The page size is fixed at 20
+    When the user opens page 2
+    Then products 21 to 40 are shown
+
+  Scenario: Last page
+    Given a catalog with 40 products
+    When the user opens page 3
+    Then an empty page is shown
+```
+
+## Notes
+"""
+
+
+def test_indented_comments_stay_inside_their_scenario():
+    first, second = split_scenarios(STORIES)
+
+    assert first["name"] == "Scenario: Next page"
+    assert "# The page size is fixed at 20" in first["text"]
+    assert "Then products 21 to 40 are shown" in first["text"]
+    assert second["name"] == "Scenario: Last page"
+    assert "Feature: Pagination" in first["context"]
+
+
+def test_unindented_markdown_ends_the_scenario():
+    *_, last = split_scenarios(STORIES)
+
+    assert "Notes" not in last["text"]
+    assert "```" not in last["text"]
@@ -0,0 +1,60 @@
+"""Tests for runtime.scope (per-job runtime services in the daemon)"""
+
+import threading
+
+from runtime.cache import configure_cache, get_cache
+from runtime.context import configure_context_budget, get_context_budget
+from runtime.ratelimit import configure_rate_limiter, get_rate_limiter
+from runtime.scope import job_scope
+
+
+def test_configure_inside_job_scope_leaves_process_services_alone(tmp_path):
+    process_cache = get_cache()
+    process_budget = get_context_budget()
+
+    with job_scope():
+        job_cache = configure_cache(enabled=False, cache_dir=tmp_path)
+        configure_context_budget(max_input_tokens=1234)
+
+        assert get_cache() is job_cache
+        assert get_context_budget().max_input_tokens == 1234
+
+    assert get_cache() is process_cache
+    assert get_context_budget() is process_budget
+
+
+def test_concurrent_jobs_keep_their_own_options(tmp_path):
+    barrier = threading.Barrier(2)
+    seen = {}
+
+    def job(name: str, enabled: bool) -> None:
+        with job_scope():
+            configure_cache(enabled=enabled, cache_dir=tmp_path / name)
+            # Both jobs have configured their cache before either reads it
+            barrier.wait()
+            seen[name] = get_cache().enabled
+
+    threads = [
+        threading.Thread(target=job, args=("cached", True)),
+        threading.Thread(target=job, args=("uncached", False)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert seen == {"cached": True, "uncached": False}
+
+
+def test_job_with_process_limits_shares_the_process_limiter():
+    process_limiter = get_rate_limiter()
+
+    with job_scope():
+        assert configure_rate_limiter() is process_limiter
+
+    with job_scope():
+        job_limiter = configure_rate_limiter(requests_per_minute=7)
+        assert job_limiter is not process_limiter
+        assert get_rate_limiter() is job_limiter
+
+    assert get_rate_limiter() is process_limiter
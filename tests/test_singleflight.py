@@ -0,0 +1,164 @@
+"""Tests for runtime.singleflight (request coalescing)"""
+
+import asyncio
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from runtime import singleflight
+from runtime.singleflight import SingleFlight
+
+
+def _run_threads(count: int, target) -> None:
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_concurrent_callers_share_one_computation(tmp_path):
+    group = SingleFlight(tmp_path)
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"content": "stories"}
+
+    _run_threads(5, lambda: results.append(group.do("key", compute)))
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == [{"content": "stories"}] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+
+
+def test_followers_receive_the_leaders_error(tmp_path):
+    group = SingleFlight(tmp_path)
+    errors = []
+
+    def compute():
+        time.sleep(0.2)
+        raise ValueError("model failed")
+
+    def call():
+        try:
+            group.do("key", compute)
+        except ValueError as e:
+            errors.append(str(e))
+
+    _run_threads(3, call)
+
+    assert errors == ["model failed"] * 3
+    # A failed computation is not remembered
+    assert group.do("key", lambda: "retried") == ("retried", False)
+
+
+def test_async_callers_share_one_computation(tmp_path):
+    group = SingleFlight(tmp_path)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return "stories"
+
+    async def main():
+        return await asyncio.gather(*(group.ado("key", compute) for _ in range(4)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert [result for result, _ in results] == ["stories"] * 4
+
+
+def test_uncontended_calls_publish_nothing(tmp_path):
+    group = SingleFlight(tmp_path)
+
+    assert group.do("key", lambda: "stories", resource="stories.md") == (
+        "stories",
+        False,
+    )
+    assert not list(tmp_path.glob("*.json"))
+    assert group.stats()["published"] == 0
+
+
+def test_different_work_for_one_resource_never_overlaps(tmp_path):
+    group = SingleFlight(tmp_path)
+    running, overlaps = [], []
+    keys = iter(["direct", "tools", "no-save"])
+    lock = threading.Lock()
+
+    def compute():
+        with lock:
+            running.append(1)
+            if len(running) > 1:
+                overlaps.append(1)
+        time.sleep(0.1)
+        with lock:
+            running.pop()
+        return "stories"
+
+    def call():
+        with lock:
+            key = next(keys)
+        group.do(key, compute, resource="data/stories/01-stories.md")
+
+    _run_threads(3, call)
+
+    assert overlaps == []
+
+
+def test_disabled_group_runs_every_call(tmp_path):
+    group = SingleFlight(tmp_path, enabled=False)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return "stories"
+
+    _run_threads(3, lambda: group.do("key", compute))
+
+    assert len(calls) == 3
+
+
+def _process_caller(lock_dir: str, counter: str, barrier, queue) -> None:
+    group = SingleFlight(lock_dir)
+
+    def compute():
+        with open(counter, "a", encoding="utf-8") as f:
+            f.write("run\n")
+        time.sleep(1.0)
+        return {"content": "stories"}
+
+    # Every process is started and imported before any of them asks
+    barrier.wait()
+    result, shared = group.do("key", compute, resource="stories.md")
+    queue.put((result, shared))
+
+
+@pytest.mark.skipif(singleflight.fcntl is None, reason="needs POSIX file locks")
+def test_processes_share_one_computation(tmp_path):
+    counter = tmp_path / "runs.txt"
+    context = multiprocessing.get_context("spawn")
+    barrier, queue = context.Barrier(3), context.Queue()
+
+    processes = [
+        context.Process(
+            target=_process_caller, args=(str(tmp_path), str(counter), barrier, queue)
+        )
+        for _ in range(3)
+    ]
+    for process in processes:
+        process.start()
+
+    results = [queue.get(timeout=60) for _ in processes]
+    for process in processes:
+        process.join()
+
+    assert counter.read_text(encoding="utf-8") == "run\n"
+    assert [result for result, _ in results] == [{"content": "stories"}] * 3
+    assert sorted(shared for _, shared in results) == [False, True, True]
@@ -0,0 +1,85 @@
+"""Tests for nodes.tool_executor"""
+
+import asyncio
+import threading
+import time
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import StructuredTool, tool
+
+from nodes.tool_executor import create_tool_executor
+
+release = threading.Event()
+
+
+@tool
+def hang(name: str) -> str:
+    """Block until the test releases it"""
+    release.wait(5)
+    return name
+
+
+@tool
+def thread_name(name: str) -> str:
+    """Name of the thread running the tool"""
+    return threading.current_thread().name
+
+
+async def _echo(name: str) -> str:
+    await asyncio.sleep(0)
+    return f"async {name}"
+
+
+echo = StructuredTool.from_function(
+    coroutine=_echo, name="echo", description="Echo a name"
+)
+
+TOOLS = {t.name: t for t in (hang, thread_name, echo)}
+
+
+def _state(*names: str) -> dict:
+    calls = [
+        {"name": name, "args": {"name": str(i)}, "id": f"call_{i}"}
+        for i, name in enumerate(names)
+    ]
+    return {"messages": [AIMessage(content="", tool_calls=calls)]}
+
+
+def _contents(update: dict) -> list[str]:
+    return [message.content for message in update["messages"]]
+
+
+def test_deadline_is_measured_from_submission():
+    release.clear()
+    node = create_tool_executor(TOOLS, max_parallelism=1, timeout=0.2)
+
+    started = time.monotonic()
+    contents = _contents(node.invoke(_state("hang", "hang", "hang")))
+    elapsed = time.monotonic() - started
+    release.set()
+
+    assert all("timed out" in content for content in contents)
+    # Queued calls do not get their own timeout on top of the wait
+    assert elapsed < 0.4
+
+
+def test_hung_workers_do_not_starve_later_calls():
+    release.clear()
+    node = create_tool_executor(TOOLS, max_parallelism=1, timeout=0.1)
+
+    assert "timed out" in _contents(node.invoke(_state("hang")))[0]
+    contents = _contents(node.invoke(_state("thread_name")))
+    release.set()
+
+    assert contents[0].startswith("tool")
+
+
+def test_tools_run_through_the_interface_they_implement():
+    node = create_tool_executor(TOOLS)
+
+    # Coroutine-only tools work under invoke, sync tools use the pool under
+    # ainvoke
+    assert _contents(node.invoke(_state("echo"))) == ["async 0"]
+    contents = _contents(asyncio.run(node.ainvoke(_state("thread_name", "echo"))))
+    assert contents[0].startswith("tool")
+    assert contents[1] == "async 1"
@@ -0,0 +1,22 @@
+"""Tests for workflow stage bookkeeping that needs no LLM call"""
+
+from workflow.agent import create_initial_state, generate_stories_node
+
+
+MISSING = "99-feat-missing-idea.md"
+
+
+def test_missing_idea_is_reported_as_a_stage_error():
+    update = generate_stories_node(create_initial_state(MISSING))
+
+    assert update["stories_generated"] is False
+    assert update["errors"] and "Failed to generate stories" in update["errors"][0]
+
+
+def test_bulk_run_reports_missing_idea_without_crashing():
+    from workflow.bulk import run_bulk
+
+    report = run_bulk([MISSING], backend="local", poll_interval=0.01)
+
+    [result] = report["results"]
+    assert result["errors"] == [f"Failed to generate stories: cannot read {MISSING}"]
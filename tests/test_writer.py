@@ -0,0 +1,89 @@
+"""Tests for artifacts.writer (atomic and streaming artifact writes)"""
+
+import threading
+
+import pytest
+
+from artifacts.writer import StreamingFileWriter, guard_writes, write_atomic
+
+
+def test_write_atomic_replaces_content_and_leaves_no_partials(tmp_path):
+    target = tmp_path / "stories.md"
+    write_atomic(target, "old")
+    write_atomic(target, "new")
+
+    assert target.read_text(encoding="utf-8") == "new"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_concurrent_writers_to_one_target_do_not_collide(tmp_path):
+    target = tmp_path / "stories.md"
+    errors = []
+
+    def write_many(worker: int) -> None:
+        try:
+            for i in range(200):
+                write_atomic(target, f"worker {worker} write {i}\n" * 50)
+        except OSError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write_many, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    # The last rename wins with one writer's complete content
+    lines = set(target.read_text(encoding="utf-8").splitlines())
+    assert len(lines) == 1
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_streaming_writers_to_one_target_keep_separate_partials(tmp_path):
+    target = tmp_path / "ac.md"
+
+    with StreamingFileWriter(target) as first, StreamingFileWriter(target) as second:
+        first.write("first draft")
+        second.write("second draft")
+        assert first.tmp_path != second.tmp_path
+
+        first.commit("first")
+        second.commit("second")
+
+    assert target.read_text(encoding="utf-8") == "second"
+    assert list(tmp_path.iterdir()) == [target]
+
+
+def test_streaming_writer_keeps_partial_on_crash(tmp_path):
+    target = tmp_path / "ac.md"
+
+    with pytest.raises(RuntimeError):
+        with StreamingFileWriter(target) as writer:
+            writer.write("half")
+            raise RuntimeError("generation failed")
+
+    assert not target.exists()
+    assert writer.tmp_path.read_text(encoding="utf-8") == "half"
+
+
+def test_refused_streaming_commit_leaves_no_partial(tmp_path):
+    target = tmp_path / "ac.md"
+
+    def refuse(path):
+        raise PermissionError(f"Not writing {path.name}")
+
+    with pytest.raises(PermissionError):
+        with guard_writes(refuse), StreamingFileWriter(target) as writer:
+            writer.write("streamed")
+            writer.commit("final")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_disabled_streaming_writer_writes_nothing(tmp_path):
+    with StreamingFileWriter(None) as writer:
+        writer.write("ignored")
+        assert writer.commit("ignored") is None
+
+    assert list(tmp_path.iterdir()) == []
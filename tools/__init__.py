@@ -4,9 +4,18 @@ Tools package for agent workflows.
 
 from .file_retrieval import (
     get_idea_file,
+    get_idea_section,
     get_story_file,
+    get_story_section,
     list_idea_files,
     list_story_files,
 )
 
-__all__ = ["get_idea_file", "get_story_file", "list_idea_files", "list_story_files"]
+__all__ = [
+    "get_idea_file",
+    "get_idea_section",
+    "get_story_file",
+    "get_story_section",
+    "list_idea_files",
+    "list_story_files",
+]
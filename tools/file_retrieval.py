@@ -3,15 +3,154 @@ File retrieval tools for agent workflows.
 
 These tools allow agents to retrieve context from data directories
 (ideas, stories, acceptance criteria, etc.)
+
+Lookups go through the shared artifact index instead of globbing the data
+directory on every call. Large files are never returned whole: the file
+tools return the first MAX_TOOL_READ_BYTES plus an outline, and the section
+tools read a single Markdown section or byte range from a memory-mapped file.
+File content inlined into prompts (--direct) is capped the same way.
 """
 
-from pathlib import Path
+import os
 from typing import Literal
 from langchain_core.tools import tool
 
+from artifacts.index import DATA_DIR, get_index
+from artifacts.sections import find_section, format_outline, read_range
+
+
+# Most bytes of a file returned by one tool call (override with
+# SDLC_MAX_TOOL_READ_BYTES)
+MAX_TOOL_READ_BYTES = int(os.environ.get("SDLC_MAX_TOOL_READ_BYTES", 256 * 1024))
+
+# Section tool named in the truncation note of each kind of file
+SECTION_TOOLS = {"ideas": "get_idea_section", "stories": "get_story_section"}
+
+
+def read_data_file(kind: Literal["ideas", "stories"], filename: str) -> str | None:
+    """
+    Read a data file directly, without going through the agent tools.
+
+    Used where the whole file is needed (e.g., to split a story into
+    scenarios); prompts inline read_file_context() instead.
+
+    Args:
+        kind: Data subdirectory ("ideas" or "stories")
+        filename: Name of the file
+
+    Returns:
+        Content of the file, or None if it does not exist or cannot be read
+    """
+    try:
+        return get_index().read(kind, filename)
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def read_file_context(kind: Literal["ideas", "stories"], filename: str) -> str | None:
+    """
+    Read a data file for inlining into an agent prompt.
+
+    Large files are capped like the file tools: the first MAX_TOOL_READ_BYTES
+    followed by a truncation note and the file's outline, so the agent can
+    fetch other parts with the section tools.
+
+    Args:
+        kind: Data subdirectory ("ideas" or "stories")
+        filename: Name of the file
+
+    Returns:
+        Content of the file, or None if it does not exist or cannot be read
+    """
+    try:
+        return _read_for_tool(kind, filename, SECTION_TOOLS[kind])
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def with_file_context(prompt: str, filename: str, content: str) -> str:
+    """
+    Inline a file's content into a prompt so no tool call is needed to fetch it.
+
+    The file comes first and the task instruction last, so requests sharing
+    the start of a file (e.g., one per scenario of the same story) share a
+    cacheable prefix with the provider.
+
+    Args:
+        prompt: Task instruction for the agent
+        filename: Name of the file the content came from
+        content: Content of the file
+
+    Returns:
+        Prompt with the file content inlined
+    """
+    return (
+        f"<file name=\"{filename}\">\n{content}\n</file>\n\n"
+        f"The content of {filename} is provided above, so there is no need to "
+        f"retrieve it with a tool.\n\n"
+        f"{prompt}"
+    )
+
+
+def _read_for_tool(
+    kind: Literal["ideas", "stories"], filename: str, section_tool: str
+) -> str:
+    """Whole file content, or its first MAX_TOOL_READ_BYTES plus an outline"""
+    index = get_index()
+    size = index.size(kind, filename)
+
+    if size is None or size <= MAX_TOOL_READ_BYTES:
+        return index.read(kind, filename)
+
+    head = read_range(index.path(kind, filename), 0, MAX_TOOL_READ_BYTES)
+    return (
+        f"{head}\n\n"
+        f"[File truncated: showing the first {MAX_TOOL_READ_BYTES} of {size} bytes. "
+        f"Use {section_tool} with a heading or byte range to read other parts.]\n\n"
+        f"{format_outline(index.outline(kind, filename), size)}"
+    )
 
-# Base directory for data files
-DATA_DIR = Path(__file__).parent.parent / "data"
+
+def _read_section(
+    kind: Literal["ideas", "stories"],
+    filename: str,
+    heading: str | None,
+    start: int | None,
+    end: int | None,
+) -> str:
+    """Shared implementation of the section tools"""
+    index = get_index()
+    path = index.path(kind, filename)
+
+    if path is None:
+        files_list = "\n".join(index.names(kind)) or "None"
+        return f"Error: File '{filename}' not found.\n\nAvailable files:\n{files_list}"
+
+    size = index.size(kind, filename) or 0
+    sections = index.outline(kind, filename)
+
+    if heading:
+        section = find_section(sections, heading)
+        if section is None:
+            return (
+                f"Error: No heading matching '{heading}' in {filename}.\n\n"
+                f"{format_outline(sections, size)}"
+            )
+        start, end = section["start"], section["end"]
+    elif start is None and end is None:
+        return format_outline(sections, size)
+
+    start = max(0, start or 0)
+    end = size if end is None else min(end, size)
+    limit = min(end, start + MAX_TOOL_READ_BYTES)
+    text = read_range(path, start, limit)
+
+    if limit < end:
+        text += (
+            f"\n\n[Truncated at byte {limit}; call again with start={limit} "
+            f"and end={end} for the rest]"
+        )
+    return text
 
 
 @tool
@@ -25,17 +164,14 @@ def get_idea_file(filename: str) -> str:
     Returns:
         Content of the idea file as a string
     """
-    file_path = DATA_DIR / "ideas" / filename
+    index = get_index()
 
-    if not file_path.exists():
-        available_files = list((DATA_DIR / "ideas").glob("*.md"))
-        files_list = "\n".join([f.name for f in available_files])
+    if not index.exists("ideas", filename):
+        files_list = "\n".join(index.names("ideas"))
         return f"Error: File '{filename}' not found.\n\nAvailable files:\n{files_list}"
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return content
+        return _read_for_tool("ideas", filename, SECTION_TOOLS["ideas"])
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
@@ -51,19 +187,71 @@ def get_story_file(filename: str) -> str:
     Returns:
         Content of the story file as a string
     """
-    file_path = DATA_DIR / "stories" / filename
+    index = get_index()
 
-    if not file_path.exists():
-        available_files = list((DATA_DIR / "stories").glob("*.md"))
-        files_list = (
-            "\n".join([f.name for f in available_files]) if available_files else "None"
-        )
+    if not index.exists("stories", filename):
+        available_files = index.names("stories")
+        files_list = "\n".join(available_files) if available_files else "None"
         return f"Error: File '{filename}' not found.\n\nAvailable files:\n{files_list}"
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
-        return content
+        return _read_for_tool("stories", filename, SECTION_TOOLS["stories"])
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
+
+@tool
+def get_idea_section(
+    filename: str,
+    heading: str | None = None,
+    start: int | None = None,
+    end: int | None = None,
+) -> str:
+    """
+    Read part of a feature idea file: one Markdown section or a byte range.
+
+    Call with only a filename to get the file's outline (headings with byte
+    ranges). Use this instead of get_idea_file for large files.
+
+    Args:
+        filename: Name of the idea file (e.g., "01-feat-pagination.md")
+        heading: Heading of the section to read, including its subsections
+        start: First byte of the range to read
+        end: Byte after the last one to read (default: end of file)
+
+    Returns:
+        Section or range text, or the outline
+    """
+    try:
+        return _read_section("ideas", filename, heading, start, end)
+    except Exception as e:
+        return f"Error reading file: {str(e)}"
+
+
+@tool
+def get_story_section(
+    filename: str,
+    heading: str | None = None,
+    start: int | None = None,
+    end: int | None = None,
+) -> str:
+    """
+    Read part of a user story file: one Markdown section or a byte range.
+
+    Call with only a filename to get the file's outline (headings with byte
+    ranges). Use this instead of get_story_file for large files.
+
+    Args:
+        filename: Name of the story file (e.g., "01-pagination-stories.md")
+        heading: Heading of the section to read, including its subsections
+        start: First byte of the range to read
+        end: Byte after the last one to read (default: end of file)
+
+    Returns:
+        Section or range text, or the outline
+    """
+    try:
+        return _read_section("stories", filename, heading, start, end)
     except Exception as e:
         return f"Error reading file: {str(e)}"
 
@@ -81,12 +269,12 @@ def list_idea_files() -> str:
     if not ideas_dir.exists():
         return "Ideas directory not found"
 
-    files = sorted(ideas_dir.glob("*.md"))
+    files = get_index().names("ideas")
 
     if not files:
         return "No idea files found"
 
-    return "\n".join([f.name for f in files])
+    return "\n".join(files)
 
 
 @tool
@@ -102,9 +290,9 @@ def list_story_files() -> str:
     if not stories_dir.exists():
         return "Stories directory not found"
 
-    files = sorted(stories_dir.glob("*.md"))
+    files = get_index().names("stories")
 
     if not files:
         return "No story files found"
 
-    return "\n".join([f.name for f in files])
+    return "\n".join(files)
@@ -4,15 +4,18 @@ User Story Writer Agent
 This agent generates Gherkin user stories from feature idea files.
 
 Usage:
-    from examples.user_story.agent import agent, generate_stories
+    from examples.user_story.agent import get_agent, generate_stories
     from langchain_core.messages import HumanMessage
 
     # Simple usage with convenience function
     result = generate_stories("02-feat-refresh-button.md", save_output=True)
     print(result["content"])
 
+    # Async usage (one event loop can drive many generations)
+    result = await agenerate_stories("02-feat-refresh-button.md", save_output=True)
+
     # Direct agent invocation
-    result = agent.invoke({
+    result = get_agent().invoke({
         "messages": [
             HumanMessage(content="Generate user stories for 02-feat-refresh-button.md")
         ],
@@ -21,6 +24,19 @@ Usage:
     })
 """
 
-from .agent import agent, generate_stories
+import importlib
+
+__all__ = [
+    "get_agent",
+    "generate_stories",
+    "agenerate_stories",
+    "stream_stories",
+    "astream_stories",
+]
+
 
-__all__ = ["agent", "generate_stories"]
+def __getattr__(name: str):
+    # Import the agent module on first use so `python -m ... --help` stays fast
+    if name in __all__:
+        return getattr(importlib.import_module(".agent", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -8,17 +8,15 @@ Usage:
 
 import argparse
 import sys
-from pathlib import Path
 
-from .agent import generate_stories
+from artifacts.index import get_index
 
 
 def find_idea_file(prefix: str) -> str:
     """Find idea file matching the prefix"""
-    ideas_dir = Path(__file__).parent.parent / "data" / "ideas"
-    pattern = f"{prefix}*.md"
-
-    matches = list(ideas_dir.glob(pattern))
+    index = get_index()
+    ideas_dir = index.data_dir / "ideas"
+    matches = index.find("ideas", prefix)
 
     if not matches:
         print(f"❌ No idea files found matching '{prefix}' in {ideas_dir}")
@@ -27,13 +25,37 @@ def find_idea_file(prefix: str) -> str:
     if len(matches) > 1:
         print(f"⚠️  Multiple files found matching '{prefix}':")
         for m in matches:
-            print(f"   - {m.name}")
-        print(f"Using: {matches[0].name}")
+            print(f"   - {m}")
+        print(f"Using: {matches[0]}")
 
-    return matches[0].name
+    return matches[0]
 
 
-if __name__ == "__main__":
+def print_token(token: str) -> None:
+    """Print a streamed token without buffering"""
+    print(token, end="", flush=True)
+
+
+def print_summary(result: dict) -> None:
+    """Print where the output was saved and cache counters"""
+    print(f"\n✅ Generated stories")
+
+    if result.get("output_file"):
+        print(f"📁 Saved to: {result['output_file']}")
+
+    from runtime.cache import get_cache
+
+    cache_stats = get_cache().stats()
+    print(f"💾 Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
         description="Generate Gherkin user stories from feature ideas"
     )
@@ -44,8 +66,26 @@ if __name__ == "__main__":
     parser.add_argument(
         "--no-save", action="store_true", help="Don't save output to file"
     )
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="Inject file content into the prompt instead of fetching it with a tool",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print the output only after generation finishes",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the LLM response cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LLM responses and store fresh ones",
+    )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Find the file
     if args.file_prefix.endswith(".md"):
@@ -55,25 +95,56 @@ if __name__ == "__main__":
         # Prefix provided, find matching file
         filename = find_idea_file(args.file_prefix)
 
+    # Deferred so `--help` and lookup errors never load LangChain or build models
+    from runtime.cache import configure_cache
+
+    from .agent import generate_stories, stream_stories
+
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh)
+
     print("=" * 70)
     print("User Story Writer Agent")
     print("=" * 70)
     print(f"File: {filename}")
     print("-" * 70)
 
-    # Generate user stories
-    result = generate_stories(filename, save_output=not args.no_save)
+    if args.no_stream:
+        # Generate, then print the full output
+        result = generate_stories(
+            filename, save_output=not args.no_save, direct_context=args.direct
+        )
+        print_summary(result)
+
+        print("\n" + "=" * 70)
+        print("Generated User Stories:")
+        print("=" * 70)
+        print()
+        print(result["content"])
+    else:
+        # Stream tokens to the terminal (and to disk) as they arrive
+        print("\n" + "=" * 70)
+        print("Generated User Stories:")
+        print("=" * 70)
+        print()
+        result = stream_stories(
+            filename,
+            save_output=not args.no_save,
+            direct_context=args.direct,
+            on_token=print_token,
+        )
+        print()
+        print_summary(result)
 
-    print(f"\n✅ Generated stories")
+    print("\n" + "=" * 70)
+    print("\nComplete!")
 
-    if result.get("output_file"):
-        print(f"📁 Saved to: {result['output_file']}")
 
-    print("\n" + "=" * 70)
-    print("Generated User Stories:")
-    print("=" * 70)
-    print()
-    print(result["content"])
+if __name__ == "__main__":
+    # Hand the invocation to a running daemon if there is one (see server/)
+    from server.client import run_remote
 
-    print("\n" + "=" * 70)
-    print("\nComplete!")
+    code = run_remote("user_story", sys.argv[1:])
+    if code is None:
+        main()
+    else:
+        sys.exit(code)
@@ -5,43 +5,69 @@ Generates Gherkin user stories from feature idea files.
 Follows a simple agentic pattern for educational purposes.
 
 Usage:
-    from examples.user_story.agent import agent
+    from examples.user_story.agent import get_agent
     from langchain_core.messages import HumanMessage
 
-    result = agent.invoke({
+    result = get_agent().invoke({
         "messages": [HumanMessage(content="Generate user stories for 02-feat-refresh-button.md")]
     })
 """
 
 import operator
 from pathlib import Path
-from typing import Annotated, Literal
+from typing import Annotated, Callable, Literal
 
-from dotenv import load_dotenv
 from langchain_core.messages import AnyMessage, HumanMessage, SystemMessage, ToolMessage
-from langchain_openai import ChatOpenAI
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import TypedDict
 
 from tools.file_retrieval import (
     get_idea_file,
+    get_idea_section,
     get_story_file,
+    get_story_section,
     list_idea_files,
     list_story_files,
+    read_file_context,
+    with_file_context,
 )
-from nodes import should_continue_on_tool_calls, create_tool_executor
+from artifacts.index import DATA_DIR, get_index
+from artifacts.writer import StreamingFileWriter, write_atomic
+from evals.repair import aapply_gates, apply_gates
+from nodes import (
+    should_continue_on_tool_calls,
+    create_tool_executor,
+    create_llm_node,
+    prefix_cache_key,
+)
+from runtime.clients import get_chat_model
+from runtime.singleflight import (
+    decode_response,
+    encode_response,
+    flight_key,
+    get_single_flight,
+)
+from runtime.streaming import astream_agent, stream_agent
 from .prompts import SYSTEM_PROMPT
 
-load_dotenv()
 
+# Output directory for generated stories
+STORIES_DIR = DATA_DIR / "stories"
 
-# Initialize the LLM
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0)
+
+# LLM settings (the client comes from the shared registry, see get_model)
+MODEL_NAME = "gpt-4o-mini"
 
 # Define available tools
-tools = [get_idea_file, list_idea_files, get_story_file, list_story_files]
+tools = [
+    get_idea_file,
+    get_idea_section,
+    list_idea_files,
+    get_story_file,
+    get_story_section,
+    list_story_files,
+]
 tools_by_name = {tool.name: tool for tool in tools}
-model_with_tools = model.bind_tools(tools)
 
 
 # Define state
@@ -54,47 +80,134 @@ class UserStoryState(TypedDict):
     story_generated: bool
 
 
-# Define model node
+# Use the generic routing function
+should_continue = should_continue_on_tool_calls
+
+
+# Build agent
 
 
-def llm_call(state: UserStoryState):
-    """LLM decides whether to call a tool or generate user stories"""
+def build_agent(chat_model):
+    """
+    Build and compile the agent graph around a chat model.
 
-    messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
+    Args:
+        chat_model: Chat model supporting bind_tools (e.g., ChatOpenAI or a
+            fake model for offline benchmarks)
 
-    return {
-        "messages": [model_with_tools.invoke(messages)],
-    }
+    Returns:
+        Compiled agent graph
+    """
+    model_with_tools = chat_model.bind_tools(tools)
 
+    # LLM decides whether to call a tool or generate user stories (responses are cached)
+    llm_call = create_llm_node(
+        model_with_tools,
+        SYSTEM_PROMPT,
+        prompt_cache_key=prefix_cache_key("user_story", SYSTEM_PROMPT),
+    )
 
-# Define tool node
+    # Create tool executor using the factory function
+    tool_node = create_tool_executor(tools_by_name)
 
-# Create tool executor using the factory function
-tool_node = create_tool_executor(tools_by_name)
+    # Build workflow
+    agent_builder = StateGraph(UserStoryState)
 
+    # Add nodes
+    agent_builder.add_node("llm_call", llm_call)
+    agent_builder.add_node("tool_node", tool_node)
 
-# Define routing logic
+    # Add edges to connect nodes
+    agent_builder.add_edge(START, "llm_call")
+    agent_builder.add_conditional_edges("llm_call", should_continue, ["tool_node", END])
+    agent_builder.add_edge("tool_node", "llm_call")
 
-# Use the generic routing function
-should_continue = should_continue_on_tool_calls
+    return agent_builder.compile()
 
 
-# Build agent
+def build_repairer(chat_model):
+    """
+    Build the LLM node that repairs scenarios failing the eval gates.
+
+    It sends the same tools and system prompt as the agent, so repair calls
+    reuse the agent's cached request prefix.
 
-# Build workflow
-agent_builder = StateGraph(UserStoryState)
+    Args:
+        chat_model: Chat model supporting bind_tools
+
+    Returns:
+        LLM node runnable (see create_llm_node)
+    """
+    return create_llm_node(
+        chat_model.bind_tools(tools),
+        SYSTEM_PROMPT,
+        prompt_cache_key=prefix_cache_key("user_story", SYSTEM_PROMPT),
+    )
 
-# Add nodes
-agent_builder.add_node("llm_call", llm_call)
-agent_builder.add_node("tool_node", tool_node)
 
-# Add edges to connect nodes
-agent_builder.add_edge(START, "llm_call")
-agent_builder.add_conditional_edges("llm_call", should_continue, ["tool_node", END])
-agent_builder.add_edge("tool_node", "llm_call")
+# Agent compiled on first use so that imports, `--help` and error paths stay fast
+_agent = None
+_repairer = None
 
-# Compile the agent
-agent = agent_builder.compile()
+
+def get_model():
+    """
+    Return the chat model shared with every other agent in the process.
+
+    Returns:
+        ChatOpenAI instance for MODEL_NAME using the shared connection pool
+    """
+    # stream_usage keeps token usage available to metrics when streaming
+    return get_chat_model(MODEL_NAME, temperature=0, stream_usage=True)
+
+
+def get_agent():
+    """
+    Return the compiled agent, building it on first use.
+
+    Returns:
+        Compiled agent graph
+    """
+    global _agent
+    if _agent is None:
+        _agent = build_agent(get_model())
+
+    return _agent
+
+
+def get_repairer():
+    """
+    Return the eval-gate repair node, building it on first use.
+
+    Returns:
+        LLM node runnable
+    """
+    global _repairer
+    if _repairer is None:
+        _repairer = build_repairer(get_model())
+
+    return _repairer
+
+
+def use_model(chat_model) -> None:
+    """
+    Rebuild the agent (and its repair node) around a different chat model.
+
+    Args:
+        chat_model: Chat model supporting bind_tools
+    """
+    global _agent, _repairer
+    _agent = build_agent(chat_model)
+    _repairer = build_repairer(chat_model)
+
+
+def __getattr__(name: str):
+    # Keep `from ... import agent` / `model` working without eager construction
+    if name == "agent":
+        return get_agent()
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # Utility functions
@@ -111,42 +224,60 @@ def save_story_to_file(content: str, filename: str) -> str:
     Returns:
         Path to saved file
     """
-    stories_dir = Path(__file__).parent.parent / "data" / "stories"
-    stories_dir.mkdir(parents=True, exist_ok=True)
+    STORIES_DIR.mkdir(parents=True, exist_ok=True)
 
-    output_path = stories_dir / filename
-
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(content)
+    output_path = STORIES_DIR / filename
+    write_atomic(output_path, content)
 
     return str(output_path)
 
 
-def generate_stories(idea_filename: str, save_output: bool = True) -> dict:
+def story_output_filename(idea_filename: str) -> str:
     """
-    Generate user stories for a feature idea file.
+    Derive the stories filename for an idea file.
 
     Args:
         idea_filename: Name of the idea file (e.g., "02-feat-refresh-button.md")
-        save_output: Whether to save the output to a file
 
     Returns:
-        Dictionary with:
-        - content: Generated user story content
-        - output_file: Path to saved file (if save_output=True)
+        Name of the stories file (e.g., "02-refresh-button-stories.md")
     """
-    # Invoke the agent
-    result = agent.invoke(
-        {
-            "messages": [
-                HumanMessage(
-                    content=f"Generate Gherkin user stories for the feature in {idea_filename}"
-                )
-            ],
-            "story_generated": False,
-        }
-    )
+    return idea_filename.replace("feat-", "").replace(".md", "-stories.md")
 
+
+def story_prompt(idea_filename: str, direct_context: bool = False) -> str:
+    """
+    Build the user prompt asking for stories for a feature idea file.
+
+    Args:
+        idea_filename: Name of the idea file (e.g., "02-feat-refresh-button.md")
+        direct_context: Inline the idea content (left out if the file cannot
+            be read, so the agent falls back to tool retrieval)
+
+    Returns:
+        Prompt text
+    """
+    prompt = f"Generate Gherkin user stories for the feature in {idea_filename}"
+
+    # Pre-seed the idea content to skip the tool-calling round trip
+    if direct_context:
+        content = read_file_context("ideas", idea_filename)
+        if content is not None:
+            prompt = with_file_context(prompt, idea_filename, content)
+
+    return prompt
+
+
+def _build_input(idea_filename: str, direct_context: bool = False) -> dict:
+    """Build the initial agent state for a feature idea file"""
+    return {
+        "messages": [HumanMessage(content=story_prompt(idea_filename, direct_context))],
+        "story_generated": False,
+    }
+
+
+def _build_response(result: dict, idea_filename: str, save_output: bool) -> dict:
+    """Extract the generated stories from the agent result and optionally save them"""
     # Extract the final user story content (last message from assistant)
     story_content = None
     for msg in reversed(result["messages"]):
@@ -161,15 +292,192 @@ def generate_stories(idea_filename: str, save_output: bool = True) -> dict:
     response = {
         "content": story_content,
         "messages": result["messages"],
+        "validation": result.get("validation"),
     }
 
     # Save to file if requested
     if save_output and story_content:
-        # Generate output filename from input filename
-        output_filename = idea_filename.replace("feat-", "").replace(
-            ".md", "-stories.md"
-        )
+        output_filename = story_output_filename(idea_filename)
         output_path = save_story_to_file(story_content, output_filename)
         response["output_file"] = output_path
 
     return response
+
+
+def _flight(idea_filename: str, save_output: bool, direct_context: bool) -> dict:
+    """
+    Coalescing arguments for a generation (see runtime.singleflight).
+
+    Identical requests (same idea content, prompt, model and options) that
+    run at the same time are generated once, and generations writing the
+    same stories file never run at once. Missing idea files get no key.
+    """
+    path = get_index().path("ideas", idea_filename)
+    if path is None:
+        return {"key": None}
+
+    key = flight_key(
+        "user_story",
+        SYSTEM_PROMPT,
+        MODEL_NAME,
+        str(path),
+        files=[path],
+        save_output=save_output,
+        direct_context=direct_context,
+    )
+    output_path = STORIES_DIR / story_output_filename(idea_filename)
+    return {
+        "key": key,
+        "encode": encode_response,
+        "decode": decode_response,
+        "resource": output_path if save_output else None,
+    }
+
+
+def generate_stories(
+    idea_filename: str, save_output: bool = True, direct_context: bool = False
+) -> dict:
+    """
+    Generate user stories for a feature idea file.
+
+    Args:
+        idea_filename: Name of the idea file (e.g., "02-feat-refresh-button.md")
+        save_output: Whether to save the output to a file
+        direct_context: Inject the idea content into the prompt instead of
+            letting the model fetch it with a tool call
+
+    Returns:
+        Dictionary with:
+        - content: Generated user story content
+        - validation: Eval gate report (see evals.gherkin.validate)
+        - output_file: Path to saved file (if save_output=True)
+    """
+
+    def run() -> dict:
+        result = get_agent().invoke(_build_input(idea_filename, direct_context))
+        result = apply_gates(result, "stories", get_repairer(), idea_filename)
+        return _build_response(result, idea_filename, save_output)
+
+    flight = _flight(idea_filename, save_output, direct_context)
+    response, _ = get_single_flight().do(fn=run, **flight)
+    return dict(response)
+
+
+async def agenerate_stories(
+    idea_filename: str, save_output: bool = True, direct_context: bool = False
+) -> dict:
+    """
+    Async variant of generate_stories that drives the agent with ainvoke.
+
+    Args:
+        idea_filename: Name of the idea file (e.g., "02-feat-refresh-button.md")
+        save_output: Whether to save the output to a file
+        direct_context: Inject the idea content into the prompt
+
+    Returns:
+        Same dictionary as generate_stories
+    """
+
+    async def run() -> dict:
+        agent_input = _build_input(idea_filename, direct_context)
+        result = await get_agent().ainvoke(agent_input)
+        result = await aapply_gates(result, "stories", get_repairer(), idea_filename)
+        return _build_response(result, idea_filename, save_output)
+
+    flight = _flight(idea_filename, save_output, direct_context)
+    response, _ = await get_single_flight().ado(afn=run, **flight)
+    return dict(response)
+
+
+def stream_stories(
+    idea_filename: str,
+    save_output: bool = True,
+    direct_context: bool = False,
+    on_token: Callable[[str], None] | None = None,
+) -> dict:
+    """
+    Generate user stories, streaming tokens to a callback and to disk.
+
+    Tokens are written to a partial file as they arrive; the file is renamed
+    into place once generation completes (and kept for inspection on a crash).
+    A caller that joins an identical generation already in flight receives
+    the finished content as a single token.
+
+    Args:
+        idea_filename: Name of the idea file (e.g., "02-feat-refresh-button.md")
+        save_output: Whether to save the output to a file
+        direct_context: Inject the idea content into the prompt
+        on_token: Called with each generated token (e.g., to print it)
+
+    Returns:
+        Same dictionary as generate_stories
+    """
+    output_path = STORIES_DIR / story_output_filename(idea_filename)
+
+    def run() -> dict:
+        with StreamingFileWriter(output_path if save_output else None) as writer:
+
+            def handle_token(token: str) -> None:
+                writer.write(token)
+                if on_token:
+                    on_token(token)
+
+            result = stream_agent(
+                get_agent(),
+                _build_input(idea_filename, direct_context),
+                on_token=handle_token,
+                on_message_start=writer.reset,
+            )
+            result = apply_gates(result, "stories", get_repairer(), idea_filename)
+            response = _build_response(result, idea_filename, save_output=False)
+
+            if save_output and response["content"]:
+                response["output_file"] = writer.commit(response["content"])
+
+        return response
+
+    flight = _flight(idea_filename, save_output, direct_context)
+    response, shared = get_single_flight().do(fn=run, **flight)
+    if shared and on_token and response["content"]:
+        on_token(response["content"])
+    return dict(response)
+
+
+async def astream_stories(
+    idea_filename: str,
+    save_output: bool = True,
+    direct_context: bool = False,
+    on_token: Callable[[str], None] | None = None,
+) -> dict:
+    """Async variant of stream_stories built on astream"""
+    output_path = STORIES_DIR / story_output_filename(idea_filename)
+
+    async def run() -> dict:
+        with StreamingFileWriter(output_path if save_output else None) as writer:
+
+            def handle_token(token: str) -> None:
+                writer.write(token)
+                if on_token:
+                    on_token(token)
+
+            result = await astream_agent(
+                get_agent(),
+                _build_input(idea_filename, direct_context),
+                on_token=handle_token,
+                on_message_start=writer.reset,
+            )
+            result = await aapply_gates(
+                result, "stories", get_repairer(), idea_filename
+            )
+            response = _build_response(result, idea_filename, save_output=False)
+
+            if save_output and response["content"]:
+                response["output_file"] = writer.commit(response["content"])
+
+        return response
+
+    flight = _flight(idea_filename, save_output, direct_context)
+    response, shared = await get_single_flight().ado(afn=run, **flight)
+    if shared and on_token and response["content"]:
+        on_token(response["content"])
+    return dict(response)
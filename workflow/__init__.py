@@ -4,6 +4,28 @@ Complete SDLC Workflow
 Orchestrates: Feature Idea → User Stories → Acceptance Criteria
 """
 
-from .agent import workflow, run_workflow
+import importlib
 
-__all__ = ["workflow", "run_workflow"]
+# Public names and the submodule defining each (imported on first use so
+# `python -m workflow --help` does not build models or graphs)
+_EXPORTS = {
+    "workflow": ".agent",
+    "get_workflow": ".agent",
+    "run_workflow": ".agent",
+    "arun_workflow": ".agent",
+    "run_batch": ".batch",
+    "arun_batch": ".batch",
+    "run_pipeline": ".pipeline",
+    "arun_pipeline": ".pipeline",
+    "run_workers": ".workers",
+    "run_queue_worker": ".queue_worker",
+    "get_queue": ".jobqueue",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
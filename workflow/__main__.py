@@ -2,28 +2,361 @@
 Entry point for running the complete SDLC workflow.
 
 Usage:
-    python -m workflow 01       # Run complete workflow for file 01
-    python -m workflow 02       # Run complete workflow for file 02
+    python -m workflow 01                  # Run complete workflow for file 01
+    python -m workflow 02                  # Run complete workflow for file 02
+    python -m workflow 01 02 03            # Run a batch of files concurrently
+    python -m workflow --all               # Run every idea file in data/ideas
+    python -m workflow --glob "0*.md"      # Run every idea file matching a glob
+    python -m workflow --all --pipeline    # Overlap stories and AC across files
+    python -m workflow --all --workers 8   # Spread features over 8 processes
+    python -m workflow --resume 20261018-153012-9f2c   # Continue an interrupted run
+    python -m workflow --all --rpm 500 --tpm 200000   # Pace calls to provider limits
+    python -m workflow --all --bulk        # Regenerate through the provider batch API
+    python -m workflow --all --enqueue     # Queue every feature on the shared volume
+    python -m workflow --worker            # Drain the shared queue (on any host)
 """
 
 import argparse
+import sys
 
-from .agent import run_workflow
 
-if __name__ == "__main__":
+def print_cache_stats() -> None:
+    """Print LLM response cache counters for this run"""
+    from runtime.cache import get_cache
+
+    cache_stats = get_cache().stats()
+    print(f"💾 Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+    print()
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run the command line interface.
+
+    Args:
+        argv: Arguments without the program name (default: sys.argv[1:])
+    """
     parser = argparse.ArgumentParser(
         description="Run complete SDLC workflow: Idea → Stories → AC"
     )
     parser.add_argument(
         "file_prefix",
-        help="File prefix (e.g., '01', '02') or full filename",
+        nargs="*",
+        help="File prefix(es) (e.g., '01', '02') or full filename(s)",
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="Run the workflow for every idea file"
+    )
+    parser.add_argument(
+        "--glob", metavar="PATTERN", help="Run the workflow for idea files matching a glob"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="Maximum number of workflows in flight in batch mode (default: 4)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Batch mode: run features in N worker processes, each with up to "
+        "--max-concurrency workflows in flight",
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Batch mode: overlap stages across features with one worker pool per stage",
+    )
+    parser.add_argument(
+        "--story-workers",
+        type=int,
+        default=2,
+        help="Pipeline mode: features in the stories stage at once (default: 2)",
+    )
+    parser.add_argument(
+        "--ac-workers",
+        type=int,
+        default=4,
+        help="Pipeline mode: features in the AC stage at once (default: 4)",
+    )
+    parser.add_argument(
+        "--buffer",
+        type=int,
+        help="Pipeline mode: finished stories waiting for AC before story "
+        "workers pause (default: --ac-workers)",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Submit all prompts as provider batch jobs (stories, then AC) and "
+        "wait for them instead of calling the model interactively",
+    )
+    parser.add_argument(
+        "--batch-backend",
+        metavar="NAME",
+        help="Bulk mode: batch backend, 'openai' or 'local' "
+        "(default: $SDLC_BATCH_BACKEND or openai)",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=30.0,
+        help="Bulk mode: seconds between batch job status checks (default: 30)",
+    )
+    parser.add_argument(
+        "--enqueue",
+        action="store_true",
+        help="Add the selected features to the shared job queue instead of "
+        "running them",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Claim and run features from the shared job queue until it is empty",
+    )
+    parser.add_argument(
+        "--queue-status",
+        action="store_true",
+        help="Print the number of queued, leased, done and failed features",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every stage even if its inputs have not changed",
+    )
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        help="Inject file content into the prompt instead of fetching it with a tool",
+    )
+    parser.add_argument(
+        "--per-scenario",
+        action="store_true",
+        help="Generate AC for each story scenario concurrently",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="PATH",
+        help="Write per-node latency/token/cache events as JSON lines to PATH",
     )
+    parser.add_argument(
+        "--rpm",
+        type=float,
+        help="Provider request budget per minute (default: $SDLC_RPM or unlimited)",
+    )
+    parser.add_argument(
+        "--tpm",
+        type=float,
+        help="Provider token budget per minute (default: $SDLC_TPM or unlimited)",
+    )
+    parser.add_argument(
+        "--max-input-tokens",
+        type=int,
+        help="Input-token budget per LLM call; older tool results are elided and "
+        "oversized inputs cut to fit (default: $SDLC_MAX_INPUT_TOKENS or 100000)",
+    )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue an interrupted run from each feature's last completed node",
+    )
+    parser.add_argument(
+        "--no-checkpoint",
+        action="store_true",
+        help="Do not checkpoint this run (it cannot be resumed)",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Bypass the LLM response cache"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore cached LLM responses and store fresh ones",
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.enqueue and not (args.file_prefix or args.all or args.glob):
+        parser.error("--enqueue needs a file prefix, --all or --glob")
+    if not (
+        args.file_prefix
+        or args.all
+        or args.glob
+        or args.resume
+        or args.worker
+        or args.queue_status
+    ):
+        parser.error(
+            "provide a file prefix, --all, --glob, --resume, --worker or --queue-status"
+        )
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers and args.pipeline:
+        parser.error("--workers and --pipeline cannot be combined")
+
+    # Deferred so `--help` and usage errors never load LangChain or build graphs
+    from runtime.cache import configure_cache
+    from runtime.context import configure_context_budget
+    from runtime.ratelimit import configure_rate_limiter
+
+    from .agent import run_workflow
+    from .batch import collect_idea_files, run_batch
+    from .checkpoint import load_run, start_run
+    from .pipeline import run_pipeline
+
+    configure_cache(enabled=not args.no_cache, refresh=args.refresh)
+    configure_rate_limiter(requests_per_minute=args.rpm, tokens_per_minute=args.tpm)
+    configure_context_budget(max_input_tokens=args.max_input_tokens)
 
-    args = parser.parse_args()
+    if args.bulk:
+        # Offline regeneration: two batch jobs instead of interactive agent runs
+        from runtime.batch_api import get_batch_backend
 
-    # Run the complete workflow
-    result = run_workflow(args.file_prefix)
+        from .bulk import run_bulk
+
+        if args.resume:
+            parser.error("--bulk runs are not checkpointed and cannot be resumed")
+        try:
+            backend = get_batch_backend(args.batch_backend)
+        except ValueError as e:
+            parser.error(str(e))
+
+        try:
+            report = run_bulk(
+                collect_idea_files(args.file_prefix, args.glob, args.all),
+                backend=backend,
+                force=args.force,
+                poll_interval=args.poll_interval,
+            )
+        except TimeoutError as e:
+            print(f"❌ {e}")
+            exit(1)
+        exit(1 if report["stats"]["failed"] else 0)
+
+    if args.queue_status or args.enqueue:
+        # Work for queue workers on this or other hosts sharing the data tree
+        from .jobqueue import get_queue
+
+        queue = get_queue()
+        if args.enqueue:
+            filenames = collect_idea_files(args.file_prefix, args.glob, args.all)
+            added = queue.enqueue(
+                filenames,
+                {
+                    "force": args.force,
+                    "direct_context": args.direct,
+                    "per_scenario": args.per_scenario,
+                },
+                requeue=args.force,
+            )
+            print(f"📬 Queued {added} of {len(filenames)} features in {queue.path}")
+
+        counts = queue.counts()
+        print(
+            f"📬 Queue: {counts['pending']} pending, {counts['leased']} leased, "
+            f"{counts['done']} done, {counts['failed']} failed"
+        )
+        exit(0)
+
+    if args.worker:
+        from .queue_worker import run_queue_worker
+
+        report = run_queue_worker(max_concurrency=args.max_concurrency)
+        print_cache_stats()
+
+        if args.metrics:
+            report["metrics"].write_jsonl(args.metrics)
+        exit(1 if report["stats"]["failed"] else 0)
+
+    if args.resume:
+        # Same features and options as the original run
+        try:
+            run = load_run(args.resume)
+        except KeyError as e:
+            parser.error(e.args[0])
+
+        run_id = run["run_id"]
+        filenames = run["filenames"]
+        options = run["options"]
+        print(f"🔁 Resuming run {run_id} ({len(filenames)} features)")
+    else:
+        single = len(args.file_prefix) == 1 and not (args.all or args.glob)
+        filenames = (
+            args.file_prefix
+            if single
+            else collect_idea_files(args.file_prefix, args.glob, args.all)
+        )
+        options = {
+            "force": args.force,
+            "direct_context": args.direct,
+            "per_scenario": args.per_scenario,
+            "pipeline": args.pipeline,
+        }
+        run_id = None if args.no_checkpoint else start_run(filenames, options)
+        if run_id:
+            print(f"🔖 Run ID: {run_id}")
+            print(f"   Resume with: python -m workflow --resume {run_id}")
+
+    pipeline = options.pop("pipeline", False)
+    print()
+
+    if len(filenames) == 1 and not (args.all or args.glob or pipeline or args.workers):
+        # Run the complete workflow
+        result = run_workflow(filenames[0], run_id=run_id, **options)
+        print_cache_stats()
+
+        if args.metrics:
+            result["metrics"].write_jsonl(args.metrics)
+
+        # Exit with error code if workflow failed
+        if result.get("errors"):
+            exit(1)
+    else:
+        # Run the workflow for every selected file
+        if pipeline:
+            report = run_pipeline(
+                filenames,
+                story_workers=args.story_workers,
+                ac_workers=args.ac_workers,
+                buffer_size=args.buffer,
+                run_id=run_id,
+                **options,
+            )
+        elif args.workers:
+            from .workers import run_workers
+
+            report = run_workers(
+                filenames,
+                workers=args.workers,
+                max_concurrency=args.max_concurrency,
+                run_id=run_id,
+                **options,
+            )
+        else:
+            report = run_batch(
+                filenames,
+                max_concurrency=args.max_concurrency,
+                run_id=run_id,
+                **options,
+            )
+        print_cache_stats()
+
+        if args.metrics:
+            report["metrics"].write_jsonl(args.metrics)
+
+        # Exit with error code if any workflow failed
+        if report["stats"]["failed"]:
+            exit(1)
+
+
+if __name__ == "__main__":
+    # Hand the invocation to a running daemon if there is one (see server/)
+    from server.client import run_remote
 
-    # Exit with error code if workflow failed
-    if result.get("errors"):
-        exit(1)
+    code = run_remote("workflow", sys.argv[1:])
+    if code is None:
+        main()
+    else:
+        sys.exit(code)
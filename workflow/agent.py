@@ -11,11 +11,40 @@ from pathlib import Path
 from typing import Annotated
 
 from langchain_core.messages import AnyMessage
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from typing_extensions import TypedDict
 
-from user_story.agent import generate_stories
-from ac_writer.agent import generate_ac
+from user_story.agent import (
+    MODEL_NAME as STORY_MODEL,
+    STORIES_DIR,
+    agenerate_stories,
+    generate_stories,
+    story_output_filename,
+)
+from user_story.prompts import SYSTEM_PROMPT as STORY_PROMPT
+from ac_writer.agent import (
+    AC_DIR,
+    MODEL_NAME as AC_MODEL,
+    ac_output_filename,
+    agenerate_ac,
+    generate_ac,
+)
+from ac_writer.prompts import SCENARIO_PROMPT, SYSTEM_PROMPT as AC_PROMPT
+from artifacts.index import DATA_DIR, get_index
+from evals.gherkin import format_report
+from runtime.metrics import MetricsCallbackHandler, RunMetrics
+from .checkpoint import (
+    acheckpointer,
+    ainvoke_resumable,
+    checkpointer,
+    invoke_resumable,
+    thread_config,
+)
+from .manifest import fingerprint, is_up_to_date, write_manifest
+
+
+IDEAS_DIR = DATA_DIR / "ideas"
 
 
 # State Definition
@@ -31,27 +60,109 @@ class WorkflowState(TypedDict):
     stories_generated: bool
     ac_generated: bool
     errors: list[str]
+    force: bool
+    direct_context: bool
+    per_scenario: bool
+    stories_skipped: bool
+    ac_skipped: bool
 
 
 def find_idea_file(prefix: str) -> str:
     """Find idea file matching the prefix"""
-    ideas_dir = Path(__file__).parent.parent / "data" / "ideas"
-    pattern = f"{prefix}*.md"
-
-    matches = list(ideas_dir.glob(pattern))
+    matches = get_index().find("ideas", prefix)
 
     if not matches:
         raise FileNotFoundError(f"No idea files found matching '{prefix}'")
 
-    return matches[0].name
+    return matches[0]
+
+
+def _stories_target(state: WorkflowState) -> tuple[Path, dict]:
+    """Output path and input fingerprint of the stories stage"""
+    idea_path = IDEAS_DIR / state["idea_filename"]
+    story_path = STORIES_DIR / story_output_filename(state["idea_filename"])
+
+    return story_path, fingerprint([idea_path], STORY_PROMPT, STORY_MODEL)
+
+
+def _ac_target(state: WorkflowState) -> tuple[Path, dict]:
+    """Output path and input fingerprint of the AC stage"""
+    story_path = Path(state["story_filename"])
+    ac_path = AC_DIR / ac_output_filename(story_path.name, source_type="story")
+
+    # Per-scenario output is built from different requests than whole-file output
+    prompt = AC_PROMPT + SCENARIO_PROMPT if state.get("per_scenario") else AC_PROMPT
+
+    return ac_path, fingerprint([story_path], prompt, AC_MODEL)
+
+
+def _skip_stories(state: WorkflowState) -> dict | None:
+    """State update for an up-to-date stories stage, or None if it must run"""
+    try:
+        story_path, stage_fingerprint = _stories_target(state)
+    except OSError:
+        # A missing input is never up to date; the stage reports the error
+        return None
+
+    if state.get("force") or not is_up_to_date(story_path, stage_fingerprint):
+        return None
+
+    print(f"⏭️  User stories up to date: {story_path.name}")
+    return {
+        "story_filename": str(story_path),
+        "stories_generated": True,
+        "stories_skipped": True,
+        "errors": [],
+    }
+
+
+def _skip_ac(state: WorkflowState) -> dict | None:
+    """State update for an up-to-date AC stage, or None if it must run"""
+    try:
+        ac_path, stage_fingerprint = _ac_target(state)
+    except OSError:
+        # A missing input is never up to date; the stage reports the error
+        return None
+
+    if state.get("force") or not is_up_to_date(ac_path, stage_fingerprint):
+        return None
+
+    print(f"⏭️  Acceptance criteria up to date: {ac_path.name}")
+    return {
+        "ac_filename": str(ac_path),
+        "ac_generated": True,
+        "ac_skipped": True,
+    }
+
+
+def _report_gates(result: dict) -> None:
+    """Print the eval gate violations left in a generated output"""
+    report = result.get("validation")
+    if report and not report["passed"]:
+        print(f"🧪 Eval gates: {format_report(report)}")
+        for violation in report["violations"]:
+            print(f"   - {violation['block'] or 'Document'}: {violation['message']}")
 
 
 def generate_stories_node(state: WorkflowState) -> dict:
     """Node that generates user stories from the feature idea"""
+    skipped = _skip_stories(state)
+    if skipped:
+        return skipped
+
     print(f"📝 Generating user stories for: {state['idea_filename']}")
 
     try:
-        result = generate_stories(state["idea_filename"], save_output=True)
+        _, stage_fingerprint = _stories_target(state)
+        result = generate_stories(
+            state["idea_filename"],
+            save_output=True,
+            direct_context=state.get("direct_context", False),
+        )
+
+        _report_gates(result)
+        if result.get("output_file"):
+            write_manifest(Path(result["output_file"]), stage_fingerprint)
 
         return {
             "story_filename": result.get("output_file"),
@@ -75,6 +186,10 @@ def generate_ac_node(state: WorkflowState) -> dict:
             + ["Cannot generate AC: Stories not generated"],
         }
 
+    skipped = _skip_ac(state)
+    if skipped:
+        return skipped
+
     # Extract filename from full path
     story_path = Path(state["story_filename"])
     story_filename = story_path.name
@@ -82,7 +197,94 @@ def generate_ac_node(state: WorkflowState) -> dict:
     print(f"✅ Generating acceptance criteria from: {story_filename}")
 
     try:
-        result = generate_ac(story_filename, source_type="story", save_output=True)
+        _, stage_fingerprint = _ac_target(state)
+        result = generate_ac(
+            story_filename,
+            source_type="story",
+            save_output=True,
+            direct_context=state.get("direct_context", False),
+            per_scenario=state.get("per_scenario", False),
+        )
+
+        _report_gates(result)
+        if result.get("output_file"):
+            write_manifest(Path(result["output_file"]), stage_fingerprint)
+
+        return {
+            "ac_filename": result.get("output_file"),
+            "ac_generated": True,
+        }
+    except Exception as e:
+        return {
+            "ac_generated": False,
+            "errors": state.get("errors", []) + [f"Failed to generate AC: {str(e)}"],
+        }
+
+
+async def agenerate_stories_node(state: WorkflowState) -> dict:
+    """Async variant of generate_stories_node"""
+    skipped = _skip_stories(state)
+    if skipped:
+        return skipped
+
+    print(f"📝 Generating user stories for: {state['idea_filename']}")
+
+    try:
+        _, stage_fingerprint = _stories_target(state)
+        result = await agenerate_stories(
+            state["idea_filename"],
+            save_output=True,
+            direct_context=state.get("direct_context", False),
+        )
+
+        _report_gates(result)
+        if result.get("output_file"):
+            write_manifest(Path(result["output_file"]), stage_fingerprint)
+
+        return {
+            "story_filename": result.get("output_file"),
+            "stories_generated": True,
+            "errors": [],
+        }
+    except Exception as e:
+        return {
+            "stories_generated": False,
+            "errors": [f"Failed to generate stories: {str(e)}"],
+        }
+
+
+async def agenerate_ac_node(state: WorkflowState) -> dict:
+    """Async variant of generate_ac_node"""
+
+    if not state["stories_generated"]:
+        return {
+            "ac_generated": False,
+            "errors": state.get("errors", [])
+            + ["Cannot generate AC: Stories not generated"],
+        }
+
+    skipped = _skip_ac(state)
+    if skipped:
+        return skipped
+
+    # Extract filename from full path
+    story_filename = Path(state["story_filename"]).name
+
+    print(f"✅ Generating acceptance criteria from: {story_filename}")
+
+    try:
+        _, stage_fingerprint = _ac_target(state)
+        result = await agenerate_ac(
+            story_filename,
+            source_type="story",
+            save_output=True,
+            direct_context=state.get("direct_context", False),
+            per_scenario=state.get("per_scenario", False),
+        )
+
+        _report_gates(result)
+        if result.get("output_file"):
+            write_manifest(Path(result["output_file"]), stage_fingerprint)
 
         return {
             "ac_filename": result.get("output_file"),
@@ -98,39 +300,85 @@ def generate_ac_node(state: WorkflowState) -> dict:
 # Build Workflow Graph
 
 
-def build_workflow() -> StateGraph:
-    """Build the complete SDLC workflow graph"""
+# Workflow stages in execution order: name -> (sync node, async node)
+STAGES = {
+    "generate_stories": (generate_stories_node, agenerate_stories_node),
+    "generate_ac": (generate_ac_node, agenerate_ac_node),
+}
+
+
+def build_workflow(
+    stages: tuple[str, ...] = tuple(STAGES), checkpointer=None
+) -> StateGraph:
+    """
+    Build the SDLC workflow graph.
+
+    Args:
+        stages: Stages to chain, in order (default: Idea → Stories → AC).
+            A single stage builds a one-node graph, which the pipelined
+            scheduler uses to run each stage on its own worker pool.
+        checkpointer: LangGraph checkpointer for resumable runs; agent
+            subgraphs invoked by the nodes inherit it
+
+    Returns:
+        Compiled workflow graph
+    """
 
     graph = StateGraph(WorkflowState)
 
-    # Add nodes
-    graph.add_node("generate_stories", generate_stories_node)
-    graph.add_node("generate_ac", generate_ac_node)
+    # Add nodes (sync nodes run under invoke, async nodes under ainvoke)
+    for name in stages:
+        func, afunc = STAGES[name]
+        graph.add_node(name, RunnableLambda(func, afunc=afunc))
+
+    # Define flow: START → stages... → END
+    for source, target in zip((START,) + tuple(stages), tuple(stages) + (END,)):
+        graph.add_edge(source, target)
+
+    return graph.compile(checkpointer=checkpointer)
+
 
-    # Define flow: Idea → Stories → AC → End
-    graph.add_edge(START, "generate_stories")
-    graph.add_edge("generate_stories", "generate_ac")
-    graph.add_edge("generate_ac", END)
+# Compiled lazily on first use
+_workflow = None
 
-    return graph.compile()
 
+def get_workflow():
+    """Return the compiled workflow graph, building it on first use"""
+    global _workflow
+    if _workflow is None:
+        _workflow = build_workflow()
 
-# Compile the workflow
-workflow = build_workflow()
+    return _workflow
 
 
-# Convenience Function
+def __getattr__(name: str):
+    # Keep `from workflow.agent import workflow` working without eager compilation
+    if name == "workflow":
+        return get_workflow()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-def run_workflow(file_prefix: str) -> dict:
+# Convenience Functions
+
+
+def create_initial_state(
+    file_prefix: str,
+    force: bool = False,
+    direct_context: bool = False,
+    per_scenario: bool = False,
+) -> WorkflowState:
     """
-    Run the complete SDLC workflow for a feature file.
+    Build the initial workflow state for a feature file.
 
     Args:
         file_prefix: File prefix (e.g., '01', '02') or full filename
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts instead of
+            letting the agents fetch it with tool calls
+        per_scenario: Generate AC for each story scenario concurrently
 
     Returns:
-        Dictionary with results and file paths
+        WorkflowState ready to be passed to the workflow graph
     """
     # Find the idea file
     if file_prefix.endswith(".md"):
@@ -140,15 +388,7 @@ def run_workflow(file_prefix: str) -> dict:
         prefix = file_prefix
         idea_filename = find_idea_file(prefix)
 
-    print("=" * 70)
-    print("Running Full Workflow:  Idea -> User Stories -> Acceptance Criteria")
-    print("=" * 70)
-    print(f"Feature: {idea_filename}")
-    print("-" * 70)
-    print()
-
-    # Initialize state
-    initial_state = WorkflowState(
+    return WorkflowState(
         file_prefix=prefix,
         idea_filename=idea_filename,
         story_filename=None,
@@ -156,23 +396,41 @@ def run_workflow(file_prefix: str) -> dict:
         stories_generated=False,
         ac_generated=False,
         errors=[],
+        force=force,
+        direct_context=direct_context,
+        per_scenario=per_scenario,
+        stories_skipped=False,
+        ac_skipped=False,
     )
 
-    # Run the workflow
-    result = workflow.invoke(initial_state)
 
-    # Display results
+def _print_header(state: WorkflowState) -> None:
+    """Print the workflow banner for a feature"""
+    print("=" * 70)
+    print("Running Full Workflow:  Idea -> User Stories -> Acceptance Criteria")
+    print("=" * 70)
+    print(f"Feature: {state['idea_filename']}")
+    print("-" * 70)
+    print()
+
+
+def _print_results(result: dict) -> None:
+    """Print the outcome of a workflow run"""
     print()
     print("=" * 70)
     print("Workflow Complete!")
     print("=" * 70)
 
-    if result.get("stories_generated"):
+    if result.get("stories_skipped"):
+        print(f"⏭️  User Stories: {result['story_filename']} (up to date)")
+    elif result.get("stories_generated"):
         print(f"✅ User Stories: {result['story_filename']}")
     else:
         print("❌ User Stories: Failed")
 
-    if result.get("ac_generated"):
+    if result.get("ac_skipped"):
+        print(f"⏭️  Acceptance Criteria: {result['ac_filename']} (up to date)")
+    elif result.get("ac_generated"):
         print(f"✅ Acceptance Criteria: {result['ac_filename']}")
     else:
         print("❌ Acceptance Criteria: Failed")
@@ -184,4 +442,110 @@ def run_workflow(file_prefix: str) -> dict:
 
     print()
 
+
+def run_workflow(
+    file_prefix: str,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Run the complete SDLC workflow for a feature file.
+
+    Args:
+        file_prefix: File prefix (e.g., '01', '02') or full filename
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store for instrumentation events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint the run under this ID, resuming it if it already
+            ran (None = no checkpoints)
+
+    Returns:
+        Dictionary with results and file paths, plus the RunMetrics under
+        "metrics"
+    """
+    # Initialize state
+    initial_state = create_initial_state(
+        file_prefix,
+        force=force,
+        direct_context=direct_context,
+        per_scenario=per_scenario,
+    )
+    _print_header(initial_state)
+
+    # Run the workflow, recording per-node latency, tokens and cache hits
+    metrics = metrics if metrics is not None else RunMetrics()
+    handler = MetricsCallbackHandler(metrics, feature=initial_state["idea_filename"])
+    config = {"callbacks": [handler]}
+
+    if run_id is None:
+        result = get_workflow().invoke(initial_state, config=config)
+    else:
+        config.update(thread_config(run_id, initial_state["idea_filename"]))
+        with checkpointer() as saver:
+            graph = build_workflow(checkpointer=saver)
+            result = invoke_resumable(graph, initial_state, config)
+
+    # Display results
+    _print_results(result)
+    metrics.print_summary()
+
+    result["metrics"] = metrics
+    return result
+
+
+async def arun_workflow(
+    file_prefix: str,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Async variant of run_workflow that drives the graph with ainvoke.
+
+    Args:
+        file_prefix: File prefix (e.g., '01', '02') or full filename
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store for instrumentation events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint the run under this ID, resuming it if it already
+            ran (None = no checkpoints)
+
+    Returns:
+        Dictionary with results and file paths, plus the RunMetrics under
+        "metrics"
+    """
+    # Initialize state
+    initial_state = create_initial_state(
+        file_prefix,
+        force=force,
+        direct_context=direct_context,
+        per_scenario=per_scenario,
+    )
+    _print_header(initial_state)
+
+    # Run the workflow, recording per-node latency, tokens and cache hits
+    metrics = metrics if metrics is not None else RunMetrics()
+    handler = MetricsCallbackHandler(metrics, feature=initial_state["idea_filename"])
+    config = {"callbacks": [handler]}
+
+    if run_id is None:
+        result = await get_workflow().ainvoke(initial_state, config=config)
+    else:
+        config.update(thread_config(run_id, initial_state["idea_filename"]))
+        async with acheckpointer() as saver:
+            graph = build_workflow(checkpointer=saver)
+            result = await ainvoke_resumable(graph, initial_state, config)
+
+    # Display results
+    _print_results(result)
+    metrics.print_summary()
+
+    result["metrics"] = metrics
     return result
@@ -0,0 +1,266 @@
+"""
+Batch execution for the SDLC workflow.
+
+Runs the Idea → Stories → AC workflow for many idea files inside a single
+process. One event loop drives every workflow through the async graph path,
+with a semaphore bounding the number of workflows in flight at once.
+
+Usage:
+    from workflow.batch import collect_idea_files, run_batch
+
+    filenames = collect_idea_files(all_files=True)
+    report = run_batch(filenames, max_concurrency=8)
+"""
+
+import asyncio
+import fnmatch
+import time
+
+from artifacts.index import get_index
+from runtime.metrics import MetricsCallbackHandler, RunMetrics, percentile
+
+from .agent import build_workflow, create_initial_state, find_idea_file, get_workflow
+from .checkpoint import acheckpointer, ainvoke_resumable, thread_config
+
+
+def collect_idea_files(
+    prefixes: list[str] | None = None,
+    pattern: str | None = None,
+    all_files: bool = False,
+) -> list[str]:
+    """
+    Resolve the idea files to process in a batch.
+
+    Args:
+        prefixes: File prefixes (e.g., ['01', '02']) or full filenames
+        pattern: Glob pattern matched against the ideas directory (e.g., '0*.md')
+        all_files: Include every idea file in the ideas directory
+
+    Returns:
+        Sorted, de-duplicated list of idea filenames
+    """
+    filenames = set()
+    idea_files = get_index().names("ideas")
+
+    if all_files:
+        filenames.update(idea_files)
+
+    if pattern:
+        filenames.update(fnmatch.filter(idea_files, pattern))
+
+    for prefix in prefixes or []:
+        if prefix.endswith(".md"):
+            filenames.add(prefix)
+        else:
+            filenames.add(find_idea_file(prefix))
+
+    return sorted(filenames)
+
+
+async def _arun_one(
+    idea_filename: str,
+    semaphore: asyncio.Semaphore,
+    options: dict,
+    metrics: RunMetrics,
+    graph,
+    run_id: str | None = None,
+) -> dict:
+    """Run the compiled workflow for one idea file and time it"""
+    async with semaphore:
+        started = time.perf_counter()
+        handler = MetricsCallbackHandler(metrics, feature=idea_filename)
+        state = create_initial_state(idea_filename, **options)
+        config = {"callbacks": [handler]}
+
+        try:
+            if run_id is None:
+                result = await graph.ainvoke(state, config=config)
+            else:
+                config.update(thread_config(run_id, idea_filename))
+                result = await ainvoke_resumable(graph, state, config)
+        except Exception as e:
+            result = {
+                "idea_filename": idea_filename,
+                "stories_generated": False,
+                "ac_generated": False,
+                "errors": [f"Workflow failed: {str(e)}"],
+            }
+
+        result["elapsed"] = time.perf_counter() - started
+        return result
+
+
+def summarize(results: list[dict], wall_time: float) -> dict:
+    """
+    Aggregate throughput and latency statistics for a batch.
+
+    Args:
+        results: Per-file workflow results (each with an "elapsed" key)
+        wall_time: Total wall-clock time of the batch in seconds
+
+    Returns:
+        Dictionary with counts, throughput and latency percentiles
+    """
+    latencies = [r["elapsed"] for r in results]
+    succeeded = [r for r in results if not r.get("errors")]
+    unchanged = [
+        r for r in succeeded if r.get("stories_skipped") and r.get("ac_skipped")
+    ]
+
+    return {
+        "total": len(results),
+        "succeeded": len(succeeded),
+        "failed": len(results) - len(succeeded),
+        "unchanged": len(unchanged),
+        "wall_time": wall_time,
+        "throughput_per_min": (len(results) / wall_time * 60) if wall_time else 0.0,
+        "latency_mean": sum(latencies) / len(latencies) if latencies else 0.0,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_max": max(latencies, default=0.0),
+    }
+
+
+def print_report(results: list[dict], stats: dict) -> None:
+    """Print a per-file summary followed by the aggregate report"""
+    print()
+    print("=" * 70)
+    print("Batch Complete!")
+    print("=" * 70)
+
+    for result in results:
+        if result.get("errors"):
+            status = "❌"
+        elif result.get("stories_skipped") and result.get("ac_skipped"):
+            status = "⏭️ "
+        else:
+            status = "✅"
+        print(f"{status} {result['idea_filename']:<40} {result['elapsed']:>8.2f}s")
+        for error in result.get("errors", []):
+            print(f"   - {error}")
+
+    print("-" * 70)
+    print(
+        f"Files: {stats['total']}  "
+        f"Succeeded: {stats['succeeded']}  Failed: {stats['failed']}  "
+        f"Up to date: {stats['unchanged']}"
+    )
+    print(
+        f"Wall time: {stats['wall_time']:.2f}s  "
+        f"Throughput: {stats['throughput_per_min']:.1f} files/min"
+    )
+    print(
+        f"Latency: mean {stats['latency_mean']:.2f}s  "
+        f"p50 {stats['latency_p50']:.2f}s  "
+        f"p95 {stats['latency_p95']:.2f}s  "
+        f"max {stats['latency_max']:.2f}s"
+    )
+    print()
+
+
+async def arun_batch(
+    idea_filenames: list[str],
+    max_concurrency: int = 4,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Run the complete SDLC workflow for many idea files concurrently.
+
+    Only stages whose inputs changed since their last run are regenerated,
+    unless force is set.
+
+    Args:
+        idea_filenames: Idea filenames to process
+        max_concurrency: Maximum number of workflows in flight at once
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store for instrumentation events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint every feature under this run ID, resuming
+            features that already ran (None = no checkpoints)
+
+    Returns:
+        Dictionary with:
+        - results: Per-file workflow results, in input order
+        - stats: Aggregate throughput and latency statistics
+        - metrics: RunMetrics with per-node events for every feature
+    """
+    print("=" * 70)
+    print("Running Batch Workflow:  Idea -> User Stories -> Acceptance Criteria")
+    print("=" * 70)
+    print(f"Features: {len(idea_filenames)}  Max concurrency: {max_concurrency}")
+    print("-" * 70)
+    print()
+
+    started = time.perf_counter()
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    options = {
+        "force": force,
+        "direct_context": direct_context,
+        "per_scenario": per_scenario,
+    }
+    metrics = metrics if metrics is not None else RunMetrics()
+
+    async def run_all(graph) -> list[dict]:
+        return list(
+            await asyncio.gather(
+                *(
+                    _arun_one(filename, semaphore, options, metrics, graph, run_id)
+                    for filename in idea_filenames
+                )
+            )
+        )
+
+    if run_id is None:
+        results = await run_all(get_workflow())
+    else:
+        async with acheckpointer() as saver:
+            results = await run_all(build_workflow(checkpointer=saver))
+    stats = summarize(results, time.perf_counter() - started)
+
+    print_report(results, stats)
+    metrics.print_summary()
+
+    return {"results": results, "stats": stats, "metrics": metrics}
+
+
+def run_batch(
+    idea_filenames: list[str],
+    max_concurrency: int = 4,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Synchronous wrapper around arun_batch.
+
+    Args:
+        idea_filenames: Idea filenames to process
+        max_concurrency: Maximum number of workflows in flight at once
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store for instrumentation events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint every feature under this run ID, resuming
+            features that already ran (None = no checkpoints)
+
+    Returns:
+        Same dictionary as arun_batch
+    """
+    return asyncio.run(
+        arun_batch(
+            idea_filenames,
+            max_concurrency,
+            force,
+            direct_context,
+            metrics,
+            per_scenario,
+            run_id,
+        )
+    )
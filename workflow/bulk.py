@@ -0,0 +1,320 @@
+"""
+Bulk regeneration through a provider batch API.
+
+For nightly full regenerations interactive latency does not matter, so
+instead of driving the agents call by call, every stale stories prompt is
+packed into one batch job and submitted through a batch backend (see
+runtime.batch_api). When the stories job lands, the outputs are saved with
+save_story_to_file() and the AC job is built from the new stories and
+submitted; its outputs are saved with save_ac_to_file(). Both jobs honor the
+same manifests as the interactive workflow, so up-to-date stages are left
+out of the jobs and bulk output counts as up to date for later runs.
+
+Before saving, every output goes through the same eval gates as the
+interactive agents (see evals). The failing blocks of all outputs are sent
+for targeted repair in one more batch job per repair round
+(SDLC_REPAIR_ROUNDS), and violations that remain are printed.
+
+Batch requests cannot make tool calls, so every prompt carries its input
+file inline (as in --direct mode) and features whose input cannot be read
+are reported as failed.
+
+Usage:
+    from workflow.bulk import run_bulk
+
+    report = run_bulk(filenames, backend="local", poll_interval=5)
+"""
+
+import time
+from pathlib import Path
+
+from evals.gherkin import GateReport, OutputKind, validate
+from evals.repair import REPAIR_ROUNDS, repair_prompt, splice
+from runtime.batch_api import (
+    BATCH_TIMEOUT,
+    BatchBackend,
+    batch_request,
+    get_batch_backend,
+    wait_for_batch,
+)
+from nodes import prefix_cache_key
+from tools.file_retrieval import read_data_file
+from user_story.agent import save_story_to_file, story_output_filename, story_prompt
+from user_story.prompts import SYSTEM_PROMPT as STORY_PROMPT
+from ac_writer.agent import ac_output_filename, ac_prompt, save_ac_to_file
+from ac_writer.prompts import SYSTEM_PROMPT as AC_PROMPT
+
+from .agent import (
+    AC_MODEL,
+    STORY_MODEL,
+    _ac_target,
+    _report_gates,
+    _skip_ac,
+    _skip_stories,
+    _stories_target,
+    create_initial_state,
+)
+from .batch import print_report, summarize
+from .manifest import write_manifest
+
+
+def _messages(system_prompt: str, prompt: str) -> list[dict]:
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def _run_job(
+    backend: BatchBackend,
+    label: str,
+    requests: list[dict],
+    poll_interval: float,
+    timeout: float | None,
+) -> dict[str, dict]:
+    """Submit one job, wait for it to land and return its results"""
+    job_id = backend.submit(requests)
+    print(
+        f"📦 {label} batch submitted: {job_id} "
+        f"({len(requests)} requests, {backend.name})"
+    )
+
+    state = wait_for_batch(backend, job_id, poll_interval, timeout)
+    print(f"📬 {label} batch {job_id} {state}")
+
+    return backend.results(job_id)
+
+
+def _output_error(label: str, output: dict | None) -> str:
+    if output is None:
+        return f"Failed to generate {label}: no result in batch output"
+    return f"Failed to generate {label}: {output.get('error') or 'empty response'}"
+
+
+def _apply_gates(
+    backend: BatchBackend,
+    label: str,
+    kind: OutputKind,
+    texts: dict[str, tuple[str, str]],
+    request_options: tuple[str, str, str],
+    poll_interval: float,
+    timeout: float | None,
+) -> dict[str, tuple[str, GateReport]]:
+    """
+    Validate batch outputs and repair their failing blocks with batch jobs.
+
+    Args:
+        backend: Batch backend for the repair jobs
+        label: Stage name for log lines ("Stories" or "AC")
+        kind: Output kind for the gates ("stories" or "ac")
+        texts: Idea filename -> (output text, source name shown to the model)
+        request_options: (model, system prompt, prompt cache key) of the stage
+        poll_interval: Seconds between job status checks
+        timeout: Give up on a job after this many seconds (None = wait)
+
+    Returns:
+        Idea filename -> (possibly repaired text, its GateReport)
+    """
+    model, system_prompt, cache_key = request_options
+    checked = {
+        filename: (text, validate(text, kind)) for filename, (text, _) in texts.items()
+    }
+
+    for _ in range(REPAIR_ROUNDS):
+        requests, failing = [], {}
+        for filename, (text, report) in checked.items():
+            request = (
+                None
+                if report["passed"]
+                else repair_prompt(text, report, texts[filename][1])
+            )
+            if request is None:
+                continue
+
+            prompt, failing[filename] = request
+            requests.append(
+                batch_request(
+                    filename,
+                    model,
+                    _messages(system_prompt, prompt),
+                    prompt_cache_key=cache_key,
+                )
+            )
+
+        if not requests:
+            break
+
+        outputs = _run_job(backend, f"{label} repair", requests, poll_interval, timeout)
+        for filename, blocks in failing.items():
+            output = outputs.get(filename)
+            if not output or not output["content"]:
+                continue
+
+            text = checked[filename][0]
+            repaired = splice(text, blocks, output["content"])
+            if repaired != text:
+                checked[filename] = (repaired, validate(repaired, kind))
+
+    for filename, (_, report) in checked.items():
+        if not report["passed"]:
+            print(f"{label} for {filename}:")
+            _report_gates({"validation": report})
+
+    return checked
+
+
+def run_bulk(
+    idea_filenames: list[str],
+    backend: BatchBackend | str | None = None,
+    force: bool = False,
+    poll_interval: float = 30.0,
+    timeout: float | None = BATCH_TIMEOUT,
+) -> dict:
+    """
+    Regenerate stories and AC for many idea files with two batch jobs.
+
+    Args:
+        idea_filenames: Idea filenames to process
+        backend: BatchBackend instance or backend name (default:
+            $SDLC_BATCH_BACKEND or "openai")
+        force: Regenerate every stage even if its inputs have not changed
+        poll_interval: Seconds between job status checks
+        timeout: Give up on a job after this many seconds (default:
+            BATCH_TIMEOUT, None = wait indefinitely)
+
+    Returns:
+        Same dictionary as arun_batch, without metrics (elapsed is the time
+        until each feature's last job landed)
+    """
+    if not isinstance(backend, BatchBackend):
+        backend = get_batch_backend(backend)
+
+    print("=" * 70)
+    print("Running Bulk Workflow:  Idea -> User Stories -> Acceptance Criteria")
+    print("=" * 70)
+    print(f"Features: {len(idea_filenames)}  Batch backend: {backend.name}")
+    print("-" * 70)
+    print()
+
+    started = time.perf_counter()
+    states = {
+        filename: {**create_initial_state(filename, force=force), "elapsed": 0.0}
+        for filename in idea_filenames
+    }
+
+    # Stage 1: one job with every stale stories prompt
+    requests, fingerprints = [], {}
+    for filename, state in states.items():
+        skipped = _skip_stories(state)
+        if skipped:
+            state.update(skipped)
+        elif read_data_file("ideas", filename) is None:
+            state["errors"] = [f"Failed to generate stories: cannot read {filename}"]
+        else:
+            fingerprints[filename] = _stories_target(state)[1]
+            prompt = story_prompt(filename, direct_context=True)
+            requests.append(
+                batch_request(
+                    filename,
+                    STORY_MODEL,
+                    _messages(STORY_PROMPT, prompt),
+                    prompt_cache_key=prefix_cache_key("user_story", STORY_PROMPT),
+                )
+            )
+
+    if requests:
+        outputs = _run_job(backend, "Stories", requests, poll_interval, timeout)
+        landed = time.perf_counter() - started
+
+        texts = {}
+        for filename in fingerprints:
+            state, output = states[filename], outputs.get(filename)
+            state["elapsed"] = landed
+
+            if not output or not output["content"]:
+                state["errors"] = [_output_error("stories", output)]
+            else:
+                texts[filename] = (output["content"], filename)
+
+        checked = _apply_gates(
+            backend,
+            "Stories",
+            "stories",
+            texts,
+            (STORY_MODEL, STORY_PROMPT, prefix_cache_key("user_story", STORY_PROMPT)),
+            poll_interval,
+            timeout,
+        )
+        landed = time.perf_counter() - started
+
+        for filename, (content, _) in checked.items():
+            state, stage_fingerprint = states[filename], fingerprints[filename]
+            state["elapsed"] = landed
+
+            output_path = save_story_to_file(content, story_output_filename(filename))
+            write_manifest(Path(output_path), stage_fingerprint)
+            state.update(story_filename=output_path, stories_generated=True)
+
+    # Stage 2: submitted once the stories have landed
+    requests, fingerprints = [], {}
+    for filename, state in states.items():
+        if not state["stories_generated"]:
+            continue
+
+        skipped = _skip_ac(state)
+        if skipped:
+            state.update(skipped)
+        else:
+            story_filename = Path(state["story_filename"]).name
+            fingerprints[filename] = _ac_target(state)[1]
+            prompt = ac_prompt(story_filename, source_type="story", direct_context=True)
+            requests.append(
+                batch_request(
+                    filename,
+                    AC_MODEL,
+                    _messages(AC_PROMPT, prompt),
+                    prompt_cache_key=prefix_cache_key("ac_writer", AC_PROMPT),
+                )
+            )
+
+    if requests:
+        outputs = _run_job(backend, "AC", requests, poll_interval, timeout)
+        landed = time.perf_counter() - started
+
+        texts = {}
+        for filename in fingerprints:
+            state, output = states[filename], outputs.get(filename)
+            state["elapsed"] = landed
+
+            if not output or not output["content"]:
+                state["errors"] = state["errors"] + [_output_error("AC", output)]
+            else:
+                story_filename = Path(state["story_filename"]).name
+                texts[filename] = (output["content"], story_filename)
+
+        checked = _apply_gates(
+            backend,
+            "AC",
+            "ac",
+            texts,
+            (AC_MODEL, AC_PROMPT, prefix_cache_key("ac_writer", AC_PROMPT)),
+            poll_interval,
+            timeout,
+        )
+        landed = time.perf_counter() - started
+
+        for filename, (content, _) in checked.items():
+            state, stage_fingerprint = states[filename], fingerprints[filename]
+            state["elapsed"] = landed
+
+            ac_filename = ac_output_filename(texts[filename][1], source_type="story")
+            output_path = save_ac_to_file(content, ac_filename)
+            write_manifest(Path(output_path), stage_fingerprint)
+            state.update(ac_filename=output_path, ac_generated=True)
+
+    results = list(states.values())
+    stats = summarize(results, time.perf_counter() - started)
+
+    print_report(results, stats)
+
+    return {"results": results, "stats": stats}
@@ -0,0 +1,226 @@
+"""
+Durable checkpoints for resumable workflow runs.
+
+Every workflow run gets a run ID. Each feature in the run is a LangGraph
+thread ("<run-id>:<idea filename>") checkpointed to a local SQLite database
+after every node, including the nodes of the agent subgraphs, so both the
+WorkflowState and each agent's message history survive a crash, Ctrl-C or
+provider outage. Resuming a run continues every unfinished feature from its
+last completed node and returns finished features straight from their
+checkpoint, so completed work is never paid for twice.
+
+The database lives at .cache/checkpoints.sqlite (override with
+SDLC_CHECKPOINT_DB) next to a table recording each run's features and
+options. Several processes write to it at once (--workers N, queue
+workers), so it uses the WAL journal, which lets readers proceed during a
+write, and every connection waits up to SDLC_CHECKPOINT_BUSY_TIMEOUT
+seconds (default: 60) for another process's write instead of failing with
+"database is locked". WAL needs shared memory, so a database shared
+between hosts must not live on a network filesystem.
+
+Usage:
+    from workflow.checkpoint import load_run, start_run
+
+    run_id = start_run(["01-feat-pagination.md"], {"force": False})
+    run = load_run(run_id)   # {"run_id", "created", "filenames", "options"}
+"""
+
+import json
+import os
+import secrets
+import sqlite3
+import time
+from contextlib import asynccontextmanager, closing, contextmanager
+from pathlib import Path
+
+
+# SQLite database holding checkpoints and run records
+CHECKPOINT_DB = Path(
+    os.environ.get(
+        "SDLC_CHECKPOINT_DB",
+        Path(__file__).parent.parent / ".cache" / "checkpoints.sqlite",
+    )
+)
+
+# Seconds a connection waits for another process's write to finish
+BUSY_TIMEOUT = float(os.environ.get("SDLC_CHECKPOINT_BUSY_TIMEOUT", "60"))
+
+
+def _open() -> sqlite3.Connection:
+    """Connection to the checkpoint database in WAL mode"""
+    CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+    # The timeout is SQLite's busy timeout; the saver may use the connection
+    # from other threads
+    connection = sqlite3.connect(
+        CHECKPOINT_DB, timeout=BUSY_TIMEOUT, check_same_thread=False
+    )
+    connection.execute("PRAGMA journal_mode=WAL")
+    return connection
+
+
+def _connect() -> sqlite3.Connection:
+    connection = _open()
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS sdlc_runs ("
+        "run_id TEXT PRIMARY KEY, created REAL, filenames TEXT, options TEXT)"
+    )
+    return connection
+
+
+def new_run_id() -> str:
+    """New sortable run ID (e.g., "20261018-153012-9f2c")"""
+    return time.strftime("%Y%m%d-%H%M%S") + "-" + secrets.token_hex(2)
+
+
+def start_run(filenames: list[str], options: dict) -> str:
+    """
+    Record a new run so it can be resumed later.
+
+    Args:
+        filenames: Idea filenames in the run
+        options: Workflow options (force, direct_context, ...)
+
+    Returns:
+        The new run ID
+    """
+    run_id = new_run_id()
+
+    with closing(_connect()) as connection, connection:
+        connection.execute(
+            "INSERT INTO sdlc_runs VALUES (?, ?, ?, ?)",
+            (run_id, time.time(), json.dumps(filenames), json.dumps(options)),
+        )
+
+    return run_id
+
+
+def load_run(run_id: str) -> dict:
+    """
+    Look up a recorded run.
+
+    Args:
+        run_id: Run ID printed when the run started
+
+    Returns:
+        Dictionary with run_id, created, filenames and options
+
+    Raises:
+        KeyError: If no run with this ID was recorded
+    """
+    with closing(_connect()) as connection:
+        row = connection.execute(
+            "SELECT created, filenames, options FROM sdlc_runs WHERE run_id = ?",
+            (run_id,),
+        ).fetchone()
+
+    if row is None:
+        raise KeyError(f"No recorded run '{run_id}' in {CHECKPOINT_DB}")
+
+    return {
+        "run_id": run_id,
+        "created": row[0],
+        "filenames": json.loads(row[1]),
+        "options": json.loads(row[2]),
+    }
+
+
+def thread_config(run_id: str, key: str) -> dict:
+    """Config selecting the checkpoint thread of one feature in a run"""
+    return {"configurable": {"thread_id": f"{run_id}:{key}"}}
+
+
+@contextmanager
+def checkpointer():
+    """SQLite checkpointer for graphs driven with invoke"""
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    with closing(_open()) as connection:
+        yield SqliteSaver(connection)
+
+
+@asynccontextmanager
+async def acheckpointer():
+    """SQLite checkpointer for graphs driven with ainvoke"""
+    import aiosqlite
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    CHECKPOINT_DB.parent.mkdir(parents=True, exist_ok=True)
+    async with aiosqlite.connect(CHECKPOINT_DB, timeout=BUSY_TIMEOUT) as connection:
+        await connection.execute("PRAGMA journal_mode=WAL")
+        yield AsyncSqliteSaver(connection)
+
+
+def _retry_point(snapshots) -> object | None:
+    """Newest checkpoint with pending nodes and no recorded errors"""
+    for snapshot in snapshots:
+        if snapshot.next and not snapshot.values.get("errors"):
+            return snapshot
+    return None
+
+
+def _resume_message(state: dict, snapshot) -> None:
+    print(
+        f"🔁 Resuming {state.get('idea_filename', '')} at: {', '.join(snapshot.next)}"
+    )
+
+
+def invoke_resumable(graph, state: dict, config: dict) -> dict:
+    """
+    Run a checkpointed graph for one thread, resuming it if it already ran.
+
+    A new thread starts from `state`. An interrupted thread continues from
+    its last completed node (agent subgraphs continue from their own last
+    completed node). A thread that finished with errors (the workflow nodes
+    record provider failures in `errors`) is re-run from its newest
+    error-free checkpoint, so only the failed stages run again. A thread
+    that finished cleanly returns its final state without running anything.
+
+    Args:
+        graph: Graph compiled with a checkpointer
+        state: Initial state for a new thread
+        config: Run config including the thread ID (see thread_config)
+
+    Returns:
+        Final state of the thread
+    """
+    snapshot = graph.get_state(config)
+
+    if snapshot.created_at is None:
+        return graph.invoke(state, config=config)
+    if not snapshot.next and not snapshot.values.get("errors"):
+        return snapshot.values
+
+    if snapshot.next:
+        # Continue the latest checkpoint (agent subgraphs pick up their own)
+        _resume_message(state, snapshot)
+        return graph.invoke(None, config=config)
+
+    # Fork from the newest error-free checkpoint
+    snapshot = _retry_point(graph.get_state_history(config))
+    if snapshot is None:
+        return graph.invoke(state, config=config)
+
+    _resume_message(state, snapshot)
+    return graph.invoke(None, config={**config, **snapshot.config})
+
+
+async def ainvoke_resumable(graph, state: dict, config: dict) -> dict:
+    """Async variant of invoke_resumable"""
+    snapshot = await graph.aget_state(config)
+
+    if snapshot.created_at is None:
+        return await graph.ainvoke(state, config=config)
+    if not snapshot.next and not snapshot.values.get("errors"):
+        return snapshot.values
+
+    if snapshot.next:
+        _resume_message(state, snapshot)
+        return await graph.ainvoke(None, config=config)
+
+    history = [s async for s in graph.aget_state_history(config)]
+    snapshot = _retry_point(history)
+    if snapshot is None:
+        return await graph.ainvoke(state, config=config)
+
+    _resume_message(state, snapshot)
+    return await graph.ainvoke(None, config={**config, **snapshot.config})
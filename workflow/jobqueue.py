@@ -0,0 +1,355 @@
+"""
+Durable, lease-based work queue shared by workers on several machines.
+
+Hosts that share one data/ tree (e.g., over NFS) coordinate through a small
+SQLite database next to it. Each idea file is one queue item. A worker
+claims an item by taking a lease on it (owner, random token, expiry). It
+heartbeats while the workflow runs, and records the outcome only if it
+still holds the lease, so each item is completed at most once. A worker
+that crashes or loses the volume stops heartbeating. Once its lease expires,
+the item is claimed again by any other worker. Items whose lease expired
+MAX_ATTEMPTS times are marked failed instead of being retried forever.
+
+Claims and completions run in IMMEDIATE transactions with the rollback
+journal (WAL needs shared memory, which network filesystems do not provide).
+Lease expiry compares wall-clock time across hosts, so host clocks must be
+kept in sync (NTP).
+
+The database lives at data/.queue.sqlite (override with SDLC_QUEUE_DB).
+Lease length comes from SDLC_LEASE_SECONDS (default: 300).
+
+Usage:
+    from workflow.jobqueue import JobQueue
+
+    queue = JobQueue()
+    queue.enqueue(["01-feat-pagination.md"], {"force": False})
+
+    lease = queue.claim("host-a:1234")
+    queue.heartbeat(lease)
+    queue.complete(lease, {"errors": []})
+"""
+
+import json
+import os
+import secrets
+import socket
+import sqlite3
+import time
+from pathlib import Path
+
+from typing_extensions import TypedDict
+
+from artifacts.index import DATA_DIR
+from .checkpoint import new_run_id
+
+
+# Queue database on the shared volume
+QUEUE_DB = Path(os.environ.get("SDLC_QUEUE_DB", DATA_DIR / ".queue.sqlite"))
+
+# Seconds a claim stays valid without a heartbeat
+LEASE_SECONDS = float(os.environ.get("SDLC_LEASE_SECONDS", "300"))
+
+# Claims per item before an item whose leases keep expiring is failed
+MAX_ATTEMPTS = 3
+
+# Item states
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+class Lease(TypedDict):
+    """A worker's claim on one queue item"""
+
+    filename: str
+    run_id: str
+    options: dict
+    owner: str
+    token: str
+    expires: float
+    attempts: int
+
+
+def worker_name() -> str:
+    """Default lease owner name ("<host>:<pid>")"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """
+    Lease-based queue of idea files in a SQLite database.
+
+    Args:
+        path: Database file (default: QUEUE_DB)
+        lease_seconds: Lease length granted by claim() and heartbeat()
+        max_attempts: Claims per item before it is marked failed
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        lease_seconds: float = LEASE_SECONDS,
+        max_attempts: int = MAX_ATTEMPTS,
+    ):
+        self.path = Path(path or QUEUE_DB)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS sdlc_queue ("
+                "filename TEXT PRIMARY KEY, run_id TEXT, options TEXT, "
+                "state TEXT, owner TEXT, token TEXT, expires REAL, "
+                "attempts INTEGER DEFAULT 0, enqueued REAL, finished REAL, "
+                "result TEXT)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Transactions are managed explicitly with BEGIN IMMEDIATE
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=DELETE")
+        return connection
+
+    def _transaction(self, statements) -> object:
+        """Run a callable with a connection inside an IMMEDIATE transaction"""
+        connection = self._connect()
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                value = statements(connection)
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            return value
+        finally:
+            connection.close()
+
+    def enqueue(
+        self, filenames: list[str], options: dict, requeue: bool = False
+    ) -> int:
+        """
+        Add idea files to the queue.
+
+        Files already queued or leased are left alone. Finished files are
+        queued again only with requeue (e.g., --force).
+
+        Args:
+            filenames: Idea filenames
+            options: Workflow options for these files (force, direct_context, ...)
+            requeue: Queue files that are already done or failed again
+
+        Returns:
+            Number of files added
+        """
+        run_id = new_run_id()
+        now = time.time()
+
+        def insert(connection: sqlite3.Connection) -> int:
+            added = 0
+            for filename in filenames:
+                row = connection.execute(
+                    "SELECT state FROM sdlc_queue WHERE filename = ?", (filename,)
+                ).fetchone()
+                if row is not None and (row[0] in (PENDING, LEASED) or not requeue):
+                    continue
+
+                connection.execute(
+                    "INSERT OR REPLACE INTO sdlc_queue "
+                    "(filename, run_id, options, state, attempts, enqueued) "
+                    "VALUES (?, ?, ?, ?, 0, ?)",
+                    (filename, run_id, json.dumps(options), PENDING, now),
+                )
+                added += 1
+            return added
+
+        return self._transaction(insert)
+
+    def claim(self, owner: str | None = None) -> Lease | None:
+        """
+        Lease the oldest pending item, or an item whose lease expired.
+
+        Args:
+            owner: Lease owner name (default: worker_name())
+
+        Returns:
+            The new lease, or None if no item can be claimed right now
+        """
+        owner = owner or worker_name()
+
+        def take(connection: sqlite3.Connection) -> Lease | None:
+            now = time.time()
+
+            # Items abandoned too often are failed rather than retried forever
+            connection.execute(
+                "UPDATE sdlc_queue SET state = ?, finished = ?, result = ? "
+                "WHERE state = ? AND expires < ? AND attempts >= ?",
+                (
+                    FAILED,
+                    now,
+                    json.dumps({"errors": ["Lease expired too many times"]}),
+                    LEASED,
+                    now,
+                    self.max_attempts,
+                ),
+            )
+
+            row = connection.execute(
+                "SELECT filename, run_id, options, attempts FROM sdlc_queue "
+                "WHERE state = ? OR (state = ? AND expires < ?) "
+                "ORDER BY enqueued, filename LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            filename, run_id, options, attempts = row
+            lease: Lease = {
+                "filename": filename,
+                "run_id": run_id,
+                "options": json.loads(options),
+                "owner": owner,
+                "token": secrets.token_hex(8),
+                "expires": now + self.lease_seconds,
+                "attempts": attempts + 1,
+            }
+            connection.execute(
+                "UPDATE sdlc_queue SET state = ?, owner = ?, token = ?, "
+                "expires = ?, attempts = ? WHERE filename = ?",
+                (
+                    LEASED,
+                    owner,
+                    lease["token"],
+                    lease["expires"],
+                    lease["attempts"],
+                    filename,
+                ),
+            )
+            return lease
+
+        return self._transaction(take)
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """
+        Extend a lease.
+
+        Returns:
+            False if the lease was lost (expired and claimed by another worker)
+        """
+        expires = time.time() + self.lease_seconds
+
+        def extend(connection: sqlite3.Connection) -> bool:
+            cursor = connection.execute(
+                "UPDATE sdlc_queue SET expires = ? "
+                "WHERE filename = ? AND token = ? AND state = ?",
+                (expires, lease["filename"], lease["token"], LEASED),
+            )
+            return cursor.rowcount == 1
+
+        extended = self._transaction(extend)
+        if extended:
+            lease["expires"] = expires
+        return extended
+
+    def holds(self, lease: Lease) -> bool:
+        """
+        Whether a lease is still held.
+
+        Until the lease expires no other worker can claim the item, so only
+        an expired lease is looked up in the database.
+
+        Returns:
+            False if the lease was lost (expired and claimed by another worker)
+        """
+        if time.time() < lease["expires"]:
+            return True
+
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT 1 FROM sdlc_queue "
+                "WHERE filename = ? AND token = ? AND state = ?",
+                (lease["filename"], lease["token"], LEASED),
+            ).fetchone()
+        finally:
+            connection.close()
+        return row is not None
+
+    def complete(self, lease: Lease, result: dict) -> bool:
+        """
+        Record the outcome of a leased item (done, or failed if it has errors).
+
+        Args:
+            lease: Lease returned by claim()
+            result: Workflow result (stored as JSON)
+
+        Returns:
+            False if the lease was lost, in which case nothing is recorded
+        """
+        state = FAILED if result.get("errors") else DONE
+
+        def finish(connection: sqlite3.Connection) -> bool:
+            cursor = connection.execute(
+                "UPDATE sdlc_queue SET state = ?, finished = ?, result = ? "
+                "WHERE filename = ? AND token = ? AND state = ?",
+                (
+                    state,
+                    time.time(),
+                    json.dumps(result, default=str),
+                    lease["filename"],
+                    lease["token"],
+                    LEASED,
+                ),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(finish)
+
+    def release(self, lease: Lease) -> bool:
+        """Hand a leased item back to the queue (e.g., on shutdown)"""
+
+        def give_back(connection: sqlite3.Connection) -> bool:
+            cursor = connection.execute(
+                "UPDATE sdlc_queue SET state = ?, owner = NULL, token = NULL, "
+                "attempts = MAX(attempts - 1, 0) "
+                "WHERE filename = ? AND token = ? AND state = ?",
+                (PENDING, lease["filename"], lease["token"], LEASED),
+            )
+            return cursor.rowcount == 1
+
+        return self._transaction(give_back)
+
+    def counts(self) -> dict[str, int]:
+        """Number of items per state"""
+        connection = self._connect()
+        try:
+            rows = connection.execute(
+                "SELECT state, COUNT(*) FROM sdlc_queue GROUP BY state"
+            ).fetchall()
+        finally:
+            connection.close()
+
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def next_expiry(self) -> float | None:
+        """Earliest expiry among leased items (None if nothing is leased)"""
+        connection = self._connect()
+        try:
+            row = connection.execute(
+                "SELECT MIN(expires) FROM sdlc_queue WHERE state = ?", (LEASED,)
+            ).fetchone()
+        finally:
+            connection.close()
+        return row[0]
+
+
+_queue = None
+
+
+def get_queue() -> JobQueue:
+    """Return the process-wide job queue, opening it on first use"""
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
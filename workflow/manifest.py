@@ -0,0 +1,92 @@
+"""
+Build manifests for incremental workflow runs.
+
+Every generated artifact gets a sidecar `<artifact>.manifest.json` that records
+the content hash of each input file plus the prompt and model used to produce
+it. A stage is up to date when its output exists and the manifest recorded for
+it matches the fingerprint of the current inputs, make-style.
+
+Usage:
+    from workflow.manifest import fingerprint, is_up_to_date, write_manifest
+
+    fp = fingerprint([idea_path], SYSTEM_PROMPT, MODEL_NAME)
+    if not is_up_to_date(story_path, fp):
+        ...  # regenerate
+        write_manifest(story_path, fp)
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from artifacts.writer import write_atomic
+
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def hash_file(path: Path) -> str:
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def fingerprint(inputs: list[Path], prompt: str, model: str) -> dict:
+    """
+    Fingerprint the inputs of a workflow stage.
+
+    Args:
+        inputs: Input files the stage reads
+        prompt: System prompt used to generate the output
+        model: Model name used to generate the output
+
+    Returns:
+        Dictionary of input content hashes plus prompt and model versions
+    """
+    return {
+        "inputs": {Path(path).name: hash_file(Path(path)) for path in inputs},
+        "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+        "model": model,
+    }
+
+
+def manifest_path(output_path: Path) -> Path:
+    """Sidecar manifest path for an output artifact"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + MANIFEST_SUFFIX)
+
+
+def read_manifest(output_path: Path) -> dict | None:
+    """Read the manifest recorded for an output, or None if missing/corrupt"""
+    try:
+        with open(manifest_path(output_path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(output_path: Path, stage_fingerprint: dict) -> None:
+    """Record the fingerprint an output was generated from"""
+    write_atomic(
+        manifest_path(output_path),
+        json.dumps(stage_fingerprint, indent=2, sort_keys=True),
+    )
+
+
+def is_up_to_date(output_path: Path, stage_fingerprint: dict) -> bool:
+    """
+    Check whether an output was generated from exactly these inputs.
+
+    Args:
+        output_path: Path of the generated artifact
+        stage_fingerprint: Fingerprint of the current inputs
+
+    Returns:
+        True if the output exists and its manifest matches the fingerprint
+    """
+    return Path(output_path).exists() and read_manifest(output_path) == stage_fingerprint
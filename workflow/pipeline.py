@@ -0,0 +1,214 @@
+"""
+Pipelined stage scheduling for multi-feature workflow runs.
+
+Instead of running the whole Idea → Stories → AC chain per feature, each
+stage gets its own bounded pool of async workers. Story workers hand
+finished features to the AC workers through a bounded queue, so story
+generation for feature N+1 overlaps AC generation for feature N. When the
+AC stage falls behind, the queue fills up and story workers wait
+(backpressure) instead of piling up finished stories.
+
+Each stage runs as a single-node graph built by build_workflow(), so skip
+checks, manifests, metrics and checkpoints behave exactly as in the chained
+workflow (each stage of a feature is its own checkpoint thread).
+
+Usage:
+    from workflow.pipeline import run_pipeline
+
+    report = run_pipeline(filenames, story_workers=2, ac_workers=4)
+"""
+
+import asyncio
+import time
+from contextlib import AsyncExitStack
+
+from runtime.metrics import MetricsCallbackHandler, RunMetrics
+
+from .agent import STAGES, build_workflow, create_initial_state
+from .batch import print_report, summarize
+from .checkpoint import acheckpointer, ainvoke_resumable, thread_config
+
+
+# Compiled single-stage graphs, built on first use
+_stage_graphs: dict[str, object] = {}
+
+
+def get_stage_graph(stage: str):
+    """Return the compiled one-node graph for a workflow stage"""
+    if stage not in _stage_graphs:
+        _stage_graphs[stage] = build_workflow((stage,))
+    return _stage_graphs[stage]
+
+
+async def _arun_stage(
+    stage: str,
+    state: dict,
+    metrics: RunMetrics,
+    graph,
+    run_id: str | None = None,
+) -> dict:
+    """Run one stage for one feature, turning crashes into state errors"""
+    handler = MetricsCallbackHandler(metrics, feature=state["idea_filename"])
+    config = {"callbacks": [handler]}
+
+    try:
+        if run_id is None:
+            return await graph.ainvoke(state, config=config)
+
+        config.update(thread_config(run_id, f"{state['idea_filename']}:{stage}"))
+        return await ainvoke_resumable(graph, state, config)
+    except Exception as e:
+        return {
+            **state,
+            "errors": state.get("errors", []) + [f"Workflow failed: {str(e)}"],
+        }
+
+
+async def arun_pipeline(
+    idea_filenames: list[str],
+    story_workers: int = 2,
+    ac_workers: int = 4,
+    buffer_size: int | None = None,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Run the SDLC workflow for many idea files with one worker pool per stage.
+
+    Args:
+        idea_filenames: Idea filenames to process
+        story_workers: Number of features in the stories stage at once
+        ac_workers: Number of features in the AC stage at once
+        buffer_size: Finished stories allowed to wait for an AC worker
+            before story workers pause (default: ac_workers)
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store for instrumentation events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint every stage under this run ID, resuming stages
+            that already ran (None = no checkpoints)
+
+    Returns:
+        Same dictionary as arun_batch (results in input order)
+    """
+    story_workers = max(1, story_workers)
+    ac_workers = max(1, ac_workers)
+    buffer_size = buffer_size if buffer_size is not None else ac_workers
+
+    print("=" * 70)
+    print("Running Pipelined Workflow:  Idea -> User Stories -> Acceptance Criteria")
+    print("=" * 70)
+    print(
+        f"Features: {len(idea_filenames)}  Story workers: {story_workers}  "
+        f"AC workers: {ac_workers}  Buffer: {buffer_size}"
+    )
+    print("-" * 70)
+    print()
+
+    started = time.perf_counter()
+    metrics = metrics if metrics is not None else RunMetrics()
+
+    pending: asyncio.Queue = asyncio.Queue()
+    for position, filename in enumerate(idea_filenames):
+        pending.put_nowait((position, filename))
+
+    # Bounded hand-off between the stages (a full queue pauses story workers)
+    stories_done: asyncio.Queue = asyncio.Queue(maxsize=max(1, buffer_size))
+    results: list[dict | None] = [None] * len(idea_filenames)
+
+    async def story_worker() -> None:
+        while not pending.empty():
+            position, filename = pending.get_nowait()
+            feature_started = time.perf_counter()
+
+            state = create_initial_state(
+                filename,
+                force=force,
+                direct_context=direct_context,
+                per_scenario=per_scenario,
+            )
+            state = await _arun_stage(
+                "generate_stories", state, metrics, graphs["generate_stories"], run_id
+            )
+            await stories_done.put((position, feature_started, state))
+
+    async def ac_worker() -> None:
+        while (item := await stories_done.get()) is not None:
+            position, feature_started, state = item
+
+            result = await _arun_stage(
+                "generate_ac", state, metrics, graphs["generate_ac"], run_id
+            )
+            result["elapsed"] = time.perf_counter() - feature_started
+            results[position] = result
+
+    async with AsyncExitStack() as stack:
+        if run_id is None:
+            graphs = {stage: get_stage_graph(stage) for stage in STAGES}
+        else:
+            saver = await stack.enter_async_context(acheckpointer())
+            graphs = {
+                stage: build_workflow((stage,), checkpointer=saver) for stage in STAGES
+            }
+
+        ac_tasks = [asyncio.create_task(ac_worker()) for _ in range(ac_workers)]
+        await asyncio.gather(*(story_worker() for _ in range(story_workers)))
+
+        # Every story is queued; tell each AC worker to stop once the queue drains
+        for _ in range(ac_workers):
+            await stories_done.put(None)
+        await asyncio.gather(*ac_tasks)
+
+    stats = summarize(results, time.perf_counter() - started)
+
+    print_report(results, stats)
+    metrics.print_summary()
+
+    return {"results": results, "stats": stats, "metrics": metrics}
+
+
+def run_pipeline(
+    idea_filenames: list[str],
+    story_workers: int = 2,
+    ac_workers: int = 4,
+    buffer_size: int | None = None,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Synchronous wrapper around arun_pipeline.
+
+    Args:
+        idea_filenames: Idea filenames to process
+        story_workers: Number of features in the stories stage at once
+        ac_workers: Number of features in the AC stage at once
+        buffer_size: Finished stories allowed to wait for an AC worker
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store for instrumentation events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint every stage under this run ID, resuming stages
+            that already ran (None = no checkpoints)
+
+    Returns:
+        Same dictionary as arun_pipeline
+    """
+    return asyncio.run(
+        arun_pipeline(
+            idea_filenames,
+            story_workers,
+            ac_workers,
+            buffer_size,
+            force,
+            direct_context,
+            metrics,
+            per_scenario,
+            run_id,
+        )
+    )
@@ -0,0 +1,193 @@
+"""
+Queue worker: drains the shared job queue until it is empty.
+
+Any number of workers on any number of hosts can run at once. Each one
+claims an idea file from the lease-based queue (see workflow.jobqueue),
+runs the workflow for it while a background task heartbeats the lease, and
+records the outcome. If the lease is lost (the worker stalled past its
+expiry and another worker took the item over), the heartbeat cancels the
+workflow. Every artifact write also checks that the lease is still held
+(see artifacts.writer.guard_writes), so a stale worker never overwrites the
+new owner's output. Features are checkpointed under the run ID they were
+enqueued with. A feature taken over from a crashed worker therefore
+resumes from its last completed node when the checkpoint database is
+shared too (SDLC_CHECKPOINT_DB, workers on one host; see
+workflow.checkpoint); otherwise it starts over.
+
+A worker exits once no item is pending and no other worker holds a lease.
+While other leases are active it waits, so it can take over items whose
+leases expire.
+
+Usage:
+    from workflow.queue_worker import run_queue_worker
+
+    report = run_queue_worker(max_concurrency=4)
+"""
+
+import asyncio
+import sqlite3
+import time
+
+from artifacts.writer import guard_writes
+from runtime.metrics import RunMetrics
+
+from .agent import build_workflow
+from .batch import _arun_one, print_report, summarize
+from .checkpoint import acheckpointer
+from .jobqueue import JobQueue, Lease, get_queue, worker_name
+
+
+# Seconds between claim attempts while other workers hold every item
+IDLE_POLL_INTERVAL = 5.0
+
+
+async def _heartbeat(queue: JobQueue, lease: Lease, run: asyncio.Task) -> bool:
+    """
+    Extend a lease every third of its length until cancelled.
+
+    Args:
+        queue: Queue the lease was claimed from
+        lease: Lease to extend
+        run: Workflow task for the leased item, cancelled if the lease is lost
+
+    Returns:
+        True once the lease was lost and the workflow cancelled
+    """
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        try:
+            extended = await asyncio.to_thread(queue.heartbeat, lease)
+        except sqlite3.Error as e:
+            # The volume may be briefly unavailable; retry on the next beat
+            print(f"⚠️  Heartbeat failed for {lease['filename']}: {e}")
+            continue
+
+        if not extended:
+            print(f"⚠️  Lease lost: {lease['filename']} (another worker owns it)")
+            run.cancel()
+            return True
+
+
+def _lease_guard(queue: JobQueue, lease: Lease):
+    """Write check refusing artifact writes once the lease is lost"""
+
+    def check(path) -> None:
+        if not queue.holds(lease):
+            raise PermissionError(
+                f"Not writing {path.name}: lease on {lease['filename']} was lost"
+            )
+
+    return check
+
+
+async def arun_queue_worker(
+    max_concurrency: int = 4,
+    queue: JobQueue | None = None,
+    owner: str | None = None,
+    metrics: RunMetrics | None = None,
+) -> dict:
+    """
+    Claim and run queued features until the queue is drained.
+
+    Args:
+        max_concurrency: Maximum number of features leased at once
+        queue: Job queue (default: the process-wide queue)
+        owner: Lease owner name (default: "<host>:<pid>")
+        metrics: Store for instrumentation events (a new one if None)
+
+    Returns:
+        Same dictionary as workflow.batch.arun_batch, for the features this
+        worker completed
+    """
+    queue = queue or get_queue()
+    owner = owner or worker_name()
+    metrics = metrics if metrics is not None else RunMetrics()
+    results: list[dict] = []
+
+    print("=" * 70)
+    print("Queue Worker:  Idea -> User Stories -> Acceptance Criteria")
+    print("=" * 70)
+    print(f"Worker: {owner}  Queue: {queue.path}  Max concurrency: {max_concurrency}")
+    print("-" * 70)
+    print()
+
+    started = time.perf_counter()
+
+    async def run_leased(graph, lease: Lease) -> None:
+        print(f"🔒 Leased {lease['filename']} (attempt {lease['attempts']})")
+        with guard_writes(_lease_guard(queue, lease)):
+            # Concurrency is bounded by the consumers, not by _arun_one
+            run = asyncio.create_task(
+                _arun_one(
+                    lease["filename"],
+                    asyncio.Semaphore(1),
+                    lease["options"],
+                    metrics,
+                    graph,
+                    lease["run_id"],
+                )
+            )
+        heartbeat = asyncio.create_task(_heartbeat(queue, lease, run))
+        try:
+            result = await run
+        except asyncio.CancelledError:
+            if heartbeat.done() and not heartbeat.cancelled() and heartbeat.result():
+                print(f"⚠️  Stopped {lease['filename']}: lease was lost")
+                return
+            heartbeat.cancel()
+            await asyncio.to_thread(queue.release, lease)
+            raise
+        except BaseException:
+            heartbeat.cancel()
+            await asyncio.to_thread(queue.release, lease)
+            raise
+        heartbeat.cancel()
+
+        if await asyncio.to_thread(queue.complete, lease, result):
+            results.append(result)
+        else:
+            print(f"⚠️  Result for {lease['filename']} discarded: lease was lost")
+
+    async def consume(graph) -> None:
+        while True:
+            lease = await asyncio.to_thread(queue.claim, owner)
+            if lease is not None:
+                await run_leased(graph, lease)
+                continue
+
+            counts = await asyncio.to_thread(queue.counts)
+            if not counts["leased"]:
+                return
+
+            # Other workers hold the remaining items; wait for them to finish
+            # or for a lease to expire
+            expiry = await asyncio.to_thread(queue.next_expiry)
+            wait = (expiry or 0) - time.time()
+            await asyncio.sleep(min(max(wait, 0.1), IDLE_POLL_INTERVAL))
+
+    async with acheckpointer() as saver:
+        graph = build_workflow(checkpointer=saver)
+        await asyncio.gather(*(consume(graph) for _ in range(max(1, max_concurrency))))
+
+    stats = summarize(results, time.perf_counter() - started)
+    print_report(results, stats)
+    metrics.print_summary()
+
+    counts = queue.counts()
+    print(
+        f"📬 Queue: {counts['pending']} pending, {counts['leased']} leased, "
+        f"{counts['done']} done, {counts['failed']} failed"
+    )
+    print()
+
+    return {"results": results, "stats": stats, "metrics": metrics}
+
+
+def run_queue_worker(
+    max_concurrency: int = 4,
+    queue: JobQueue | None = None,
+    owner: str | None = None,
+    metrics: RunMetrics | None = None,
+) -> dict:
+    """Synchronous wrapper around arun_queue_worker"""
+    return asyncio.run(arun_queue_worker(max_concurrency, queue, owner, metrics))
@@ -0,0 +1,247 @@
+"""
+Multi-process worker pool for large workflow batches.
+
+A single interpreter serializes parsing, validation, file I/O and message
+serialization on the GIL once thousands of features are in flight. In
+worker mode the parent imports the agents and compiles the workflow graph
+once, then forks N worker processes that inherit them. Idea filenames are
+handed out through a shared work queue, so fast workers take more features.
+Each worker drives up to max_concurrency workflows on its own event loop,
+with its own connection pool and a 1/N share of the provider rate limits.
+Results and metric events go back to the parent over a result queue, and
+the parent prints the usual batch report.
+
+Usage:
+    from workflow.workers import run_workers
+
+    report = run_workers(filenames, workers=8, max_concurrency=4)
+"""
+
+import asyncio
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from runtime.cache import get_cache
+from runtime.metrics import RunMetrics
+
+from .agent import build_workflow, get_workflow
+from .batch import _arun_one, print_report, summarize
+from .checkpoint import acheckpointer
+
+
+# Seconds between liveness checks while waiting for results
+POLL_INTERVAL = 1.0
+
+
+def _context():
+    """Fork where available so workers inherit the imported, compiled agents"""
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("spawn")
+
+
+def warm_up() -> None:
+    """Import the agents and compile the workflow graph before forking"""
+    import ac_writer.agent  # noqa: F401
+    import evals.repair  # noqa: F401
+    import user_story.agent  # noqa: F401
+
+    get_workflow()
+
+
+def _share_rate_limits(workers: int) -> None:
+    """Give this process 1/workers of the provider request and token budget"""
+    from runtime.ratelimit import configure_rate_limiter, get_rate_limiter
+
+    limiter = get_rate_limiter()
+    configure_rate_limiter(
+        requests_per_minute=(
+            limiter.requests.capacity / workers if limiter.requests else None
+        ),
+        tokens_per_minute=limiter.tokens.capacity / workers if limiter.tokens else None,
+        max_concurrency=limiter.max_concurrency,
+        max_retries=limiter.max_retries,
+    )
+
+
+async def _adrain(
+    tasks,
+    results,
+    worker_id: int,
+    options: dict,
+    max_concurrency: int,
+    run_id: str | None,
+) -> None:
+    """Run workflows for filenames taken from the queue until a None arrives"""
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    # Blocking queue reads run in their own threads, one per consumer
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+
+        async def consume(graph) -> None:
+            while (filename := await loop.run_in_executor(executor, tasks.get)):
+                metrics = RunMetrics()
+                result = await _arun_one(
+                    filename, semaphore, options, metrics, graph, run_id
+                )
+                results.put(("result", worker_id, (filename, result), metrics.events))
+
+        async def consume_all(graph) -> None:
+            await asyncio.gather(*(consume(graph) for _ in range(max_concurrency)))
+
+        if run_id is None:
+            await consume_all(get_workflow())
+        else:
+            async with acheckpointer() as saver:
+                await consume_all(build_workflow(checkpointer=saver))
+
+
+def _worker_main(
+    tasks,
+    results,
+    worker_id: int,
+    workers: int,
+    options: dict,
+    max_concurrency: int,
+    run_id: str | None,
+) -> None:
+    """Entry point of one worker process"""
+    from runtime.clients import configure_clients
+
+    # Sockets of the parent's pool must not be shared across processes
+    configure_clients()
+    _share_rate_limits(workers)
+
+    try:
+        asyncio.run(
+            _adrain(tasks, results, worker_id, options, max_concurrency, run_id)
+        )
+    finally:
+        results.put(("done", worker_id, get_cache().stats(), None))
+
+
+def run_workers(
+    idea_filenames: list[str],
+    workers: int = os.cpu_count() or 1,
+    max_concurrency: int = 4,
+    force: bool = False,
+    direct_context: bool = False,
+    metrics: RunMetrics | None = None,
+    per_scenario: bool = False,
+    run_id: str | None = None,
+) -> dict:
+    """
+    Run the complete SDLC workflow for many idea files in worker processes.
+
+    Args:
+        idea_filenames: Idea filenames to process
+        workers: Number of worker processes
+        max_concurrency: Maximum number of workflows in flight per worker
+        force: Regenerate every stage even if its inputs have not changed
+        direct_context: Inject file content into the agent prompts
+        metrics: Store receiving every worker's events (a new one if None)
+        per_scenario: Generate AC for each story scenario concurrently
+        run_id: Checkpoint every feature under this run ID, resuming
+            features that already ran (None = no checkpoints)
+
+    Returns:
+        Same dictionary as workflow.batch.run_batch
+    """
+    workers = max(1, min(workers, len(idea_filenames) or 1))
+    max_concurrency = max(1, max_concurrency)
+
+    print("=" * 70)
+    print("Running Batch Workflow:  Idea -> User Stories -> Acceptance Criteria")
+    print("=" * 70)
+    print(
+        f"Features: {len(idea_filenames)}  Workers: {workers}  "
+        f"Max concurrency per worker: {max_concurrency}"
+    )
+    print("-" * 70)
+    print()
+
+    started = time.perf_counter()
+    options = {
+        "force": force,
+        "direct_context": direct_context,
+        "per_scenario": per_scenario,
+    }
+    metrics = metrics if metrics is not None else RunMetrics()
+
+    warm_up()
+    context = _context()
+    tasks, results = context.Queue(), context.Queue()
+
+    for filename in idea_filenames:
+        tasks.put(filename)
+    for _ in range(workers * max_concurrency):
+        tasks.put(None)
+
+    # Buffered output would otherwise be printed again by every child
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    processes = [
+        context.Process(
+            target=_worker_main,
+            args=(tasks, results, i, workers, options, max_concurrency, run_id),
+            name=f"sdlc-worker-{i}",
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+
+    by_file: dict[str, dict] = {}
+    done = set()
+
+    try:
+        while len(done) < workers:
+            try:
+                kind, worker_id, payload, events = results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                # A worker killed by a signal never reports "done"
+                done.update(
+                    i
+                    for i, process in enumerate(processes)
+                    if not process.is_alive() and process.exitcode != 0
+                )
+                continue
+
+            if kind == "result":
+                filename, result = payload
+                by_file[filename] = result
+                for event in events:
+                    metrics.record(**event)
+            else:
+                done.add(worker_id)
+                get_cache().add_stats(payload)
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    results_list = [
+        by_file.get(filename)
+        or {
+            "idea_filename": filename,
+            "stories_generated": False,
+            "ac_generated": False,
+            "errors": ["Workflow failed: worker process exited before finishing"],
+            "elapsed": 0.0,
+        }
+        for filename in idea_filenames
+    ]
+    stats = summarize(results_list, time.perf_counter() - started)
+
+    print_report(results_list, stats)
+    metrics.print_summary()
+
+    return {"results": results_list, "stats": stats, "metrics": metrics}